@@ -224,8 +224,9 @@ class PhDOpportunitiesApp {
             const matchesSource = this.filters.source === '' || 
                 opp.source === this.filters.source;
             
+            // Listings without a readable deadline cannot meet a deadline filter
             const matchesDeadline = this.filters.deadline === '' || 
-                opp.deadline >= this.filters.deadline;
+                (this.hasDeadline(opp.deadline) && opp.deadline >= this.filters.deadline);
             
             return matchesSearch && matchesInstitute && matchesSource && matchesDeadline;
         });
@@ -253,6 +254,14 @@ class PhDOpportunitiesApp {
             let aVal = a[this.currentSort.field];
             let bVal = b[this.currentSort.field];
 
+            // Listings without a readable deadline go last in either direction
+            if (this.currentSort.field === 'deadline') {
+                const aDated = this.hasDeadline(aVal);
+                const bDated = this.hasDeadline(bVal);
+                if (aDated !== bDated) return aDated ? -1 : 1;
+                if (!aDated) return 0;
+            }
+
             // Handle date sorting
             if (this.currentSort.field === 'deadline' || this.currentSort.field === 'dateAdded') {
                 aVal = new Date(aVal);
@@ -312,6 +321,11 @@ class PhDOpportunitiesApp {
         }).join('');
     }
 
+    hasDeadline(deadline) {
+        // The scraper writes 'unknown' when a listing's deadline could not be read
+        return Boolean(deadline) && deadline !== 'unknown' && !isNaN(new Date(deadline));
+    }
+
     getDeadlineClass(deadline) {
         const deadlineDate = new Date(deadline);
         const today = new Date();
@@ -326,6 +340,7 @@ class PhDOpportunitiesApp {
 
     formatDate(dateString) {
         const date = new Date(dateString);
+        if (isNaN(date)) return 'Unknown';
         return date.toLocaleDateString('en-US', {
             year: 'numeric',
             month: 'short',
@@ -339,6 +354,7 @@ class PhDOpportunitiesApp {
         const newToday = this.opportunities.filter(opp => opp.dateAdded === today).length;
         
         const expiringSoon = this.opportunities.filter(opp => {
+            if (!this.hasDeadline(opp.deadline)) return false;
             const deadline = new Date(opp.deadline);
             const daysDiff = Math.ceil((deadline - new Date()) / (1000 * 60 * 60 * 24));
             return daysDiff <= 30 && daysDiff > 0;
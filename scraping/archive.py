@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Opportunity Archive
+Append-only, month-partitioned, gzip-compressed JSON Lines archive
+"""
+
+import gzip
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from records import iso_date
+
+UNDATED_PARTITION = 'undated'
+
+
+class OpportunityArchive:
+    def __init__(self, root: str = "data/archive"):
+        self.root = root
+        self.manifest_path = os.path.join(root, 'manifest.json')
+        self.legacy_path = os.path.join(root, 'archived_opportunities.json')
+        self.logger = logging.getLogger(__name__)
+        self.manifest = self.load_manifest()
+
+    def load_manifest(self) -> Dict[str, Any]:
+        """Load the partition manifest"""
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, 'r') as f:
+                    return json.load(f)
+            except json.JSONDecodeError:
+                self.logger.warning("Could not parse archive manifest, rebuilding counts from new entries")
+        return {'version': 1, 'partitions': {}}
+
+    def save_manifest(self) -> None:
+        """Atomically write the partition manifest"""
+        os.makedirs(self.root, exist_ok=True)
+        self.manifest['updated'] = datetime.now().isoformat()
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def partition_for(opportunity: Dict[str, Any]) -> str:
+        """Partition key (YYYY-MM of the deadline) for an opportunity"""
+        deadline = iso_date(opportunity.get('deadline') or '')
+        return deadline.isoformat()[:7] if deadline else UNDATED_PARTITION
+
+    def segment_path(self, partition: str) -> str:
+        """Path of the compressed segment for a partition"""
+        year = partition.split('-')[0] if partition != UNDATED_PARTITION else UNDATED_PARTITION
+        return os.path.join(self.root, year, f"{partition}.jsonl.gz")
+
+    def ids_path(self, partition: str) -> str:
+        """Path of the id index kept beside a partition's segment"""
+        return self.segment_path(partition)[:-len('.jsonl.gz')] + '.ids'
+
+    def load_ids(self, partition: str) -> set:
+        """Read the ids already archived in one partition"""
+        path = self.ids_path(partition)
+        if not os.path.exists(path):
+            return set()
+        with open(path, 'r') as f:
+            return {line.strip() for line in f if line.strip()}
+
+    def append(self, opportunities: Iterable[Dict[str, Any]]) -> int:
+        """Append opportunities to their partitions, skipping ids already archived
+
+        Only the partitions being written to are read, so the cost does not
+        grow with the size of the archive.
+        """
+        self.migrate_legacy()
+
+        by_partition: Dict[str, List[Dict[str, Any]]] = {}
+        for opp in opportunities:
+            by_partition.setdefault(self.partition_for(opp), []).append(opp)
+
+        appended = 0
+        for partition, entries in sorted(by_partition.items()):
+            seen = self.load_ids(partition)
+            fresh = []
+            for opp in entries:
+                key = opp.get('id') or json.dumps(opp, sort_keys=True)
+                if key not in seen:
+                    seen.add(key)
+                    fresh.append((key, opp))
+            if not fresh:
+                continue
+
+            path = self.segment_path(partition)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Each append adds a new gzip member; readers see one continuous stream
+            with gzip.open(path, 'at', encoding='utf-8') as f:
+                for _, opp in fresh:
+                    f.write(json.dumps(opp, ensure_ascii=False, separators=(',', ':')) + '\n')
+            with open(self.ids_path(partition), 'a') as f:
+                f.writelines(f"{key}\n" for key, _ in fresh)
+
+            self.update_partition_stats(partition, [opp for _, opp in fresh])
+            appended += len(fresh)
+
+        if appended:
+            self.save_manifest()
+        return appended
+
+    def update_partition_stats(self, partition: str, entries: List[Dict[str, Any]]) -> None:
+        """Fold newly appended entries into a partition's manifest record"""
+        stats = self.manifest['partitions'].setdefault(partition, {
+            'path': os.path.relpath(self.segment_path(partition), self.root),
+            'count': 0,
+        })
+        stats['count'] += len(entries)
+        for field, low, high in (('deadline', 'minDeadline', 'maxDeadline'),
+                                 ('archivedDate', 'firstArchived', 'lastArchived')):
+            values = [opp[field] for opp in entries if opp.get(field)]
+            if values:
+                stats[low] = min([stats[low], *values]) if stats.get(low) else min(values)
+                stats[high] = max([stats[high], *values]) if stats.get(high) else max(values)
+
+    def migrate_legacy(self) -> None:
+        """Move the old single-file archive into partitions, once"""
+        if not os.path.exists(self.legacy_path):
+            return
+        try:
+            with open(self.legacy_path, 'r') as f:
+                legacy = json.load(f)
+        except json.JSONDecodeError:
+            self.logger.warning("Could not parse legacy archive file, leaving it in place")
+            return
+        os.replace(self.legacy_path, f"{self.legacy_path}.migrated")
+        migrated = self.append(legacy)
+        self.logger.info(f"Migrated {migrated} archived opportunities into partitions")
+
+    def partitions(self, since: Optional[str] = None, until: Optional[str] = None) -> List[str]:
+        """Partition keys overlapping a YYYY-MM range, oldest first"""
+        keys = []
+        for partition in sorted(self.manifest['partitions']):
+            if partition != UNDATED_PARTITION:
+                if since and partition < since[:7]:
+                    continue
+                if until and partition > until[:7]:
+                    continue
+            elif since or until:
+                continue
+            keys.append(partition)
+        return keys
+
+    def iter_archived(self, since: Optional[str] = None, until: Optional[str] = None,
+                      source: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Stream archived opportunities, optionally filtered by deadline range and source"""
+        for partition in self.partitions(since, until):
+            path = self.segment_path(partition)
+            if not os.path.exists(path):
+                continue
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    opp = json.loads(line)
+                    deadline = opp.get('deadline', '')
+                    if since and deadline[:len(since)] < since:
+                        continue
+                    if until and deadline[:len(until)] > until:
+                        continue
+                    if source and opp.get('source') != source:
+                        continue
+                    yield opp
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Fetch Backends
+Registry of the plugins that download and extract a source's listings.
+Each plugin lives in its own module and is only imported when a source
+first needs it, so runs and CLI tasks that never touch a browser never
+load Selenium.
+"""
+
+import importlib
+from typing import Any, Dict, List
+
+# Backend name -> "module:Class"; a source may also name a "module:Class" of its own
+BACKENDS = {
+    'requests': 'requests_backend:RequestsBackend',
+    'selenium': 'selenium_backend:SeleniumBackend',
+}
+
+
+class SourceFailed(Exception):
+    """Raised by a backend when a source could not be scraped; `reason` classifies the failure"""
+
+    def __init__(self, message: str, reason: str = 'error'):
+        super().__init__(message)
+        self.reason = reason
+
+
+def backend_for(source: Dict[str, Any]) -> str:
+    """Backend a source is scraped with: its `backend` setting, else selenium for JavaScript sources"""
+    if source.get('backend'):
+        return source['backend']
+    return 'selenium' if source.get('type') == 'javascript' or source.get('requires_js', False) else 'requests'
+
+
+def backend_spec(name: str) -> str:
+    """The "module:Class" a backend name refers to"""
+    if name in BACKENDS:
+        return BACKENDS[name]
+    if ':' in name:
+        return name
+    raise ValueError(f"Unknown fetch backend '{name}', expected one of {', '.join(BACKENDS)} or module:Class")
+
+
+def load_backend(name: str) -> type:
+    """Import a backend's module and return its class"""
+    module_name, class_name = backend_spec(name).split(':', 1)
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+class FetchBackend:
+    """Base class for fetch backends
+
+    A backend is created once per scraper with the scraper itself, for its
+    shared caches, metrics and extraction helpers, plus its own keyword
+    options. `scrape` returns a source's relevant listings before cleaning.
+    """
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.metrics = scraper.metrics
+        self.rate_limiter = scraper.rate_limiter
+        self.seen_listings = scraper.seen_listings
+        self.snapshots = scraper.snapshots
+
+    def scrape(self, source: Dict[str, Any]) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def save(self) -> None:
+        """Persist any state kept between runs"""
+
+    def start_cycle(self) -> None:
+        """Reset per-run counters before another daemon cycle"""
+
+    def close(self) -> None:
+        """Release connections, browsers and other resources"""
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Deadline Parser Benchmark
+Compares the legacy regex chain with the memoized multi-format parser
+"""
+
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deadlines import parse_deadline_text  # noqa: E402
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'deadline_corpus.txt')
+
+
+def legacy_parse_deadline(deadline_text: str) -> str:
+    """The parser as it was before deadlines.py, kept for comparison"""
+    if not deadline_text:
+        return (datetime.now() + timedelta(days=180)).strftime('%Y-%m-%d')
+    deadline_text = deadline_text.lower().strip()
+    match = re.search(r'(\d{4})-(\d{1,2})-(\d{1,2})', deadline_text)
+    if match:
+        return f"{match.group(1)}-{match.group(2):0>2}-{match.group(3):0>2}"
+    match = re.search(r'(\d{1,2})/(\d{1,2})/(\d{4})', deadline_text)
+    if match:
+        return f"{match.group(3)}-{match.group(1):0>2}-{match.group(2):0>2}"
+    return (datetime.now() + timedelta(days=180)).strftime('%Y-%m-%d')
+
+
+def load_corpus(path: str = CORPUS_PATH) -> list:
+    """Read deadline strings, skipping comments and blank lines"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+def measure(parse, workload: list) -> float:
+    """Return parses per second over the workload"""
+    start = time.perf_counter()
+    for text in workload:
+        parse(text)
+    return len(workload) / (time.perf_counter() - start)
+
+
+def main():
+    """Run the benchmark and print throughput and coverage"""
+    corpus = load_corpus()
+    random.seed(0)
+    # Deadline strings repeat heavily across pages and runs
+    workload = [random.choice(corpus) for _ in range(100000)]
+
+    parse_uncached = parse_deadline_text.__wrapped__
+    results = {
+        'legacy': measure(legacy_parse_deadline, workload),
+        'uncached': measure(parse_uncached, workload),
+    }
+    parse_deadline_text.cache_clear()
+    results['cached'] = measure(parse_deadline_text, workload)
+
+    fabricated = legacy_parse_deadline('')
+    legacy_parsed = sum(1 for text in corpus if legacy_parse_deadline(text) != fabricated)
+    parsed = sum(1 for text in corpus if parse_uncached(text))
+
+    print(f"Corpus: {len(corpus)} distinct strings, {len(workload)} lookups")
+    for name, rate in results.items():
+        print(f"  {name:<9} {rate:>12,.0f} parses/s")
+    print(f"Dated by legacy parser: {legacy_parsed}/{len(corpus)}")
+    print(f"Dated by new parser:    {parsed}/{len(corpus)}")
+
+
+if __name__ == "__main__":
+    main()
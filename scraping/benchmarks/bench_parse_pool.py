@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Parse Pool Benchmark
+Extracts the same batch of synthetic listing pages in-process and with
+growing numbers of parse worker processes, reporting throughput and speedup
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from bench_deadlines import load_corpus  # noqa: E402
+from bench_pipeline import REPO_ROOT, RESULTS_DIR, git_revision, synthetic_page  # noqa: E402
+from scraper import PhDScraper  # noqa: E402
+
+
+def worker_counts(limit: int) -> List[int]:
+    """0 (in-process), then 1, 2, 4, ... up to `limit` workers"""
+    counts, workers = [0], 1
+    while workers < limit:
+        counts.append(workers)
+        workers *= 2
+    return counts + [limit]
+
+
+def run(pages: List[Dict[str, Any]], workers: int, args, workdir: str) -> Dict[str, Any]:
+    """Extract every page through the requests backend with `workers` parse processes"""
+    scraper = PhDScraper(
+        config_path=args.config, requests_per_second=1e9, burst=1e9, cache_dir=None, parser=args.parser,
+        relevance_config=os.path.join(REPO_ROOT, 'data', 'relevance.json'),
+        store_path=os.path.join(workdir, f"opportunities-{workers}.db"), archive_dir=os.path.join(workdir, 'archive'),
+        site_dir=None, parse_workers=workers,
+    )
+    try:
+        backend = scraper.backend('requests')
+        compiled = {page['source']['id']: backend.compile_selectors(page['source']['selectors']) for page in pages}
+        if workers:
+            # Start the pool and load the parsers in every worker before timing
+            warm = [backend.submit_page(pages[0]['content'], compiled[pages[0]['source']['id']], 'http://localhost/',
+                                        backend.parser) for _ in range(workers * 2)]
+            for extraction in warm:
+                extraction.result()
+
+        started = time.perf_counter()
+        extractions = [backend.submit_page(page['content'], compiled[page['source']['id']], 'http://localhost/',
+                                           backend.parser) for page in pages]
+        listings = sum(len(backend.collect_page(extraction)) for extraction in extractions)
+        seconds = time.perf_counter() - started
+    finally:
+        scraper.cleanup()
+    return {
+        'workers': workers,
+        'seconds': round(seconds, 4),
+        'pages_per_second': round(len(pages) / seconds, 1),
+        'listings_per_second': round(listings / seconds, 1),
+        'listings': listings,
+    }
+
+
+def main():
+    """Time each worker count and write a results file"""
+    parser = argparse.ArgumentParser(description='Listing extraction throughput with and without parse workers')
+    parser.add_argument('--config', default=os.path.join(REPO_ROOT, 'data', 'sources.json'),
+                        help='Sources whose selectors the synthetic pages use')
+    parser.add_argument('--pages', type=int, default=200, help='Pages to extract per run')
+    parser.add_argument('--listings-per-page', type=int, default=100, help='Listings on each page')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1, help='Largest pool to try')
+    parser.add_argument('--parser', default='lxml', help='BeautifulSoup tree builder')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for the synthetic pages')
+    parser.add_argument('--output', default=None, help='Results file (default: results/parse-pool-<timestamp>.json)')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with open(args.config, 'r') as f:
+        sources = [source for source in json.load(f) if source.get('selectors')]
+    rng = random.Random(args.seed)
+    deadlines = load_corpus()
+    pages = []
+    for number in range(args.pages):
+        source = sources[number % len(sources)]
+        content = synthetic_page(source['selectors'], args.listings_per_page, rng, deadlines).encode('utf-8')
+        pages.append({'source': source, 'content': content})
+    print(f"  {len(pages)} pages, {sum(len(page['content']) for page in pages) / 1e6:.1f} MB, "
+          f"{os.cpu_count()} CPU(s)")
+
+    workdir = tempfile.mkdtemp(prefix='phd-parse-pool-')
+    try:
+        report = [run(pages, workers, args, workdir) for workers in worker_counts(args.max_workers)]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = report[0]['seconds']
+    print(f"  {'workers':>7} {'seconds':>9} {'pages/s':>9} {'listings/s':>11} {'speedup':>8}")
+    for entry in report:
+        entry['speedup'] = round(baseline / entry['seconds'], 2)
+        label = entry['workers'] or 'inline'
+        print(f"  {label:>7} {entry['seconds']:>9.3f} {entry['pages_per_second']:>9.1f} "
+              f"{entry['listings_per_second']:>11.1f} {entry['speedup']:>7.2f}x")
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'pages': args.pages,
+            'listings_per_page': args.listings_per_page,
+            'parser': args.parser,
+        },
+        'runs': report,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"parse-pool-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nWrote {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
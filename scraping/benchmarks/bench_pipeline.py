@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Scraping Pipeline Benchmark
+Serves recorded and synthetic listing pages from a local HTTP server and
+times each stage of PhDScraper against them, writing the results as JSON
+"""
+
+import argparse
+import functools
+import html
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from bench_deadlines import load_corpus  # noqa: E402
+from deadlines import parse_deadline_text  # noqa: E402
+from html_parsing import (DEFAULT_CONTAINER_SELECTOR, DEFAULT_FIELD_SELECTORS, SELECTOR_PART_RE,  # noqa: E402
+                          SIMPLE_SELECTOR_RE)
+from scraper import PhDScraper  # noqa: E402
+from storage import OpportunityStore  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(BENCH_DIR))
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+STAGES = ['scrape_source', 'fetch', 'extract_page', 'filter_relevant', 'upsert_many', 'save_results']
+
+TITLE_TEMPLATES = [
+    'PhD Position in {topic}', 'Doctoral Researcher - {topic}', 'PhD Studentship: {topic}',
+    'Fully Funded PhD in {topic}', '{topic} PhD Candidate', 'Graduate Research Assistant, {topic}',
+]
+RELEVANT_TOPICS = [
+    'Medical Physics', 'Radiation Oncology Physics', 'Medical Imaging', 'Radiotherapy Dosimetry',
+    'Nuclear Medicine', 'Proton Therapy', 'Radiobiology', 'Imaging Physics',
+]
+OTHER_TOPICS = [
+    'Condensed Matter Theory', 'Computational Linguistics', 'Organic Chemistry', 'Marine Ecology',
+    'Software Engineering', 'Structural Engineering', 'Economic History', 'Astrophysics',
+]
+PROJECT_WORDS = [
+    'adaptive', 'automated', 'bayesian', 'deep', 'fast', 'functional', 'hybrid', 'in-vivo', 'low-dose',
+    'model-based', 'multimodal', 'online', 'personalised', 'quantitative', 'robust', 'spectral',
+    'dose', 'detector', 'flash', 'motion', 'reconstruction', 'segmentation', 'spectroscopy', 'tracking',
+    'verification', 'planning', 'calibration', 'dosimeters', 'tomography', 'ultrasound', 'tumours',
+    'brain', 'lung', 'prostate', 'cardiac', 'paediatric', 'neutron', 'photon', 'electron', 'carbon',
+]
+INSTITUTES = [
+    'Stanford University', 'Heidelberg University', 'University of Toronto', 'KU Leuven',
+    'Karolinska Institutet', 'University College London', 'ETH Zurich', 'University of Sydney',
+    'McGill University', 'Technical University of Munich', 'University of Manchester', 'Duke University',
+]
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_directory(root: str) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve a directory on a free local port from a background thread"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(QuietHandler, directory=root))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def selector_chain(selector: str) -> List[Tuple[str, List[Tuple[str, str]]]]:
+    """Split a descendant selector into (tag, attributes) steps that would match it"""
+    chain = []
+    for compound in selector.replace('>', ' ').split():
+        match = SIMPLE_SELECTOR_RE.match(compound)
+        if not match:
+            raise ValueError(f"Cannot build synthetic markup for selector '{selector}'")
+        attrs, classes = [], []
+        for cls, elem_id, attr, dq_value, sq_value, bare_value in SELECTOR_PART_RE.findall(match.group('parts')):
+            if cls:
+                classes.append(cls)
+            elif elem_id:
+                attrs.append(('id', elem_id))
+            else:
+                attrs.append((attr, dq_value or sq_value or bare_value or '1'))
+        if classes:
+            attrs.insert(0, ('class', ' '.join(classes)))
+        chain.append((match.group('tag') or '', attrs))
+    return chain
+
+
+def listing_template(selectors: Dict[str, str]) -> Tuple[Tuple[str, List[Tuple[str, str]]], Dict]:
+    """Build a nested element tree for one listing from a source's selectors"""
+    tree: Dict = {}
+    for field, default in DEFAULT_FIELD_SELECTORS.items():
+        nodes = tree
+        chain = selector_chain(selectors.get(field, default))
+        for depth, (tag, attrs) in enumerate(chain):
+            node = nodes.setdefault((tag, tuple(attrs)), {'fields': [], 'children': {}})
+            if depth == len(chain) - 1:
+                node['fields'].append(field)
+            nodes = node['children']
+    container = selector_chain(selectors.get('container', DEFAULT_CONTAINER_SELECTOR))[-1]
+    return container, tree
+
+
+def render_listing(container: Tuple[str, List[Tuple[str, str]]], tree: Dict, values: Dict[str, str]) -> str:
+    """Render one listing from a template tree and its field values"""
+    def attributes(attrs) -> str:
+        return ''.join(f' {name}="{html.escape(value)}"' for name, value in attrs)
+
+    def render(nodes: Dict) -> str:
+        parts = []
+        for (tag, attrs), node in nodes.items():
+            fields = node['fields']
+            text = html.escape(' '.join(values[field] for field in fields if field != 'link'))
+            attrs = list(attrs)
+            if 'link' in fields:
+                tag = tag or 'a'
+                attrs.append(('href', values['link']))
+            tag = tag or 'div'
+            parts.append(f"<{tag}{attributes(attrs)}>{text}{render(node['children'])}</{tag}>")
+        return ''.join(parts)
+
+    tag, attrs = container
+    tag = tag or 'div'
+    return f"<{tag}{attributes(attrs)}>{render(tree)}</{tag}>"
+
+
+def synthetic_values(rng: random.Random, deadlines: List[str], index: int,
+                     relevant_share: float) -> Dict[str, str]:
+    """Field values for one made-up listing"""
+    topics = RELEVANT_TOPICS if rng.random() < relevant_share else OTHER_TOPICS
+    title = rng.choice(TITLE_TEMPLATES).format(topic=rng.choice(topics))
+    project = ' '.join(rng.sample(PROJECT_WORDS, 4))
+    return {
+        'title': f"{title}: {project}",
+        'institute': rng.choice(INSTITUTES),
+        'deadline': rng.choice(deadlines),
+        'link': f"/jobs/{index}",
+        'description': f"Research project in {rng.choice(topics).lower()} with the {rng.choice(topics).lower()} group.",
+    }
+
+
+def synthetic_page(selectors: Dict[str, str], listings: int, rng: random.Random, deadlines: List[str],
+                   relevant_share: float = 0.6, duplicate_share: float = 0.1) -> str:
+    """A page of made-up listings matching a source's selectors, with some repeats"""
+    container, tree = listing_template(selectors)
+    rendered = []
+    values = []
+    for index in range(listings):
+        if values and rng.random() < duplicate_share:
+            repeat = dict(rng.choice(values))
+            # Same listing reposted with a slightly different title
+            if rng.random() < 0.5:
+                repeat['title'] = repeat['title'].replace('PhD', 'Ph.D.')
+            values.append(repeat)
+        else:
+            values.append(synthetic_values(rng, deadlines, index, relevant_share))
+        rendered.append(render_listing(container, tree, values[-1]))
+    nav = '<nav class="site-nav"><a href="/">Home</a><a href="/about">About</a></nav>' * 5
+    return f"<!DOCTYPE html><html><head><title>Jobs</title></head><body>{nav}<main>{''.join(rendered)}</main></body></html>"
+
+
+def fixture_path(source: Dict[str, Any]) -> str:
+    """Where the recorded page for a source is kept"""
+    return os.path.join(FIXTURES_DIR, f"{source['id']}.html")
+
+
+def record_fixtures(scraper: PhDScraper, sources: List[Dict[str, Any]]) -> None:
+    """Download each source's live page into the fixtures directory"""
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for source in sources:
+        try:
+            response = scraper.backend('requests').session.get(source['url'], timeout=30)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"  {source['id']}: not recorded ({e})")
+            continue
+        with open(fixture_path(source), 'wb') as f:
+            f.write(response.content)
+        print(f"  {source['id']}: {len(response.content):,} bytes")
+
+
+def build_site(root: str, sources: List[Dict[str, Any]], args, rng: random.Random) -> List[Dict[str, Any]]:
+    """Write recorded pages and synthetic pages into `root`, returning one page entry per file"""
+    deadlines = load_corpus()
+    pages = []
+    for source in sources:
+        if os.path.exists(fixture_path(source)):
+            shutil.copy(fixture_path(source), os.path.join(root, f"{source['id']}.html"))
+            kind = 'recorded'
+        else:
+            # No recording yet: stand in with a small page in the source's own markup
+            with open(os.path.join(root, f"{source['id']}.html"), 'w', encoding='utf-8') as f:
+                f.write(synthetic_page(source['selectors'], args.fixture_listings, rng, deadlines))
+            kind = 'stand-in'
+        pages.append({'file': f"{source['id']}.html", 'source': source, 'kind': kind})
+
+    for number in range(args.synthetic_pages):
+        source = sources[number % len(sources)]
+        name = f"synthetic-{number}.html"
+        with open(os.path.join(root, name), 'w', encoding='utf-8') as f:
+            f.write(synthetic_page(source['selectors'], args.listings_per_page, rng, deadlines))
+        pages.append({'file': name, 'source': source, 'kind': 'synthetic'})
+    return pages
+
+
+class StageTimer:
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self.items: Dict[str, int] = {stage: 0 for stage in STAGES}
+        self.units: Dict[str, str] = {}
+        self.bytes: Dict[str, int] = {}
+
+    def time(self, stage: str, func: Callable, *args, items: int = 1, **kwargs):
+        """Run one operation, recording its latency and how many items it handled"""
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.samples[stage].append(time.perf_counter() - start)
+        self.items[stage] += items
+        return result
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Throughput and latency percentiles per stage"""
+        stages = {}
+        for stage in STAGES:
+            samples = self.samples[stage]
+            if not samples:
+                continue
+            total = sum(samples)
+            ordered = sorted(samples)
+            stages[stage] = {
+                'unit': self.units.get(stage, 'items'),
+                'items': self.items[stage],
+                'operations': len(samples),
+                'seconds': total,
+                'throughput': self.items[stage] / total if total else None,
+                'latency_ms': {
+                    'mean': statistics.fmean(samples) * 1000,
+                    'p50': ordered[len(ordered) // 2] * 1000,
+                    'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+                    'max': ordered[-1] * 1000,
+                },
+            }
+            if stage in self.bytes:
+                stages[stage]['bytes'] = self.bytes[stage]
+                stages[stage]['mb_per_second'] = self.bytes[stage] / total / 1e6 if total else None
+        return stages
+
+
+def run_pipeline(scraper: PhDScraper, base_url: str, pages: List[Dict[str, Any]], workdir: str,
+                 timer: StageTimer) -> int:
+    """Scrape every page the way a run does, then time the backend and store steps one by one
+
+    `scrape_source` is the whole per-source path: download, extraction in
+    parse_worker.extract_listings, relevance filtering, cleaning and
+    validation. The stages after it repeat those steps separately on the
+    same pages, and the store stages time the upserts that merge duplicates.
+    """
+    backend = scraper.backend('requests')
+    timer.units.update({
+        'scrape_source': 'pages', 'fetch': 'pages', 'extract_page': 'listings', 'filter_relevant': 'listings',
+        'upsert_many': 'listings', 'save_results': 'listings',
+    })
+    timer.bytes['fetch'] = 0
+
+    # Each scraping run starts with an empty deadline cache
+    parse_deadline_text.cache_clear()
+    cleaned = []
+    for page in pages:
+        url = f"{base_url}/{page['file']}"
+        # One static page per source entry, with its own snapshot; following and detail pages are not served
+        source = {key: value for key, value in page['source'].items() if key not in ('pagination', 'detail')}
+        source.update({'id': page['file'], 'name': page['file'], 'url': url, 'backend': 'requests'})
+        cleaned += timer.time('scrape_source', scraper.scrape_source, source)
+
+    parse_deadline_text.cache_clear()
+    extracted = 0
+    for page in pages:
+        source, url = page['source'], f"{base_url}/{page['file']}"
+        response = timer.time('fetch', backend.download, url)
+        response.raise_for_status()
+        timer.bytes['fetch'] += len(response.content)
+
+        compiled = backend.compile_selectors(source['selectors'])
+        listings = timer.time('extract_page', backend.extract_page, response.content, compiled, url, backend.parser,
+                              source.get('day_first', False), items=0)
+        timer.items['extract_page'] += len(listings)
+        extracted += len(listings)
+        timer.time('filter_relevant', scraper.filter_relevant, listings, items=len(listings))
+
+    # A cold store, then a steady-state run where nothing changed
+    with OpportunityStore(os.path.join(workdir, 'upsert.db'), scraper.near_duplicate_threshold) as store:
+        for _ in range(2):
+            timer.time('upsert_many', store.upsert_many, cleaned, items=len(cleaned))
+
+    # The same two runs through save_results, which also exports the JSON and site data
+    scraper.results = cleaned
+    output_path = os.path.join(workdir, 'opportunities.json')
+    for _ in range(2):
+        timer.time('save_results', scraper.save_results, output_path, items=len(cleaned))
+    return extracted
+
+
+def git_revision() -> Optional[str]:
+    """Current commit of the repository, if git is available"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print throughput and median latency of this run relative to a baseline"""
+    print(f"\nCompared with {baseline['meta'].get('revision') or 'baseline'} ({baseline['meta']['timestamp']}):")
+    for stage in STAGES:
+        new, old = current['stages'].get(stage), baseline['stages'].get(stage)
+        if not new or not old or not old.get('throughput'):
+            continue
+        speedup = new['throughput'] / old['throughput']
+        print(f"  {stage:<28} {speedup:>6.2f}x throughput   "
+              f"p50 {old['latency_ms']['p50']:.3f} -> {new['latency_ms']['p50']:.3f} ms")
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    """Human-readable table of the stage results"""
+    meta = results['meta']
+    print(f"{meta['pages']} pages ({meta['recorded_pages']} recorded, {meta['stand_in_pages']} stand-in, "
+          f"{meta['synthetic_pages']} synthetic), {meta['listings']:,} listings")
+    print(f"  {'stage':<28} {'throughput':>16} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for stage, stats in results['stages'].items():
+        rate = f"{stats['throughput']:,.0f} {stats['unit']}/s" if stats['throughput'] else '-'
+        latency = stats['latency_ms']
+        print(f"  {stage:<28} {rate:>16} {latency['p50']:>9.3f} {latency['p95']:>9.3f} {latency['max']:>9.3f}")
+
+
+def load_sources(path: str) -> List[Dict[str, Any]]:
+    """Read the configured sources; every one is benchmarked, active or not"""
+    with open(path, 'r') as f:
+        return [source for source in json.load(f) if source.get('selectors')]
+
+
+def main():
+    """Run the benchmark and write a results file"""
+    parser = argparse.ArgumentParser(description='Offline benchmark of the scraping pipeline')
+    parser.add_argument('--config', default=os.path.join(REPO_ROOT, 'data', 'sources.json'),
+                        help='Sources whose recorded pages are served')
+    parser.add_argument('--record', action='store_true', help='Download each source page into fixtures/ and exit')
+    parser.add_argument('--synthetic-pages', type=int, default=4, help='Number of generated pages')
+    parser.add_argument('--listings-per-page', type=int, default=2500, help='Listings on each generated page')
+    parser.add_argument('--fixture-listings', type=int, default=50,
+                        help='Listings on the stand-in page of a source with no recording')
+    parser.add_argument('--parser', choices=['lxml', 'html.parser'], default='html.parser', help='HTML tree builder')
+    parser.add_argument('--no-prefilter', action='store_true', help='Build full document trees')
+    parser.add_argument('--near-duplicate-threshold', type=float, default=0.7,
+                        help='Near-duplicate similarity passed to the scraper; 0 disables')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic pages')
+    parser.add_argument('--output', default=None, help='Results file (default: results/<timestamp>.json)')
+    parser.add_argument('--compare', default=None, help='Earlier results file to compare against')
+    args = parser.parse_args()
+
+    sources = load_sources(args.config)
+    workdir = tempfile.mkdtemp(prefix='phd-bench-')
+    site_root = os.path.join(workdir, 'site')
+    os.makedirs(site_root)
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)  # the scraper writes scraping.log to the working directory
+    logging.disable(logging.INFO)
+
+    try:
+        scraper = PhDScraper(
+            config_path=args.config, requests_per_second=1e9, burst=1e9, cache_dir=None,
+            parser=args.parser, prefilter=not args.no_prefilter,
+            relevance_config=os.path.join(REPO_ROOT, 'data', 'relevance.json'),
+            store_path=os.path.join(workdir, 'opportunities.db'), archive_dir=os.path.join(workdir, 'archive'),
+            near_duplicate_threshold=args.near_duplicate_threshold or None,
+        )
+        if args.record:
+            print(f"Recording {len(sources)} source pages into {FIXTURES_DIR}")
+            record_fixtures(scraper, sources)
+            return 0
+
+        pages = build_site(site_root, sources, args, random.Random(args.seed))
+        server, base_url = serve_directory(site_root)
+        try:
+            timer = StageTimer()
+            listings = run_pipeline(scraper, base_url, pages, workdir, timer)
+        finally:
+            server.shutdown()
+            scraper.cleanup()
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'parser': args.parser,
+            'prefilter': not args.no_prefilter,
+            'near_duplicate_threshold': args.near_duplicate_threshold,
+            'seed': args.seed,
+            'pages': len(pages),
+            'recorded_pages': sum(1 for page in pages if page['kind'] == 'recorded'),
+            'stand_in_pages': sum(1 for page in pages if page['kind'] == 'stand-in'),
+            'synthetic_pages': sum(1 for page in pages if page['kind'] == 'synthetic'),
+            'listings': listings,
+        },
+        'stages': timer.report(),
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print_report(results)
+    print(f"\nResults written to {output}")
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare(results, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
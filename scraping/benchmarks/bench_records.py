@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Opportunity Record Benchmark
+Compares peak RSS and time of holding and exporting a large opportunity
+history as plain dicts against slotted records and streaming writers, each
+variant in a fresh process so peak memory is its own
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from bench_pipeline import RESULTS_DIR, git_revision, synthetic_values  # noqa: E402
+from records import iso_date, write_json, write_jsonl  # noqa: E402
+from storage import OpportunityStore  # noqa: E402
+
+SOURCES = ['Nature Jobs', 'IEEE Jobs', 'Physics Today Jobs', 'AAPM Career Services', 'Science Careers',
+           'Academic Jobs Online', 'EURAXESS', 'FindAPhD']
+
+
+def hold_dicts(store: OpportunityStore, output: str) -> int:
+    """The whole history as a list of dicts, as the site build used to hold it"""
+    return len(list(store.iter_all()))
+
+
+def hold_records(store: OpportunityStore, output: str) -> int:
+    """The whole history as a list of slotted records"""
+    return len(list(store.iter_records()))
+
+
+def export_dicts(store: OpportunityStore, output: str) -> int:
+    """The previous export: build the list, then json.dump it"""
+    opportunities = list(store.iter_all())
+    with open(output, 'w') as f:
+        json.dump(opportunities, f, indent=2, ensure_ascii=False)
+    return len(opportunities)
+
+
+def export_stream(store: OpportunityStore, output: str) -> int:
+    """Streaming JSON array export"""
+    return write_json(output, store.iter_all())
+
+
+def export_jsonl(store: OpportunityStore, output: str) -> int:
+    """Streaming JSON Lines export"""
+    return write_jsonl(output, store.iter_all())
+
+
+def partition_strptime(store: OpportunityStore, output: str) -> int:
+    """Deadline month of every dict, parsed with strptime as before"""
+    months = set()
+    for opp in store.iter_all():
+        try:
+            months.add(datetime.strptime((opp.get('deadline') or '')[:10], '%Y-%m-%d').strftime('%Y-%m'))
+        except ValueError:
+            months.add('undated')
+    return len(months)
+
+
+def partition_records(store: OpportunityStore, output: str) -> int:
+    """Deadline month of every record, whose deadline is already a date"""
+    months = set()
+    for opp in store.iter_records():
+        deadline = opp.deadline if isinstance(opp.deadline, date) else iso_date(opp.deadline or '')
+        months.add(deadline.isoformat()[:7] if deadline else 'undated')
+    return len(months)
+
+
+def baseline(store: OpportunityStore, output: str) -> int:
+    """Interpreter, imports and an open store, subtracted from every other variant"""
+    return store.count()
+
+
+# (variant, the variant it is compared against)
+VARIANTS: Dict[str, Callable[[OpportunityStore, str], int]] = {
+    'baseline': baseline,
+    'hold dicts': hold_dicts,
+    'hold records': hold_records,
+    'export dicts': export_dicts,
+    'export stream': export_stream,
+    'export jsonl': export_jsonl,
+    'partition strptime': partition_strptime,
+    'partition records': partition_records,
+}
+COMPARISONS = [('hold records', 'hold dicts'), ('export stream', 'export dicts'), ('export jsonl', 'export dicts'),
+               ('partition records', 'partition strptime')]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far"""
+    # Linux keeps ru_maxrss across fork and exec, so a child would report the parent's peak; VmHWM is its own
+    if os.path.exists('/proc/self/status'):
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def build_store(path: str, count: int, seed: int) -> None:
+    """Fill a store with `count` made-up opportunities"""
+    rng = random.Random(seed)
+    first = date(2024, 1, 1)
+    rows = []
+    for index in range(count):
+        deadline = first + timedelta(days=rng.randrange(900))
+        opp = {
+            'id': f"bench-{index:08d}",
+            **synthetic_values(rng, [deadline.isoformat() if rng.random() < 0.9 else 'unknown'], index, 0.8),
+            'source': rng.choice(SOURCES),
+            'dateAdded': (deadline - timedelta(days=60)).isoformat(),
+            'scrapedAt': datetime(2026, 1, 1, 6, 0, rng.randrange(60)).isoformat(),
+        }
+        opp['link'] = f"https://jobs.example.org{opp['link']}"
+        if rng.random() < 0.3:
+            opp['funding'] = 'Fully funded for 3.5 years'
+        rows.append(opp)
+    with OpportunityStore(path) as store:
+        placeholders = ', '.join('?' * (len(store.to_row(rows[0]))))
+        with store.conn:
+            store.conn.executemany(f"INSERT INTO opportunities (id, title, institute, deadline, link, description, "
+                                   f"source, dateAdded, scrapedAt, dedup_key, extra) VALUES ({placeholders})",
+                                   (store.to_row(opp) for opp in rows))
+
+
+def run_variant(name: str, store_path: str, output: str) -> None:
+    """Child process: run one variant and print its time and peak RSS as JSON"""
+    with OpportunityStore(store_path) as store:
+        started = time.perf_counter()
+        result = VARIANTS[name](store, output)
+        seconds = time.perf_counter() - started
+    print(json.dumps({'seconds': seconds, 'peak_rss_mb': peak_rss_mb(), 'result': result}))
+
+
+def measure(name: str, store_path: str, workdir: str, runs: int) -> Dict[str, Any]:
+    """Best time and peak RSS of a variant over `runs` fresh processes"""
+    samples = []
+    for _ in range(runs):
+        output = os.path.join(workdir, 'export.jsonl' if 'jsonl' in name else 'export.json')
+        result = subprocess.run([sys.executable, os.path.abspath(__file__), '--variant', name, '--store', store_path,
+                                 '--export-path', output], capture_output=True, text=True, check=True)
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return {
+        'seconds': round(min(sample['seconds'] for sample in samples), 4),
+        'peak_rss_mb': round(min(sample['peak_rss_mb'] for sample in samples), 1),
+        'result': samples[0]['result'],
+    }
+
+
+def main():
+    """Build a store, measure every variant and write a results file"""
+    parser = argparse.ArgumentParser(description='Memory and time of dict and slotted-record opportunity paths')
+    parser.add_argument('--records', type=int, default=200000, help='Opportunities in the synthetic history')
+    parser.add_argument('--runs', type=int, default=3, help='Fresh processes per variant')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for the synthetic history')
+    parser.add_argument('--output', default=None, help='Results file (default: results/records-<timestamp>.json)')
+    parser.add_argument('--variant', choices=list(VARIANTS), help=argparse.SUPPRESS)
+    parser.add_argument('--store', help=argparse.SUPPRESS)
+    parser.add_argument('--export-path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args.store, args.export_path)
+        return 0
+
+    workdir = tempfile.mkdtemp(prefix='phd-records-')
+    try:
+        store_path = os.path.join(workdir, 'opportunities.db')
+        build_store(store_path, args.records, args.seed)
+        report = {name: measure(name, store_path, workdir, args.runs) for name in VARIANTS}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    base_rss = report['baseline']['peak_rss_mb']
+    print(f"  {args.records:,} opportunities, baseline process {base_rss:.1f} MB")
+    print(f"  {'variant':<20} {'seconds':>9} {'peak MB':>9} {'over baseline':>14}")
+    for name, stats in report.items():
+        stats['rss_over_baseline_mb'] = round(stats['peak_rss_mb'] - base_rss, 1)
+        print(f"  {name:<20} {stats['seconds']:>9.3f} {stats['peak_rss_mb']:>9.1f} "
+              f"{stats['rss_over_baseline_mb']:>14.1f}")
+
+    comparisons = {}
+    print()
+    for name, against in COMPARISONS:
+        speed = report[against]['seconds'] / report[name]['seconds']
+        # Growth under a megabyte is noise, not something to take a ratio of
+        grown = report[against]['rss_over_baseline_mb']
+        memory = report[name]['rss_over_baseline_mb'] / grown if grown >= 1 else None
+        comparisons[f"{name} vs {against}"] = {'memory_ratio': memory and round(memory, 3), 'speedup': round(speed, 2)}
+        share = f"{memory:.0%} of the memory" if memory is not None else "no measurable memory either way"
+        print(f"  {name} vs {against}: {share}, {speed:.2f}x the speed")
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'records': args.records,
+            'runs': args.runs,
+        },
+        'variants': report,
+        'comparisons': comparisons,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"records-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nWrote {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
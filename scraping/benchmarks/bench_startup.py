@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+CLI Cold-Start Benchmark
+Times each scraper.py mode in fresh interpreters and reports which heavy
+libraries it imported, so lazy backend loading stays lazy
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRAPING_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, SCRAPING_DIR)
+
+from bench_pipeline import RESULTS_DIR, git_revision, serve_directory  # noqa: E402
+from storage import OpportunityStore  # noqa: E402
+
+REPO_ROOT = os.path.dirname(SCRAPING_DIR)
+SCRAPER = os.path.join(SCRAPING_DIR, 'scraper.py')
+
+# Libraries the fetch backends pull in; a fast mode should import none of them
+HEAVY_MODULES = ('requests', 'bs4', 'soupsieve', 'lxml', 'selenium')
+
+# `python -X importtime` lines: self µs | cumulative µs | module
+IMPORT_LINE_RE = re.compile(r'^import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)$')
+
+LISTING_PAGE = """<html><body>
+<div class="job"><h3 class="title"><a href="/phd-1">PhD in Medical Physics</a></h3>
+<span class="institute">Example University</span><span class="deadline">2030-01-31</span></div>
+</body></html>
+"""
+
+
+def prepare(workdir: str, base_url: str) -> None:
+    """Write a one-source config and an opportunity store for the modes to run against"""
+    selectors = {'container': '.job', 'title': '.title a', 'institute': '.institute',
+                 'deadline': '.deadline', 'link': '.title a'}
+    with open(os.path.join(workdir, 'sources.json'), 'w') as f:
+        json.dump([{'id': 'local', 'name': 'Local', 'url': f"{base_url}/listings.html", 'selectors': selectors}], f)
+    shutil.copy(os.path.join(REPO_ROOT, 'data', 'relevance.json'), os.path.join(workdir, 'relevance.json'))
+
+    with open(os.path.join(REPO_ROOT, 'data', 'opportunities.json'), 'r') as f:
+        opportunities = json.load(f)
+    with OpportunityStore(os.path.join(workdir, 'data', 'opportunities.db')) as store:
+        store.upsert_many(opportunities)
+
+
+def modes(workdir: str) -> Dict[str, List[str]]:
+    """Command line of each mode, run from `workdir`"""
+    common = ['--config', 'sources.json', '--relevance-config', 'relevance.json', '--cache-dir', 'cache',
+              '--output', 'data/opportunities.json', '--site-dir', 'site', '--rate', '1000', '--burst', '1000']
+    return {
+        'interpreter': [sys.executable, '-c', 'pass'],
+        'validate-config': [sys.executable, SCRAPER, 'validate-config'] + common,
+        'dry-run': [sys.executable, SCRAPER, 'dry-run'] + common,
+        'export-only': [sys.executable, SCRAPER, 'export-only'] + common,
+        'scrape': [sys.executable, SCRAPER, 'scrape', '--no-cache'] + common,
+        'selenium backend import': [sys.executable, '-c', 'import selenium_backend'],
+    }
+
+
+def heavy_imports(command: List[str], workdir: str) -> Dict[str, float]:
+    """Milliseconds spent importing each heavy library, from `python -X importtime`"""
+    result = subprocess.run([command[0], '-X', 'importtime'] + command[1:], cwd=workdir, capture_output=True,
+                            text=True, env={**os.environ, 'PYTHONPATH': SCRAPING_DIR})
+    loaded = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE_RE.match(line)
+        package = match.group(2).split('.')[0] if match else None
+        if package in HEAVY_MODULES:
+            # A package's submodules may be imported separately; its largest subtree is a lower bound
+            loaded[package] = max(loaded.get(package, 0), int(match.group(1)) / 1000)
+    return {name: round(ms, 1) for name, ms in sorted(loaded.items())}
+
+
+def time_mode(command: List[str], workdir: str, runs: int) -> Dict[str, Any]:
+    """Wall-clock time of `runs` fresh processes"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run(command, cwd=workdir, capture_output=True, text=True,
+                                env={**os.environ, 'PYTHONPATH': SCRAPING_DIR})
+        samples.append((time.perf_counter() - started) * 1000)
+        if result.returncode != 0:
+            raise RuntimeError(f"{' '.join(command)} exited with {result.returncode}:\n{result.stderr[-2000:]}")
+    return {'runs': runs, 'min_ms': round(min(samples), 1), 'median_ms': round(statistics.median(samples), 1)}
+
+
+def main():
+    """Run every mode and write a results file"""
+    parser = argparse.ArgumentParser(description='Cold-start time of each scraper.py mode')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh processes per mode')
+    parser.add_argument('--output', default=None, help='Results file (default: results/startup-<timestamp>.json)')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='phd-startup-')
+    site_root = os.path.join(workdir, 'www')
+    os.makedirs(site_root)
+    with open(os.path.join(site_root, 'listings.html'), 'w') as f:
+        f.write(LISTING_PAGE)
+    server, base_url = serve_directory(site_root)
+    try:
+        prepare(workdir, base_url)
+        report = {}
+        for name, command in modes(workdir).items():
+            report[name] = {**time_mode(command, workdir, args.runs),
+                            'heavy_imports_ms': heavy_imports(command, workdir)}
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"  {'mode':<24} {'median ms':>10} {'min ms':>8}   heavy imports")
+    for name, stats in report.items():
+        heavy = ', '.join(f"{module} {ms:.0f}ms" for module, ms in stats['heavy_imports_ms'].items()) or 'none'
+        print(f"  {name:<24} {stats['median_ms']:>10.1f} {stats['min_ms']:>8.1f}   {heavy}")
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'modes': report,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"startup-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nWrote {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Selenium Browser Pool
+Lazily started, recycled WebDriver workers shared by JavaScript sources
+"""
+
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+
+
+class BrowserPool:
+    def __init__(self, factory: Callable[[], Any], size: int = 1, max_pages: int = 50):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.idle = queue.LifoQueue()
+        self.slots = threading.Semaphore(self.size)
+        self.pages_served: Dict[int, int] = {}
+        self.drivers: List[Any] = []
+        self.lock = threading.Lock()
+        self.started = 0
+        self.recycled = 0
+        self.logger = logging.getLogger(__name__)
+
+    def checkout(self) -> Any:
+        """Take an idle driver, starting a new one if none are idle"""
+        self.slots.acquire()
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            driver = self.factory()
+        except Exception:
+            self.slots.release()
+            raise
+        if driver is None:
+            self.slots.release()
+            return None
+        with self.lock:
+            self.drivers.append(driver)
+            self.pages_served[id(driver)] = 0
+            self.started += 1
+        return driver
+
+    def note_pages(self, driver: Any, pages: int = 1) -> None:
+        """Count page loads against a driver; a paginated or scrolled source loads many per checkout"""
+        with self.lock:
+            if id(driver) in self.pages_served:
+                self.pages_served[id(driver)] += pages
+
+    def checkin(self, driver: Any, broken: bool = False) -> None:
+        """Return a driver to the pool, recycling it once it has loaded enough pages"""
+        try:
+            with self.lock:
+                retire = broken or (self.max_pages and self.pages_served[id(driver)] >= self.max_pages)
+            if retire:
+                self.retire(driver)
+            else:
+                self.idle.put(driver)
+        finally:
+            self.slots.release()
+
+    def retire(self, driver: Any) -> None:
+        """Quit a driver and forget about it"""
+        with self.lock:
+            self.pages_served.pop(id(driver), None)
+            if driver in self.drivers:
+                self.drivers.remove(driver)
+            self.recycled += 1
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.warning(f"Error quitting WebDriver: {e}")
+
+    @contextmanager
+    def driver(self) -> Iterator[Any]:
+        """Borrow a driver for one page load; yields None if none can be started"""
+        driver = self.checkout()
+        if driver is None:
+            yield None
+            return
+        broken = False
+        try:
+            yield driver
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.checkin(driver, broken)
+
+    def close(self) -> None:
+        """Quit every driver the pool has started"""
+        with self.lock:
+            drivers = list(self.drivers)
+            self.drivers.clear()
+            self.pages_served.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                self.logger.warning(f"Error quitting WebDriver: {e}")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Deadline Parser
+Multi-format, multi-language deadline parsing with memoization
+"""
+
+import calendar
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Optional
+
+# Stored in place of a date when no deadline could be read from the listing
+DEADLINE_UNKNOWN = 'unknown'
+
+MONTH_NAMES = {
+    # English
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
+    'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12,
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'jun': 6, 'jul': 7, 'aug': 8,
+    'sep': 9, 'sept': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+    # German
+    'januar': 1, 'jänner': 1, 'februar': 2, 'märz': 3, 'maerz': 3, 'mai': 5, 'juni': 6,
+    'juli': 7, 'oktober': 10, 'dezember': 12, 'okt': 10, 'dez': 12,
+    # French
+    'janvier': 1, 'février': 2, 'fevrier': 2, 'mars': 3, 'avril': 4, 'juin': 6,
+    'juillet': 7, 'août': 8, 'aout': 8, 'septembre': 9, 'octobre': 10, 'novembre': 11, 'décembre': 12,
+    'decembre': 12,
+    # Spanish
+    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4, 'mayo': 5, 'junio': 6, 'julio': 7,
+    'agosto': 8, 'septiembre': 9, 'setiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12,
+    # Italian
+    'gennaio': 1, 'febbraio': 2, 'aprile': 4, 'maggio': 5, 'giugno': 6, 'luglio': 7,
+    'settembre': 9, 'ottobre': 10, 'dicembre': 12,
+    # Dutch
+    'januari': 1, 'februari': 2, 'maart': 3, 'mei': 5, 'augustus': 8,
+}
+
+_MONTH = '(?P<month>' + '|'.join(sorted(map(re.escape, MONTH_NAMES), key=len, reverse=True)) + r')\.?'
+_DAY = r'(?P<day>\d{1,2})(?:st|nd|rd|th|er|e|º)?\.?'
+_YEAR = r"(?P<year>\d{4}|'?\d{2})"
+_OF = r'(?:\s+(?:of|de|del|di)\b)?'
+
+# YYYY-MM-DD, also with / or . separators
+ISO_PATTERN = re.compile(r'\b(?P<year>\d{4})[-/.](?P<a>\d{1,2})[-/.](?P<b>\d{1,2})\b')
+# DD/MM/YYYY or MM/DD/YYYY, also with - or . separators and two-digit years
+NUMERIC_PATTERN = re.compile(r'\b(?P<a>\d{1,2})[/.-](?P<b>\d{1,2})[/.-](?P<year>\d{4}|\d{2})\b')
+# 15 August 2025, 15th of August, 2025, 15-Aug-2025, 15. März 2025, 15 de agosto de 2025
+DAY_MONTH_PATTERN = re.compile(rf'\b{_DAY}{_OF}[\s\-/]*{_MONTH}{_OF}[\s,\-/]+{_YEAR}\b')
+# August 15, 2025, Aug 15th 2025, Aug-15-2025
+MONTH_DAY_PATTERN = re.compile(rf'\b{_MONTH}[\s\-/]*{_DAY}[\s,\-/]+{_YEAR}\b')
+# August 2025 - taken as the last day of that month
+MONTH_YEAR_PATTERN = re.compile(rf'\b{_MONTH}[\s,\-/]*(?P<year>\d{{4}})\b')
+
+
+def _year(text: str) -> int:
+    """Expand a two-digit year into this century"""
+    value = int(text.lstrip("'"))
+    return value + 2000 if value < 100 else value
+
+
+def _format(year: int, month: int, day: int) -> Optional[str]:
+    """Format a date, returning None if it does not exist"""
+    try:
+        return date(year, month, day).isoformat()
+    except ValueError:
+        return None
+
+
+def _numeric(first: int, second: int, year: int, day_first: bool) -> Optional[str]:
+    """Resolve an all-numeric date, using the day-first hint only when it is ambiguous"""
+    if first > 12 >= second:
+        return _format(year, second, first)
+    if second > 12 >= first:
+        return _format(year, first, second)
+    if day_first:
+        return _format(year, second, first)
+    return _format(year, first, second)
+
+
+@lru_cache(maxsize=4096)
+def parse_deadline_text(deadline_text: str, day_first: bool = False) -> Optional[str]:
+    """Parse deadline text into YYYY-MM-DD, or None if no date can be found"""
+    if not deadline_text:
+        return None
+    text = deadline_text.lower().strip()
+
+    match = ISO_PATTERN.search(text)
+    if match:
+        return _format(int(match.group('year')), int(match.group('a')), int(match.group('b')))
+
+    match = NUMERIC_PATTERN.search(text)
+    if match:
+        return _numeric(int(match.group('a')), int(match.group('b')), _year(match.group('year')), day_first)
+
+    match = DAY_MONTH_PATTERN.search(text)
+    if match:
+        return _format(_year(match.group('year')), MONTH_NAMES[match.group('month')], int(match.group('day')))
+
+    match = MONTH_DAY_PATTERN.search(text)
+    if match:
+        return _format(_year(match.group('year')), MONTH_NAMES[match.group('month')], int(match.group('day')))
+
+    match = MONTH_YEAR_PATTERN.search(text)
+    if match:
+        year, month = int(match.group('year')), MONTH_NAMES[match.group('month')]
+        return _format(year, month, calendar.monthrange(year, month)[1])
+
+    return None
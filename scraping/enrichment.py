@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Detail Page Enrichment
+Fills in what a listing card leaves out (the full description, deadline,
+funding and supervisor) from each listing's own page, fetched with bounded
+concurrency overall and per host and cached by URL and content hash
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from deadlines import parse_deadline_text
+from http_cache import ResponseCache
+from rate_limiter import HostRateLimiter
+
+# Fields a source's detail selectors may fill in
+DETAIL_FIELDS = ('description', 'deadline', 'funding', 'supervisor')
+
+
+def detail_selectors(source: Dict[str, Any]) -> Dict[str, str]:
+    """A source's detail page selectors; empty if its listings are not enriched"""
+    detail = source.get('detail')
+    return detail.get('selectors') or {} if isinstance(detail, dict) else {}
+
+
+class DetailCache(ResponseCache):
+    """Fields extracted from each detail page, with the validators needed to revalidate it"""
+
+    def fields(self, url: str, selectors: Dict[str, str], content_hash: Optional[str] = None,
+               max_age: Optional[float] = None) -> Optional[Dict[str, Optional[str]]]:
+        """Previously extracted fields for a URL if they are still valid
+
+        With `content_hash` they are only returned if the page is unchanged;
+        with `max_age` only if it was fetched within that many seconds.
+        """
+        with self.lock:
+            entry = self.entries.get(url)
+        if not entry or entry.get('selectors_hash') != self.hash_selectors(selectors):
+            return None
+        if content_hash is not None and entry.get('content_hash') != content_hash:
+            return None
+        if max_age is not None and \
+                (datetime.now() - datetime.fromisoformat(entry['fetched_at'])).total_seconds() > max_age:
+            return None
+        return entry.get('fields')
+
+    def store_fields(self, url: str, response, selectors: Dict[str, str], content_hash: str,
+                     fields: Dict[str, Optional[str]]) -> None:
+        """Remember validators and extracted fields for a detail page"""
+        with self.lock:
+            self.entries[url] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'content_hash': content_hash,
+                'selectors_hash': self.hash_selectors(selectors),
+                'fields': fields,
+                'fetched_at': datetime.now().isoformat()
+            }
+            self.dirty = True
+
+
+class DetailEnricher:
+    def __init__(self, scraper, workers: int = 4, per_host: int = 2, ttl_hours: float = 24):
+        self.scraper = scraper
+        self.metrics = scraper.metrics
+        self.cache = DetailCache(scraper.cache_path('detail_cache.json')) if scraper.cache_dir else None
+        self.workers = workers
+        self.per_host = max(1, per_host)
+        self.ttl_seconds = ttl_hours * 3600
+
+        # One pool for every source bounds the total fan-out; it starts on first use
+        self.pool: Optional[ThreadPoolExecutor] = None
+        self.host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self.compiled = {}
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def enrich(self, source: Dict[str, Any], opportunities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Opportunities with fields from their detail pages filled in; other sources pass through"""
+        selectors = detail_selectors(source)
+        if not selectors or not opportunities or self.workers <= 0:
+            return opportunities
+
+        # Listings without a link of their own point back at the listing page
+        links = list(dict.fromkeys(opp['link'] for opp in opportunities
+                                   if opp.get('link', '').startswith(('http://', 'https://'))
+                                   and opp['link'] != source['url']))
+        with self.metrics.stage('enrich'):
+            fetch = self.metrics.bind(self.detail_fields)
+            futures = {link: self.executor().submit(fetch, link, selectors, source.get('parser')) for link in links}
+            details = {link: future.result() for link, future in futures.items()}
+
+        day_first = source['detail'].get('day_first', source.get('day_first', False))
+        enriched = [self.merge(opp, details.get(opp.get('link')), day_first) for opp in opportunities]
+        count = sum(1 for before, after in zip(opportunities, enriched) if before is not after)
+        self.metrics.count('listings_enriched', count)
+        self.logger.info(f"Enriched {count} of {len(opportunities)} listing(s) of {source['name']} "
+                         f"from {len(links)} detail page(s)")
+        return enriched
+
+    def detail_fields(self, url: str, selectors: Dict[str, str],
+                      parser: Optional[str] = None) -> Optional[Dict[str, Optional[str]]]:
+        """Fields of one detail page: from the cache while fresh or unchanged, otherwise downloaded and parsed"""
+        if self.cache:
+            fields = self.cache.fields(url, selectors, max_age=self.ttl_seconds)
+            if fields is not None:
+                self.metrics.count('detail_pages_cached')
+                return fields
+
+        backend = self.scraper.backend('requests')
+        if not backend.check_robots_txt(url):
+            self.logger.warning(f"Robots.txt disallows scraping for {url}")
+            return None
+
+        # Only revalidate if there is a previous extraction to fall back on
+        headers = {}
+        if self.cache and self.cache.fields(url, selectors) is not None:
+            headers = self.cache.conditional_headers(url)
+
+        try:
+            with self.host_slot(HostRateLimiter.host_for(url)):
+                response = backend.download(url, headers)
+
+            if response.status_code == 304 and headers:
+                self.metrics.count('detail_pages_cached')
+                self.cache.touch(url, response)
+                return self.cache.fields(url, selectors)
+
+            response.raise_for_status()
+
+            content_hash = ResponseCache.hash_content(response.content)
+            if self.cache:
+                fields = self.cache.fields(url, selectors, content_hash)
+                if fields is not None:
+                    self.metrics.count('detail_pages_cached')
+                    self.cache.touch(url, response)
+                    return fields
+
+            with self.metrics.stage('parse_detail'):
+                fields = self.compile(selectors).extract(response.content, parser or backend.parser)
+            if self.cache:
+                self.cache.store_fields(url, response, selectors, content_hash, fields)
+            return fields
+        except Exception as e:
+            # A stale extraction beats dropping the fields the store already has
+            self.logger.warning(f"Could not enrich from detail page {url}: {e}")
+            return self.cache.fields(url, selectors) if self.cache else None
+
+    def merge(self, opportunity: Dict[str, Any], fields: Optional[Dict[str, Optional[str]]],
+              day_first: bool = False) -> Dict[str, Any]:
+        """A copy of the opportunity with detail fields filled in, or the opportunity itself if none apply
+
+        The detail description replaces a shorter card description, and the
+        detail deadline is only used when the card had no readable date.
+        """
+        if not fields:
+            return opportunity
+        updates = {}
+        description = self.scraper.clean_text(fields.get('description') or '')
+        if len(description) > len(opportunity.get('description') or ''):
+            updates['description'] = description
+        if not (opportunity.get('deadline') or '')[:1].isdigit():
+            deadline = parse_deadline_text((fields.get('deadline') or '').strip(), day_first)
+            if deadline:
+                updates['deadline'] = deadline
+        for field in ('funding', 'supervisor'):
+            value = self.scraper.clean_text(fields.get(field) or '')
+            if value and value != opportunity.get(field):
+                updates[field] = value
+        return {**opportunity, **updates} if updates else opportunity
+
+    def compile(self, selectors: Dict[str, str]):
+        """Compiled detail selectors for a source config, compiling them only once"""
+        # Imported here so runs without detail selectors never load BeautifulSoup through this module
+        from html_parsing import DetailSelectors
+
+        key = ResponseCache.hash_selectors(selectors)
+        with self.lock:
+            compiled = self.compiled.get(key)
+            if compiled is None:
+                compiled = self.compiled[key] = DetailSelectors(selectors)
+            return compiled
+
+    def executor(self) -> ThreadPoolExecutor:
+        """The shared detail-page pool, started on first use"""
+        with self.lock:
+            if self.pool is None:
+                self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='details')
+            return self.pool
+
+    def host_slot(self, host: str) -> threading.BoundedSemaphore:
+        """Semaphore limiting how many detail pages are downloaded from a host at once"""
+        with self.lock:
+            slot = self.host_slots.get(host)
+            if slot is None:
+                slot = self.host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return slot
+
+    def save(self) -> None:
+        """Write the detail cache"""
+        if self.cache:
+            self.cache.save()
+
+    def close(self) -> None:
+        """Stop the detail-page pool"""
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
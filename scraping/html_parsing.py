@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+HTML Parsing Backends
+Parser selection, compiled CSS selectors for listing and detail pages and
+container pre-filtering
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Selectors used for any field a source does not configure
+DEFAULT_FIELD_SELECTORS = {
+    'title': '.title',
+    'institute': '.institute',
+    'deadline': '.deadline',
+    'link': 'a',
+    'description': '.description',
+}
+
+DEFAULT_CONTAINER_SELECTOR = '.job'
+
+PARSER_BACKENDS = ('lxml', 'html.parser')
+
+# A single compound selector such as `div.job-listing`, `#jobs` or `[data-jk]`
+# with no combinators or pseudo-classes; only these can be pre-filtered safely
+SIMPLE_SELECTOR_RE = re.compile(
+    r'^(?P<tag>[a-zA-Z][\w-]*)?'
+    r'(?P<parts>(?:\.[\w-]+|#[\w-]+|\[[\w-]+(?:=(?:"[^"]*"|\'[^\']*\'|[\w-]+))?\])*)$'
+)
+SELECTOR_PART_RE = re.compile(r'\.([\w-]+)|#([\w-]+)|\[([\w-]+)(?:=(?:"([^"]*)"|\'([^\']*)\'|([\w-]+)))?\]')
+
+# Descendant and child combinators; sibling combinators are not split on, so they fail the simple-selector check
+COMBINATOR_RE = re.compile(r'\s*>\s*|\s+')
+
+
+def resolve_parser(name: Optional[str]) -> str:
+    """Pick a BeautifulSoup tree builder, falling back to html.parser if lxml is missing
+
+    html.parser is the default: lxml repairs malformed markup differently (an
+    unclosed <p>, a nested <a>), so it is opt-in per source or with --parser.
+    """
+    name = name or 'html.parser'
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{name}', expected one of {', '.join(PARSER_BACKENDS)}")
+    if name == 'lxml':
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            return 'html.parser'
+    return name
+
+
+def has_class(name: str):
+    """Build a strainer test matching elements whose class list contains `name`"""
+    def match(value) -> bool:
+        if not value:
+            return False
+        classes = value if isinstance(value, (list, tuple)) else value.split()
+        return name in classes
+    return match
+
+
+def strainer_for(selector: str) -> Optional[SoupStrainer]:
+    """Build a SoupStrainer that keeps every element `selector` can match, if possible"""
+    match = SIMPLE_SELECTOR_RE.match(selector.strip())
+    if not match or not (match.group('tag') or match.group('parts')):
+        return None
+
+    attrs: Dict[str, Any] = {}
+    for cls, elem_id, attr, dq_value, sq_value, bare_value in SELECTOR_PART_RE.findall(match.group('parts')):
+        if cls and 'class' not in attrs:
+            # Any one class keeps a superset of matches; select() does the rest
+            attrs['class'] = has_class(cls)
+        elif elem_id:
+            attrs['id'] = elem_id
+        elif attr and attr not in attrs:
+            value = dq_value or sq_value or bare_value
+            attrs[attr] = value if value else True
+    return SoupStrainer(match.group('tag'), attrs)
+
+
+def field_strainer(selector: str) -> Tuple[bool, Optional[SoupStrainer]]:
+    """Whether a field selector matches the same elements in a pre-filtered tree, and what else must be kept
+
+    A single compound, or a chain starting at :scope, never looks outside
+    the container. A descendant or child chain of simple compounds may
+    match through an ancestor of the container, so elements its first
+    compound matches are kept too, with everything under them. Anything
+    else (sibling combinators, pseudo-classes, selector lists) is not
+    analysed and rules the pre-filter out.
+    """
+    compounds = COMBINATOR_RE.split(selector.strip())
+    scoped = compounds[0] == ':scope'
+    if scoped:
+        compounds = compounds[1:]
+    if not compounds or not all(compound and SIMPLE_SELECTOR_RE.match(compound) for compound in compounds):
+        return False, None
+    if scoped or len(compounds) == 1:
+        return True, None
+    return True, strainer_for(compounds[0])
+
+
+class AnyStrainer(SoupStrainer):
+    """Keeps a top-level element if any of several strainers would"""
+
+    def __init__(self, strainers: List[SoupStrainer]):
+        super().__init__()
+        self.strainers = strainers
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        # beautifulsoup4 < 4.13
+        return any(strainer.search_tag(markup_name, markup_attrs) for strainer in self.strainers)
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        # beautifulsoup4 >= 4.13
+        return any(strainer.allow_tag_creation(nsprefix, name, attrs) for strainer in self.strainers)
+
+    def allow_string_creation(self, string) -> bool:
+        return False
+
+
+def page_strainer(selectors: Dict[str, str]) -> Optional[SoupStrainer]:
+    """Strainer keeping what a source's selectors can match, or None if pre-filtering could change the results"""
+    container = strainer_for(selectors.get('container', DEFAULT_CONTAINER_SELECTOR))
+    if container is None:
+        return None
+    extra = []
+    for field, default in DEFAULT_FIELD_SELECTORS.items():
+        safe, strainer = field_strainer(selectors.get(field, default))
+        if not safe:
+            return None
+        if strainer is not None:
+            extra.append(strainer)
+    return AnyStrainer([container] + extra) if extra else container
+
+
+class CompiledSelectors:
+    def __init__(self, selectors: Dict[str, str]):
+        self.selectors = dict(selectors)
+        self.container_selector = selectors.get('container', DEFAULT_CONTAINER_SELECTOR)
+        self.container = soupsieve.compile(self.container_selector)
+        self.fields = {
+            field: soupsieve.compile(selectors.get(field, default))
+            for field, default in DEFAULT_FIELD_SELECTORS.items()
+        }
+        self.strainer = page_strainer(self.selectors)
+
+    def parse(self, content: bytes, parser: str = 'html.parser', prefilter: bool = True) -> BeautifulSoup:
+        """Build a tree, optionally containing only the containers and what their field selectors look at"""
+        parse_only = self.strainer if prefilter else None
+        return BeautifulSoup(content, parser, parse_only=parse_only)
+
+    def containers(self, soup: BeautifulSoup) -> list:
+        """Find every listing container in a parsed page"""
+        return self.container.select(soup)
+
+    def extract_fields(self, container) -> Dict[str, Optional[str]]:
+        """Raw text of each field in a container (the link's href), None where the element is missing"""
+        fields = {}
+        for field in ('title', 'institute', 'deadline', 'description'):
+            elem = self.fields[field].select_one(container)
+            fields[field] = elem.get_text(strip=True) if elem else None
+        link_elem = self.fields['link'].select_one(container)
+        fields['link'] = link_elem.get('href', '') if link_elem else None
+        return fields
+
+
+class DetailSelectors:
+    def __init__(self, selectors: Dict[str, str]):
+        self.selectors = dict(selectors)
+        self.fields = {field: soupsieve.compile(selector) for field, selector in selectors.items()}
+
+    def extract(self, content: bytes, parser: str = 'html.parser') -> Dict[str, Optional[str]]:
+        """Text of each configured field on a detail page, None where the element is missing"""
+        soup = BeautifulSoup(content, resolve_parser(parser))
+        fields = {}
+        for field, selector in self.fields.items():
+            elem = selector.select_one(soup)
+            fields[field] = elem.get_text(' ', strip=True) if elem else None
+        return fields
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+HTTP Conditional-Request Cache
+Persists validators and extraction results per URL between scraping runs
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+class ResponseCache:
+    def __init__(self, cache_path: str = "data/cache/http_cache.json"):
+        self.cache_path = cache_path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.logger = logging.getLogger(__name__)
+        self.load()
+
+    def load(self) -> None:
+        """Load cached entries from disk"""
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r') as f:
+                self.entries = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            self.logger.warning(f"Could not read HTTP cache, starting empty: {e}")
+            self.entries = {}
+
+    def save(self) -> None:
+        """Write cached entries to disk if anything changed"""
+        with self.lock:
+            if not self.dirty:
+                return
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+            self.dirty = False
+
+    @staticmethod
+    def hash_content(content: bytes) -> str:
+        """Hash a response body"""
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def hash_selectors(selectors: Dict[str, Any]) -> str:
+        """Hash a selector (or wider extraction) config so stale extractions are not reused after it changes"""
+        return hashlib.md5(json.dumps(selectors, sort_keys=True).encode()).hexdigest()[:12]
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a URL"""
+        with self.lock:
+            entry = self.entries.get(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def lookup(self, url: str, config: Dict[str, Any],
+               content_hash: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """Return previous extraction results for a URL if they are still valid
+
+        `config` is everything the stored results depend on (selectors, date
+        order, relevance settings); results stored under another config are
+        not reused. Without `content_hash` the caller is reusing results after
+        a 304; with it, results are only returned if the body is unchanged.
+        """
+        with self.lock:
+            entry = self.entries.get(url)
+        if not entry or entry.get('config_hash') != self.hash_selectors(config):
+            return None
+        if content_hash is not None and entry.get('content_hash') != content_hash:
+            return None
+        return entry.get('opportunities')
+
+    def store(self, url: str, response, config: Dict[str, Any], content_hash: str,
+              opportunities: List[Dict[str, Any]]) -> None:
+        """Remember validators and extraction results for a URL under the config that produced them"""
+        with self.lock:
+            self.entries[url] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'content_hash': content_hash,
+                'config_hash': self.hash_selectors(config),
+                'opportunities': opportunities,
+                'fetched_at': datetime.now().isoformat()
+            }
+            self.dirty = True
+
+    def touch(self, url: str, response) -> None:
+        """Refresh validators for an unchanged URL"""
+        with self.lock:
+            entry = self.entries.get(url)
+            if not entry:
+                return
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag:
+                entry['etag'] = etag
+            if last_modified:
+                entry['last_modified'] = last_modified
+            entry['fetched_at'] = datetime.now().isoformat()
+            self.dirty = True
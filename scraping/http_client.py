@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Resilient HTTP Client
+Per-host connection pools, split timeouts, jittered retries and a
+persistent per-host circuit breaker
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import Metrics
+from rate_limiter import HostRateLimiter
+
+# Worth retrying: rate limiting and server-side trouble
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Failures that say the host is struggling; others (a bad URL, a redirect loop) say nothing about it
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of contacting a host whose breaker is open"""
+
+
+class CircuitBreakers:
+    """Per-host breakers, persisted so a host that was down stays skipped until its cool-down ends
+
+    A host opens after `failure_threshold` consecutive failures. Once the
+    cool-down has passed, one probe request is let through; success closes
+    the breaker, failure re-opens it for twice as long.
+    """
+
+    def __init__(self, state_path: Optional[str] = "data/cache/circuit_breakers.json",
+                 failure_threshold: int = 3, cooldown_seconds: float = 900,
+                 max_cooldown_seconds: float = 24 * 3600):
+        self.state_path = state_path
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self.hosts: Dict[str, Dict[str, Any]] = {}
+        # host -> thread sending its probe
+        self.probing: Dict[str, int] = {}
+        self.rejected: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.logger = logging.getLogger(__name__)
+        self.load()
+
+    def load(self) -> None:
+        """Load breaker state from disk"""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, 'r') as f:
+                self.hosts = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            self.logger.warning(f"Could not read circuit breaker state, starting closed: {e}")
+            self.hosts = {}
+
+    def save(self) -> None:
+        """Write breaker state to disk if anything changed"""
+        with self.lock:
+            if not self.state_path or not self.dirty:
+                return
+            os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.hosts, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.state_path)
+            self.dirty = False
+
+    def state(self, host: str) -> str:
+        """Current state of a host's breaker"""
+        with self.lock:
+            return self._state(host, time.time())
+
+    def _state(self, host: str, now: float) -> str:
+        entry = self.hosts.get(host)
+        if not entry or entry['state'] == CLOSED:
+            return CLOSED
+        if entry['state'] == OPEN and now >= entry['opened_at'] + entry['cooldown']:
+            return HALF_OPEN
+        return entry['state']
+
+    def allow(self, host: str) -> bool:
+        """Whether a request to `host` may go out; only one probe at a time while half-open"""
+        with self.lock:
+            state = self._state(host, time.time())
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and host not in self.probing:
+                self.probing[host] = threading.get_ident()
+                self.logger.info(f"Probing {host} after circuit breaker cool-down")
+                return True
+            self.rejected[host] = self.rejected.get(host, 0) + 1
+            return False
+
+    def end_probe(self, host: str) -> None:
+        """Let another probe through if this thread's probe ended without a verdict, such as a non-HTTP error"""
+        with self.lock:
+            if self.probing.get(host) == threading.get_ident():
+                del self.probing[host]
+
+    def start_cycle(self) -> None:
+        """Start counting skipped requests afresh for a new daemon cycle"""
+        with self.lock:
+            self.rejected.clear()
+
+    def record_success(self, host: str) -> None:
+        """Close a host's breaker after a successful request"""
+        with self.lock:
+            self.probing.pop(host, None)
+            entry = self.hosts.get(host)
+            if entry and (entry['state'] != CLOSED or entry['failures']):
+                if entry['state'] != CLOSED:
+                    self.logger.info(f"Circuit breaker for {host} closed")
+                self.hosts[host] = {'state': CLOSED, 'failures': 0, 'cooldown': self.cooldown_seconds}
+                self.dirty = True
+
+    def record_failure(self, host: str, error: str) -> None:
+        """Count a failed request, opening the breaker at the threshold or after a failed probe"""
+        with self.lock:
+            now = time.time()
+            was_probe = host in self.probing
+            self.probing.pop(host, None)
+            entry = self.hosts.setdefault(host, {'state': CLOSED, 'failures': 0, 'cooldown': self.cooldown_seconds})
+            entry['failures'] += 1
+            entry['last_error'] = error[:200]
+            entry['last_failure'] = now
+            if was_probe:
+                entry['cooldown'] = min(self.max_cooldown_seconds, entry['cooldown'] * 2)
+            if was_probe or entry['failures'] >= self.failure_threshold:
+                if entry['state'] != OPEN or was_probe:
+                    self.logger.warning(f"Circuit breaker for {host} open for {entry['cooldown']:.0f}s: {error}")
+                entry['state'] = OPEN
+                entry['opened_at'] = now
+            self.dirty = True
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Hosts whose breaker is not cleanly closed, for the run summary"""
+        with self.lock:
+            now = time.time()
+            report = {}
+            for host, entry in sorted(self.hosts.items()):
+                state = self._state(host, now)
+                if state == CLOSED and not entry['failures'] and host not in self.rejected:
+                    continue
+                report[host] = {
+                    'state': state,
+                    'failures': entry['failures'],
+                    'skippedRequests': self.rejected.get(host, 0),
+                    'lastError': entry.get('last_error'),
+                }
+                if state == OPEN:
+                    report[host]['retryAfterSeconds'] = round(entry['opened_at'] + entry['cooldown'] - now)
+            return report
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parse a Retry-After header given as seconds or an HTTP date"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HttpClient:
+    def __init__(self, session: requests.Session, rate_limiter: HostRateLimiter, breakers: CircuitBreakers,
+                 metrics: Optional[Metrics] = None, connect_timeout: float = 5.0, read_timeout: float = 20.0,
+                 max_retries: int = 3, backoff_base: float = 1.0, backoff_cap: float = 30.0,
+                 pool_size: int = 10):
+        self.session = session
+        self.rate_limiter = rate_limiter
+        self.breakers = breakers
+        self.metrics = metrics or Metrics(enabled=False)
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.pool_size = pool_size
+        self.mounted = set()
+        self.lock = threading.Lock()
+        self.retries = 0
+        self.logger = logging.getLogger(__name__)
+
+    def mount_host(self, url: str) -> str:
+        """Give each host its own connection pool the first time it is seen"""
+        host = HostRateLimiter.host_for(url)
+        with self.lock:
+            if host not in self.mounted:
+                scheme = url.split('://', 1)[0]
+                # max_retries=0: retries happen here, where they respect pacing and the breaker
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                self.session.mount(f"{scheme}://{host}/", adapter)
+                self.mounted.add(host)
+        return host
+
+    def backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Full-jitter exponential backoff, stretched to honour Retry-After"""
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        if response is not None:
+            requested = retry_after_seconds(response)
+            if requested is not None:
+                delay = max(delay, min(requested, self.backoff_cap))
+        return delay
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+            timeout: Optional[Tuple[float, float]] = None, max_retries: Optional[int] = None) -> requests.Response:
+        """GET with pacing, retries on transient failures and the host's circuit breaker
+
+        Returns the last response even if its status is an error, so callers
+        keep their own status handling; raises CircuitOpenError when the host
+        is being skipped and the last RequestException if every attempt failed
+        to get a response.
+        """
+        host = self.mount_host(url)
+        retries = self.max_retries if max_retries is None else max_retries
+        if not self.breakers.allow(host):
+            raise CircuitOpenError(f"Circuit breaker open for {host}, skipping {url}")
+
+        try:
+            return self.attempt(url, host, headers, timeout, retries)
+        finally:
+            # A probe that raised anything else must not keep the host locked out
+            self.breakers.end_probe(host)
+
+    def attempt(self, url: str, host: str, headers: Optional[Dict[str, str]],
+                timeout: Optional[Tuple[float, float]], retries: int) -> requests.Response:
+        """Request `url` until it succeeds or the retries run out, reporting the outcome to the breaker"""
+        attempt = 0
+        while True:
+            with self.metrics.stage('rate_limit_wait'):
+                self.rate_limiter.acquire(url)
+            try:
+                with self.metrics.stage('download'):
+                    response = self.session.get(url, headers=headers, timeout=timeout or self.timeout)
+            except TRANSIENT_ERRORS as e:
+                if attempt >= retries:
+                    self.breakers.record_failure(host, f"{type(e).__name__}: {e}")
+                    raise
+                delay = self.backoff(attempt)
+                self.logger.info(f"{type(e).__name__} for {url}, retrying in {delay:.1f}s")
+            else:
+                if response.status_code not in RETRYABLE_STATUS or attempt >= retries:
+                    if response.status_code == 429 or response.status_code >= 500:
+                        self.breakers.record_failure(host, f"HTTP {response.status_code}")
+                    else:
+                        self.breakers.record_success(host)
+                    return response
+                delay = self.backoff(attempt, response)
+                self.logger.info(f"HTTP {response.status_code} for {url}, retrying in {delay:.1f}s")
+                response.close()
+
+            with self.lock:
+                self.retries += 1
+            self.metrics.count('retries')
+            with self.metrics.stage('retry_backoff'):
+                time.sleep(delay)
+            attempt += 1
+
+    def start_cycle(self) -> None:
+        """Start counting retries afresh for a new daemon cycle"""
+        with self.lock:
+            self.retries = 0
+
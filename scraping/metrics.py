@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Scraping Metrics
+Per-source, per-stage timings and counters with JSON and Prometheus export,
+plus optional profiling of a whole run
+"""
+
+import cProfile
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+METRIC_PREFIX = 'phd_scraper'
+
+# Label for work not tied to one source, such as saving results
+RUN_SOURCE = '_run'
+
+# Returned by a disabled Metrics so instrumented code pays for one call and nothing else
+DISABLED_STAGE = nullcontext()
+
+COUNTER_HELP = {
+    'bytes_downloaded': 'Response body bytes downloaded',
+    'pages_fetched': 'Pages downloaded or rendered',
+    'pages_not_modified': 'Pages answered from the HTTP cache',
+    'containers': 'Listing containers found on fetched pages',
+    'extracted': 'Listings extracted from containers',
+    'containers_new': 'Containers not seen by the previous run',
+    'containers_changed': 'Containers of known listings whose HTML changed',
+    'containers_unchanged': 'Containers reused from the previous run without extraction',
+    'containers_removed': 'Containers of the previous run no longer listed',
+    'dropped_relevance': 'Listings dropped by the relevance filter',
+    'dropped_validation': 'Listings dropped by validation',
+    'opportunities': 'Listings kept after every filter',
+    'listings_enriched': 'Listings given fields from their detail page',
+    'detail_pages_cached': 'Detail pages answered from the detail cache',
+    'errors': 'Failed source scrapes',
+    'retries': 'Requests retried after a transient failure',
+}
+
+
+class StageTimer:
+    def __init__(self, metrics: 'Metrics', source: str, stage: str):
+        self.metrics = metrics
+        self.key = (source, stage)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.metrics.observe(self.key, time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.started = time.time()
+        # (source, stage) -> [calls, total seconds, max seconds]
+        self.timings: Dict[Tuple[str, str], list] = {}
+        self.counters: Counter = Counter()
+        self.resolved_hosts = set()
+
+    def reset(self) -> None:
+        """Forget everything recorded and start timing a new run"""
+        with self.lock:
+            self.started = time.time()
+            self.timings.clear()
+            self.counters.clear()
+            self.resolved_hosts.clear()
+
+    def current_source(self) -> str:
+        """Source being scraped on this thread, or RUN_SOURCE outside a source"""
+        return getattr(self.local, 'source', RUN_SOURCE)
+
+    @contextmanager
+    def source(self, name: str) -> Iterator[None]:
+        """Attribute everything recorded on this thread to `name`"""
+        previous = self.current_source()
+        self.local.source = name
+        try:
+            yield
+        finally:
+            self.local.source = previous
+
+    def bind(self, func: Callable) -> Callable:
+        """Wrap `func` so worker threads record under the calling thread's source"""
+        if not self.enabled:
+            return func
+        name = self.current_source()
+
+        def bound(*args, **kwargs):
+            with self.source(name):
+                return func(*args, **kwargs)
+        return bound
+
+    def stage(self, stage: str):
+        """Context manager timing one stage for the current source"""
+        if not self.enabled:
+            return DISABLED_STAGE
+        return StageTimer(self, self.current_source(), stage)
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Record a stage for the current source that was timed elsewhere, e.g. in a worker process"""
+        if not self.enabled:
+            return
+        self.observe((self.current_source(), stage), seconds)
+
+    def observe(self, key: Tuple[str, str], seconds: float) -> None:
+        """Record one timed call of a stage"""
+        with self.lock:
+            timing = self.timings.get(key)
+            if timing is None:
+                self.timings[key] = [1, seconds, seconds]
+            else:
+                timing[0] += 1
+                timing[1] += seconds
+                timing[2] = max(timing[2], seconds)
+
+    def count(self, name: str, value: float = 1) -> None:
+        """Add to a counter for the current source"""
+        if not self.enabled:
+            return
+        key = (self.current_source(), name)
+        with self.lock:
+            self.counters[key] += value
+
+    def resolve(self, url: str) -> None:
+        """Time a DNS lookup for a URL's host, once per run; the OS resolver cache serves the real request"""
+        if not self.enabled:
+            return
+        host = urlparse(url).hostname
+        with self.lock:
+            if not host or host in self.resolved_hosts:
+                return
+            self.resolved_hosts.add(host)
+        with self.stage('dns'):
+            try:
+                socket.getaddrinfo(host, None)
+            except OSError:
+                pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Everything recorded so far, grouped by source"""
+        with self.lock:
+            sources: Dict[str, Dict[str, Any]] = {}
+            for (source, stage), (calls, total, longest) in sorted(self.timings.items()):
+                entry = sources.setdefault(source, {'stages': {}, 'counters': {}})
+                entry['stages'][stage] = {'calls': calls, 'seconds': round(total, 6), 'max_seconds': round(longest, 6)}
+            for (source, name), value in sorted(self.counters.items()):
+                entry = sources.setdefault(source, {'stages': {}, 'counters': {}})
+                entry['counters'][name] = value
+
+            totals: Dict[str, Any] = {'stages': {}, 'counters': {}}
+            for (_, stage), (calls, total, longest) in self.timings.items():
+                stage_total = totals['stages'].setdefault(stage, {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+                stage_total['calls'] += calls
+                stage_total['seconds'] = round(stage_total['seconds'] + total, 6)
+                stage_total['max_seconds'] = round(max(stage_total['max_seconds'], longest), 6)
+            for (_, name), value in self.counters.items():
+                totals['counters'][name] = totals['counters'].get(name, 0) + value
+
+        return {
+            'started': datetime.fromtimestamp(self.started).isoformat(),
+            'duration_seconds': round(time.time() - self.started, 3),
+            'totals': totals,
+            'sources': sources,
+        }
+
+    def write_json(self, path: str) -> None:
+        """Atomically write the metrics snapshot as JSON"""
+        write_atomic(path, json.dumps(self.snapshot(), indent=2, ensure_ascii=False))
+
+    def write_prometheus(self, path: str) -> None:
+        """Atomically write the metrics in Prometheus textfile-collector format"""
+        lines = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+
+        with self.lock:
+            timings = sorted(self.timings.items())
+            counters = sorted(self.counters.items())
+
+        family('stage_seconds_total', 'counter', 'Time spent in each scraping stage')
+        for (source, stage), (_, total, _) in timings:
+            lines.append(f"{METRIC_PREFIX}_stage_seconds_total{labels(source=source, stage=stage)} {total:.6f}")
+        family('stage_calls_total', 'counter', 'Times each scraping stage ran')
+        for (source, stage), (calls, _, _) in timings:
+            lines.append(f"{METRIC_PREFIX}_stage_calls_total{labels(source=source, stage=stage)} {calls}")
+        family('stage_max_seconds', 'gauge', 'Longest single run of each scraping stage')
+        for (source, stage), (_, _, longest) in timings:
+            lines.append(f"{METRIC_PREFIX}_stage_max_seconds{labels(source=source, stage=stage)} {longest:.6f}")
+
+        for name in sorted({name for (_, name), _ in counters}):
+            family(f"{name}_total", 'counter', COUNTER_HELP.get(name, name.replace('_', ' ')))
+            for (source, counter), value in counters:
+                if counter == name:
+                    lines.append(f"{METRIC_PREFIX}_{name}_total{labels(source=source)} {value:g}")
+
+        family('run_duration_seconds', 'gauge', 'Wall-clock duration of the run')
+        lines.append(f"{METRIC_PREFIX}_run_duration_seconds {time.time() - self.started:.3f}")
+        family('last_run_timestamp_seconds', 'gauge', 'Unix time the run finished')
+        lines.append(f"{METRIC_PREFIX}_last_run_timestamp_seconds {time.time():.0f}")
+        write_atomic(path, '\n'.join(lines) + '\n')
+
+
+def labels(**values: str) -> str:
+    """Format a Prometheus label set, escaping values"""
+    def escape(value: str) -> str:
+        return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{key}="{escape(str(value))}"' for key, value in values.items()) + '}'
+
+
+def write_atomic(path: str, text: str) -> None:
+    """Write a file through a temporary name so readers never see it half-written"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class SamplingProfiler:
+    """Samples every thread's stack at a fixed interval and writes collapsed stacks
+
+    The output (`frame;frame;frame count` per line) can be fed to
+    flamegraph.pl or speedscope. Unlike cProfile it does not slow down
+    the code being measured, so Selenium and network waits keep their
+    real proportions.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='sampler', daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self) -> None:
+        """Collect samples until stopped"""
+        own_id = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def write(self, path: str) -> None:
+        """Write samples in collapsed-stack format"""
+        write_atomic(path, ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common()))
+
+
+@contextmanager
+def profiled(mode: Optional[str], path: Optional[str]) -> Iterator[None]:
+    """Profile the enclosed block with cProfile ('cprofile') or the stack sampler ('sample')
+
+    cProfile only profiles the thread that enables it; with concurrent
+    workers that thread mostly waits on futures, so use the sampler there.
+    """
+    if not mode or not path:
+        yield
+        return
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            profiler.dump_stats(path)
+    elif mode == 'sample':
+        sampler = SamplingProfiler()
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            sampler.write(path)
+    else:
+        raise ValueError(f"Unknown profiler '{mode}', expected 'cprofile' or 'sample'")
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detection
+MinHash signatures over character shingles with a persistent LSH index
+"""
+
+import hashlib
+import operator
+import re
+import sqlite3
+import zlib
+from array import array
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Bumped whenever signatures computed by older code stop being comparable
+SIGNATURE_VERSION = '2'
+
+MAX_HASH = (1 << 32) - 1
+MASK_64 = (1 << 64) - 1
+# Odd 64-bit multipliers (golden ratio and a MurmurHash3 finalizer constant)
+# used to spread shingle hashes and to derive borrowed values for empty bins
+SPREAD = 0x9E3779B97F4A7C15
+BORROW = 0xC4CEB9FE1A85EC53
+
+# Only the candidates sharing the most LSH bands are verified
+MAX_CANDIDATES = 16
+
+SHINGLE_SIZE = 4
+NORMALIZE_RE = re.compile(r'[^a-z0-9]+')
+# Dropped before normalizing, so "Ph.D." and "PhD" give the same word
+ELIDED_RE = re.compile(r"[.'’]")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS minhash_signatures (
+    id TEXT PRIMARY KEY,
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS minhash_buckets (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_minhash_buckets ON minhash_buckets (band, bucket);
+CREATE INDEX IF NOT EXISTS idx_minhash_buckets_id ON minhash_buckets (id);
+CREATE TABLE IF NOT EXISTS minhash_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def shingle_text(opportunity: Dict[str, Any]) -> str:
+    """Normalized text that identifies a position: title plus institute"""
+    text = f"{opportunity.get('title', '')} {opportunity.get('institute', '')}".lower()
+    return NORMALIZE_RE.sub(' ', text).strip()
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lower-cased words of a field, punctuation removed"""
+    return NORMALIZE_RE.sub(' ', ELIDED_RE.sub('', (text or '').lower())).strip()
+
+
+def same_listing(first: Dict[str, Any], second: Dict[str, Any], threshold: float) -> bool:
+    """Whether two records the index found similar are the same position
+
+    The shingles mix title and institute, so the same title at another
+    institute, or another numbered project at the same one, can score above
+    the threshold. Only records from different sources at the same institute
+    whose titles have the same numbers and enough words in common count.
+    """
+    institute = normalize(first.get('institute'))
+    if not institute or institute == 'unknown' or institute != normalize(second.get('institute')):
+        return False
+    if first.get('source') and first.get('source') == second.get('source'):
+        return False
+    first_words, second_words = set(normalize(first.get('title')).split()), set(normalize(second.get('title')).split())
+    if not first_words or not second_words:
+        return False
+    if {word for word in first_words if word.isdigit()} != {word for word in second_words if word.isdigit()}:
+        return False
+    return len(first_words & second_words) / len(first_words | second_words) >= threshold
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """Hashed character shingles of a normalized string"""
+    if len(text) <= size:
+        return {zlib.crc32(text.encode())} if text else set()
+    return {zlib.crc32(text[i:i + size].encode()) for i in range(len(text) - size + 1)}
+
+
+def record_richness(opportunity: Dict[str, Any]) -> int:
+    """Rough measure of how much useful information a record carries"""
+    score = len(opportunity.get('description') or '')
+    deadline = opportunity.get('deadline') or ''
+    if deadline[:1].isdigit():
+        score += 200
+    if opportunity.get('institute') and opportunity.get('institute') != 'Unknown':
+        score += 50
+    if opportunity.get('title') and opportunity.get('title') != 'No title':
+        score += 50
+    return score
+
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Pick (bands, rows) whose LSH threshold sits just below `threshold`
+
+    Candidates are verified against the real threshold afterwards, so
+    erring low only costs a few extra comparisons.
+    """
+    best = (num_perm, 1)
+    best_gap = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        lsh_threshold = (1 / bands) ** (1 / rows)
+        if lsh_threshold > threshold:
+            continue
+        gap = threshold - lsh_threshold
+        if best_gap is None or gap < best_gap:
+            best, best_gap = (bands, rows), gap
+    return best
+
+
+class MinHasher:
+    """One-permutation MinHash: each shingle is hashed once into one of `num_perm` bins
+
+    This costs one multiply per shingle instead of one per shingle and
+    permutation. Empty bins borrow the value of the next filled bin,
+    rehashed by distance, so signatures stay comparable position by
+    position (densified one-permutation hashing).
+    """
+
+    def __init__(self, num_perm: int = 64):
+        self.num_perm = num_perm
+
+    def signature(self, opportunity: Dict[str, Any]) -> List[int]:
+        """MinHash signature of an opportunity's shingles"""
+        hashes = shingles(shingle_text(opportunity))
+        if not hashes:
+            return [MAX_HASH] * self.num_perm
+
+        bins = [None] * self.num_perm
+        for h in hashes:
+            spread = (h * SPREAD) & MASK_64
+            index = spread % self.num_perm
+            value = spread >> 32
+            if bins[index] is None or value < bins[index]:
+                bins[index] = value
+
+        signature = []
+        for index in range(self.num_perm):
+            distance = 0
+            while bins[(index + distance) % self.num_perm] is None:
+                distance += 1
+            value = bins[(index + distance) % self.num_perm]
+            signature.append(value if not distance else ((value + distance) * BORROW & MASK_64) >> 32)
+        return signature
+
+    @staticmethod
+    def similarity(first: List[int], second: List[int]) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return sum(map(operator.eq, first, second)) / len(first)
+
+
+class NearDuplicateIndex:
+    def __init__(self, conn: Optional[sqlite3.Connection] = None, threshold: float = 0.7, num_perm: int = 64):
+        self.conn = conn or sqlite3.connect(':memory:')
+        self.conn.executescript(SCHEMA)
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm)
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+        self.ensure_layout()
+
+    def ensure_layout(self) -> None:
+        """Rebuild stored signatures or buckets if the index was built with other parameters"""
+        stored = dict(self.conn.execute("SELECT key, value FROM minhash_meta"))
+        layout = {'num_perm': str(self.hasher.num_perm), 'bands': str(self.bands), 'rows': str(self.rows),
+                  'version': SIGNATURE_VERSION}
+        if stored == layout:
+            return
+        with self.conn:
+            if stored.get('num_perm') != layout['num_perm'] or stored.get('version') != SIGNATURE_VERSION:
+                # Signatures are incompatible; callers re-add records as needed
+                self.conn.execute("DELETE FROM minhash_signatures")
+            self.conn.execute("DELETE FROM minhash_buckets")
+            for opp_id, blob in self.conn.execute("SELECT id, signature FROM minhash_signatures").fetchall():
+                signature = array('Q')
+                signature.frombytes(blob)
+                self.conn.executemany(
+                    "INSERT INTO minhash_buckets (band, bucket, id) VALUES (?, ?, ?)",
+                    [(band, bucket, opp_id) for band, bucket in self.band_buckets(list(signature))]
+                )
+            self.conn.execute("DELETE FROM minhash_meta")
+            self.conn.executemany("INSERT INTO minhash_meta (key, value) VALUES (?, ?)", layout.items())
+
+    def band_buckets(self, signature: List[int]) -> List[Tuple[int, int]]:
+        """Hash each band of a signature into a bucket id"""
+        buckets = []
+        for band in range(self.bands):
+            chunk = array('Q', signature[band * self.rows:(band + 1) * self.rows]).tobytes()
+            bucket = int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), 'big', signed=True)
+            buckets.append((band, bucket))
+        return buckets
+
+    def count(self) -> int:
+        """Number of indexed records"""
+        return self.conn.execute("SELECT COUNT(*) FROM minhash_signatures").fetchone()[0]
+
+    def add(self, opp_id: str, opportunity: Dict[str, Any]) -> None:
+        """Index (or re-index) a record under `opp_id`"""
+        self.remove(opp_id)
+        signature = self.hasher.signature(opportunity)
+        self.conn.execute(
+            "INSERT INTO minhash_signatures (id, signature) VALUES (?, ?)",
+            (opp_id, array('Q', signature).tobytes())
+        )
+        self.conn.executemany(
+            "INSERT INTO minhash_buckets (band, bucket, id) VALUES (?, ?, ?)",
+            [(band, bucket, opp_id) for band, bucket in self.band_buckets(signature)]
+        )
+
+    def add_many(self, records: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Index many (id, record) pairs"""
+        for opp_id, opportunity in records:
+            self.add(opp_id, opportunity)
+
+    def remove(self, opp_id: str) -> None:
+        """Drop a record from the index"""
+        self.conn.execute("DELETE FROM minhash_signatures WHERE id = ?", (opp_id,))
+        self.conn.execute("DELETE FROM minhash_buckets WHERE id = ?", (opp_id,))
+
+    def find(self, opportunity: Dict[str, Any], exclude: Optional[str] = None,
+             accept: Optional[Callable[[str], bool]] = None) -> Optional[Tuple[str, float]]:
+        """Return (id, similarity) of the closest indexed record at or above the threshold
+
+        Records sharing more bands are more similar, so only the
+        MAX_CANDIDATES with the most shared bands are compared in full.
+        With `accept`, candidates it rejects are passed over for the next
+        closest.
+        """
+        signature = self.hasher.signature(opportunity)
+        collisions: Counter = Counter()
+        for band, bucket in self.band_buckets(signature):
+            collisions.update(
+                row[0] for row in self.conn.execute(
+                    "SELECT id FROM minhash_buckets WHERE band = ? AND bucket = ?", (band, bucket)
+                )
+            )
+        collisions.pop(exclude, None)
+        candidates = [candidate for candidate, _ in collisions.most_common(MAX_CANDIDATES)]
+        if not candidates:
+            return None
+
+        scored = []
+        rows = self.conn.execute(
+            f"SELECT id, signature FROM minhash_signatures WHERE id IN ({', '.join('?' * len(candidates))})",
+            candidates
+        )
+        for candidate, blob in rows:
+            stored = array('Q')
+            stored.frombytes(blob)
+            score = MinHasher.similarity(signature, stored)
+            if score >= self.threshold:
+                scored.append((candidate, score))
+        scored.sort(key=lambda match: -match[1])
+        for candidate, score in scored:
+            if accept is None or accept(candidate):
+                return candidate, score
+        return None
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Pagination
+Page URL generation, next-link discovery and the listing ids seen by previous runs
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+from urllib.parse import urljoin
+
+DEFAULT_MAX_PAGES = 10
+DEFAULT_PAGE_CONCURRENCY = 4
+
+# Ids kept per source; old listings fall off the end once a site has moved on
+MAX_SEEN_IDS = 5000
+
+
+def pagination_mode(pagination: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Which kind of pagination a source config describes, if any"""
+    if not pagination:
+        return None
+    if pagination.get('url_template'):
+        return 'template'
+    if pagination.get('next_selector'):
+        return 'next'
+    if pagination.get('scroll'):
+        return 'scroll'
+    return None
+
+
+def page_url(pagination: Dict[str, Any], page: int) -> str:
+    """Fill in a page-number URL template, e.g. `...?page={page}` or `...&start={offset}`"""
+    start = pagination.get('start', 1)
+    offset = (page - start) * pagination.get('page_size', 0)
+    return pagination['url_template'].format(page=page, offset=offset)
+
+
+def find_next_link(content: bytes, selector: str, base_url: str, parser: str = 'html.parser') -> Optional[str]:
+    """Absolute URL of the next-page link in a document, if there is one"""
+    # Imported here so loading pagination settings does not pull in the HTML parsers
+    import soupsieve
+    from bs4 import BeautifulSoup
+    from html_parsing import strainer_for
+
+    soup = BeautifulSoup(content, parser, parse_only=strainer_for(selector))
+    link = soupsieve.select_one(selector, soup)
+    if link is None or not link.get('href'):
+        return None
+    return urljoin(base_url, link['href'])
+
+
+class SeenListings:
+    def __init__(self, path: Optional[str] = "data/cache/seen_listings.json"):
+        self.path = path
+        self.previous: Dict[str, List[str]] = {}
+        self.current: Dict[str, List[str]] = {}
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+        self.load()
+
+    def load(self) -> None:
+        """Load the ids recorded by the previous run"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self.previous = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            self.logger.warning(f"Could not read seen listings, crawling every page: {e}")
+            self.previous = {}
+
+    def known(self, source_key: str) -> Set[str]:
+        """Ids a source produced in the previous run"""
+        with self.lock:
+            return set(self.previous.get(source_key, []))
+
+    def record(self, source_key: str, ids: Iterable[str]) -> None:
+        """Remember the ids seen this run, newest first, ahead of older ones"""
+        ids = list(dict.fromkeys(ids))
+        with self.lock:
+            fresh = set(ids)
+            older = [opp_id for opp_id in self.previous.get(source_key, []) if opp_id not in fresh]
+            self.current[source_key] = (ids + older)[:MAX_SEEN_IDS]
+
+    def save(self) -> None:
+        """Write this run's ids, keeping entries for sources not scraped this time"""
+        with self.lock:
+            if not self.current:
+                return
+            # A long-running process compares its next run against this one
+            self.previous, self.current = {**self.previous, **self.current}, {}
+            if not self.path:
+                return
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.previous, f)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Parse Workers
+Tree building and listing extraction for downloaded pages. The same code
+runs in the scraping thread or, with --parse-workers, in a process pool so
+CPU-bound parsing is not serialised by the GIL. Containers whose fingerprint
+the previous run already had are not extracted again.
+"""
+
+import json
+import logging
+import time
+from typing import Collection, Dict, List, Optional, Tuple
+
+from html_parsing import CompiledSelectors
+from records import opportunity_from_fields, to_record
+from snapshots import fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Compiled selectors per source config, kept for the life of a worker process
+_compiled: Dict[str, CompiledSelectors] = {}
+
+# ([(fingerprint, record or None if unchanged)], containers found, parse seconds, extract seconds)
+PageExtraction = Tuple[List[Tuple[str, Optional[Tuple]]], int, float, float]
+
+
+def extract_listings(content: bytes, compiled: CompiledSelectors, base_url: str, parser: str,
+                     prefilter: bool = True, day_first: bool = False, known: Collection[str] = ()) -> PageExtraction:
+    """Parse a page and extract its new or changed listings as compact records, before relevance filtering"""
+    started = time.perf_counter()
+    soup = compiled.parse(content, parser, prefilter)
+    parsed = time.perf_counter()
+
+    containers = compiled.containers(soup)
+    records = []
+    for container in containers:
+        key = fingerprint(str(container))
+        if key in known:
+            records.append((key, None))
+            continue
+        try:
+            fields = compiled.extract_fields(container)
+            records.append((key, to_record(opportunity_from_fields(fields, base_url, day_first))))
+        except Exception as e:
+            logger.error(f"Error extracting opportunity data: {e}")
+    return records, len(containers), parsed - started, time.perf_counter() - parsed
+
+
+def extract_in_worker(content: bytes, selectors: Dict[str, str], base_url: str, parser: str,
+                      prefilter: bool = True, day_first: bool = False, known: Collection[str] = ()) -> PageExtraction:
+    """Process-pool entry point: only page bytes and the selector config cross the process boundary"""
+    key = json.dumps(selectors, sort_keys=True)
+    compiled = _compiled.get(key)
+    if compiled is None:
+        compiled = _compiled[key] = CompiledSelectors(selectors)
+    return extract_listings(content, compiled, base_url, parser, prefilter, day_first, known)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Per-host request pacing
+Token-bucket rate limiting shared by all scraper worker threads
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accumulated since the last update"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait for it"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            if self.tokens >= 0 or self.rate <= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self) -> float:
+        """Block until a token is available, returning the time spent waiting"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    def __init__(self, rate: float = 0.5, burst: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def host_for(url: str) -> str:
+        """Get the bucket key for a URL"""
+        return urlparse(url).netloc.lower()
+
+    def bucket(self, host: str) -> TokenBucket:
+        """Get or create the token bucket for a host"""
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self.buckets[host] = bucket
+            return bucket
+
+    def set_delay(self, host: str, delay: Optional[float]) -> None:
+        """Slow a host down to at most one request every `delay` seconds"""
+        if not delay or delay <= 0:
+            return
+        bucket = self.bucket(host)
+        with bucket.lock:
+            bucket.rate = min(bucket.rate, 1.0 / delay) if bucket.rate > 0 else 1.0 / delay
+            bucket.capacity = 1.0
+            bucket.tokens = min(bucket.tokens, bucket.capacity)
+
+    def acquire(self, url: str) -> float:
+        """Wait for permission to send a request to the host of `url`"""
+        return self.bucket(self.host_for(url)).acquire()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Listing Records
+Turning raw listing fields into opportunities, shared by every extraction
+path, the compact tuple form parse workers send back, slotted records for
+holding many stored opportunities at once, and streaming JSON writers
+"""
+
+import json
+import os
+import sys
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+from urllib.parse import urljoin
+
+from deadlines import DEADLINE_UNKNOWN, parse_deadline_text
+
+# Order of the values in a compact record
+RECORD_FIELDS = ('title', 'institute', 'deadline', 'link', 'description')
+
+# Fields of a stored opportunity, in the order they are exported
+OPPORTUNITY_FIELDS = ('id', 'title', 'institute', 'deadline', 'link', 'description', 'source', 'dateAdded', 'scrapedAt')
+
+
+def opportunity_from_fields(fields: Dict[str, Optional[str]], base_url: str, day_first: bool = False) -> Dict[str, Any]:
+    """Turn raw field text (None for missing elements) into an opportunity"""
+    return {
+        'title': fields.get('title') if fields.get('title') is not None else 'No title',
+        'institute': fields.get('institute') if fields.get('institute') is not None else 'Unknown',
+        'deadline': parse_deadline_text((fields.get('deadline') or '').strip(), day_first) or DEADLINE_UNKNOWN,
+        'link': urljoin(base_url, fields['link']) if fields.get('link') is not None else base_url,
+        'description': fields.get('description') or '',
+    }
+
+
+def to_record(opportunity: Dict[str, Any]) -> Tuple:
+    """Compact tuple of an opportunity's fields, cheap to pickle between processes"""
+    return tuple(opportunity[field] for field in RECORD_FIELDS)
+
+
+def from_record(record: Tuple) -> Dict[str, Any]:
+    """Opportunity dict from a compact record"""
+    return dict(zip(RECORD_FIELDS, record))
+
+
+@lru_cache(maxsize=4096)
+def iso_date(text: str) -> Optional[date]:
+    """The date a string starts with in YYYY-MM-DD form, or None; equal strings share one date object"""
+    if len(text) < 10 or text[4] != '-' or text[7] != '-':
+        return None
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        return None
+
+
+class Opportunity:
+    """A stored opportunity with interned source and institute and its deadline as a date
+
+    A deadline that is not a plain YYYY-MM-DD date (such as DEADLINE_UNKNOWN)
+    is kept as its text. Fields without a slot of their own live in `extra`.
+    """
+
+    __slots__ = OPPORTUNITY_FIELDS + ('extra',)
+
+    def __init__(self, id: Optional[str] = None, title: Optional[str] = None, institute: Optional[str] = None,
+                 deadline: Union[date, str, None] = None, link: Optional[str] = None,
+                 description: Optional[str] = None, source: Optional[str] = None, dateAdded: Optional[str] = None,
+                 scrapedAt: Optional[str] = None, extra: Optional[Dict[str, Any]] = None):
+        self.id = id
+        self.title = title
+        self.institute = sys.intern(institute) if institute else institute
+        if isinstance(deadline, str) and len(deadline) == 10:
+            deadline = iso_date(deadline) or deadline
+        self.deadline = deadline
+        self.link = link
+        self.description = description
+        self.source = sys.intern(source) if source else source
+        self.dateAdded = dateAdded
+        self.scrapedAt = scrapedAt
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Opportunity':
+        """Record of an opportunity dict"""
+        extra = {key: value for key, value in data.items() if key not in OPPORTUNITY_FIELDS}
+        return cls(*(data.get(field) for field in OPPORTUNITY_FIELDS), extra=extra)
+
+    @property
+    def deadline_text(self) -> Optional[str]:
+        """The deadline as it is exported"""
+        return self.deadline.isoformat() if isinstance(self.deadline, date) else self.deadline
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Opportunity dict with the same keys, in the same order, as the store exports"""
+        data = {}
+        for field in OPPORTUNITY_FIELDS:
+            value = self.deadline_text if field == 'deadline' else getattr(self, field)
+            if value is not None:
+                data[field] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __repr__(self) -> str:
+        return f"Opportunity(id={self.id!r}, title={self.title!r}, deadline={self.deadline_text!r})"
+
+
+def as_dict(record: Union[Opportunity, Dict[str, Any]]) -> Dict[str, Any]:
+    """A record or dict as a dict"""
+    return record.to_dict() if isinstance(record, Opportunity) else record
+
+
+def write_json(path: str, records: Iterable[Union[Opportunity, Dict[str, Any]]], indent: int = 2) -> int:
+    """Atomically write records as a JSON array, serialising one at a time; returns how many
+
+    The file is byte-for-byte what json.dump(list(records), indent=indent)
+    writes, without holding the list or the whole document in memory.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    count = 0
+    pad = ' ' * indent
+    encoder = json.JSONEncoder(indent=indent, ensure_ascii=False)
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for record in records:
+            # Newlines inside strings are escaped, so every newline here is layout
+            body = encoder.encode(as_dict(record)).replace('\n', '\n' + pad)
+            f.write(('[\n' if count == 0 else ',\n') + pad + body)
+            count += 1
+        f.write('\n]' if count else '[]')
+    os.replace(tmp_path, path)
+    return count
+
+
+def write_jsonl(path: str, records: Iterable[Union[Opportunity, Dict[str, Any]]]) -> int:
+    """Atomically write records as JSON Lines, one compact object per line; returns how many"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    count = 0
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(encoder.encode(as_dict(record)) + '\n')
+            count += 1
+    os.replace(tmp_path, path)
+    return count
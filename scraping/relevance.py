@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Relevance Matcher
+Weighted keyword scoring over single listings or whole pages
+"""
+
+import hashlib
+import json
+import logging
+import re
+from bisect import bisect_right
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+DEFAULT_KEYWORDS = [
+    'medical physics', 'radiation oncology', 'medical imaging', 'radiotherapy',
+    'nuclear medicine', 'diagnostic imaging', 'radiation therapy', 'medical radiation',
+    'imaging physics', 'radiation safety', 'dosimetry', 'radiobiology',
+    'proton therapy', 'radiation protection', 'medical dosimetry'
+]
+
+# Separates items in a batch; never part of a keyword, so matches cannot span items
+BATCH_SEPARATOR = '\x00'
+
+
+class RelevanceMatcher:
+    def __init__(self, keywords: Dict[str, float], negative_keywords: Optional[Dict[str, float]] = None,
+                 threshold: float = 1.0):
+        self.threshold = threshold
+        self.weights: Dict[str, float] = {}
+        for keyword, weight in keywords.items():
+            self.weights[self.checked(keyword)] = float(weight)
+        for keyword, weight in (negative_keywords or {}).items():
+            self.weights[self.checked(keyword)] = -abs(float(weight))
+
+        # One alternation, longest keyword first, finds every keyword in a single
+        # pass: each search reports the longest keyword at the next position one
+        # starts at, and shorter keywords inside it are credited with it
+        self.pattern = None
+        if self.weights:
+            self.pattern = re.compile('|'.join(sorted(map(re.escape, self.weights), key=len, reverse=True)))
+        self.contained: Dict[str, Tuple[str, ...]] = {
+            keyword: tuple(other for other in self.weights if other in keyword) for keyword in self.weights
+        }
+
+        # When every keyword is positive and any one reaches the threshold,
+        # relevance is simply "contains at least one keyword"
+        self.any_match = bool(self.weights) and all(
+            weight >= threshold and weight > 0 for weight in self.weights.values()
+        )
+
+    @staticmethod
+    def checked(keyword: str) -> str:
+        """Lower-cased keyword; an empty one would match everywhere, so it is a config error"""
+        if not isinstance(keyword, str) or not keyword.strip():
+            raise ValueError(f"Relevance keywords must be non-empty strings, got {keyword!r}")
+        return keyword.lower()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'RelevanceMatcher':
+        """Build a matcher from a config dict; keyword lists get weight 1.0"""
+        def weighted(value) -> Dict[str, float]:
+            if isinstance(value, dict):
+                return value
+            return {keyword: 1.0 for keyword in value or []}
+
+        return cls(
+            weighted(config.get('keywords', DEFAULT_KEYWORDS)),
+            weighted(config.get('negative_keywords', {})),
+            config.get('threshold', 1.0)
+        )
+
+    @classmethod
+    def from_file(cls, path: Optional[str]) -> 'RelevanceMatcher':
+        """Load a matcher from a JSON config, falling back to the built-in keywords"""
+        logger = logging.getLogger(__name__)
+        if path:
+            try:
+                with open(path, 'r') as f:
+                    return cls.from_config(json.load(f))
+            except FileNotFoundError:
+                logger.warning(f"Relevance config {path} not found, using default keywords")
+            except (json.JSONDecodeError, ValueError, TypeError, AttributeError) as e:
+                logger.error(f"Error parsing relevance config: {e}")
+        return cls.from_config({})
+
+    def config_hash(self) -> str:
+        """Hash of the weights and threshold, for caches of already-filtered results"""
+        settings = json.dumps([sorted(self.weights.items()), self.threshold])
+        return hashlib.md5(settings.encode()).hexdigest()[:12]
+
+    def matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """(position, keyword) for the longest keyword starting at each position of lower-cased `text`"""
+        if self.pattern is None:
+            return
+        search = self.pattern.search
+        # Searching again from the next character, not the end of the match, keeps overlapping keywords
+        match = search(text)
+        while match:
+            yield match.start(), match.group()
+            match = search(text, match.start() + 1)
+
+    def found(self, text: str) -> Set[str]:
+        """Distinct keywords occurring in already lower-cased `text`"""
+        keywords: Set[str] = set()
+        for _, keyword in self.matches(text):
+            keywords.update(self.contained[keyword])
+        return keywords
+
+    def score(self, text: str) -> float:
+        """Sum the weights of the distinct keywords found in `text`"""
+        return sum(self.weights[keyword] for keyword in self.found(text.lower()))
+
+    def is_relevant(self, title: str, description: str) -> bool:
+        """Check a single listing against the threshold"""
+        text = f"{title} {description}".lower()
+        if self.any_match:
+            return self.pattern.search(text) is not None
+        return self.score(text) >= self.threshold
+
+    def score_batch(self, items: Sequence[Tuple[str, str]]) -> List[float]:
+        """Score many (title, description) pairs with one pass of the combined pattern over the joined text"""
+        if not items or self.pattern is None:
+            return [0.0] * len(items)
+
+        texts = [f"{title} {description}".lower() for title, description in items]
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + len(BATCH_SEPARATOR)
+        joined = BATCH_SEPARATOR.join(texts)
+
+        found: List[Set[str]] = [set() for _ in texts]
+        for position, keyword in self.matches(joined):
+            found[bisect_right(starts, position) - 1].update(self.contained[keyword])
+        return [sum(self.weights[keyword] for keyword in keywords) for keywords in found]
+
+    def classify_batch(self, items: Sequence[Tuple[str, str]]) -> List[bool]:
+        """Check many (title, description) pairs against the threshold in one call"""
+        return [score >= self.threshold for score in self.score_batch(items)]
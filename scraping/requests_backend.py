@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Requests Backend
+Fetches pages over HTTP and extracts listings with BeautifulSoup, following
+pagination and honouring robots.txt and the conditional-request cache
+"""
+
+import json
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from backends import FetchBackend, SourceFailed
+from http_cache import ResponseCache
+from http_client import CircuitBreakers, CircuitOpenError, HttpClient
+from html_parsing import CompiledSelectors, resolve_parser
+from pagination import (DEFAULT_MAX_PAGES, DEFAULT_PAGE_CONCURRENCY, find_next_link, page_url,
+                        pagination_mode)
+from parse_worker import extract_in_worker, extract_listings
+from rate_limiter import HostRateLimiter
+from records import from_record
+from snapshots import ContainerSnapshots
+
+
+class RequestsBackend(FetchBackend):
+    def __init__(self, scraper, connect_timeout: float = 5.0, read_timeout: float = 20.0, max_retries: int = 3,
+                 pool_size: Optional[int] = None, breaker_threshold: int = 3, breaker_cooldown: float = 900,
+                 parse_workers: int = 0):
+        super().__init__(scraper)
+        self.http_cache = scraper.http_cache
+        self.robots_cache = scraper.robots_cache
+        self.parser = resolve_parser(scraper.parser)
+        self.prefilter = scraper.prefilter
+        
+        # Parsing moves to worker processes when parse_workers > 0; the pool starts on first use
+        self.parse_workers = parse_workers
+        self.parse_pool: Optional[ProcessPoolExecutor] = None
+        self.compiled_selectors: Dict[str, CompiledSelectors] = {}
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+        self.session = requests.Session()
+        
+        # Retries, split timeouts and per-host pools and circuit breakers for every request
+        self.breakers = CircuitBreakers(scraper.cache_path('circuit_breakers.json'),
+                                        failure_threshold=breaker_threshold, cooldown_seconds=breaker_cooldown)
+        self.http = HttpClient(self.session, self.rate_limiter, self.breakers, self.metrics,
+                               connect_timeout=connect_timeout, read_timeout=read_timeout,
+                               max_retries=max_retries,
+                               pool_size=pool_size or max(scraper.max_workers, DEFAULT_PAGE_CONCURRENCY))
+        
+        # Setup session headers
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+        })
+
+    def scrape(self, source: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Scrape using requests and BeautifulSoup"""
+        opportunities = []
+        
+        try:
+            # Check robots.txt
+            if not self.check_robots_txt(source['url']):
+                self.logger.warning(f"Robots.txt disallows scraping for {source['url']}")
+                return opportunities
+            
+            selectors = source.get('selectors', {})
+            source_key = source.get('id', source['name'])
+            day_first = source.get('day_first', False)
+            config = ContainerSnapshots.config_hash(selectors, day_first)
+            # Cached results are already date-parsed and relevance-filtered, so they depend on those settings too
+            extraction = {'selectors': selectors, 'day_first': day_first,
+                          'relevance': self.scraper.relevance.config_hash()}
+            
+            # Only revalidate if there is a previous extraction to fall back on
+            headers = {}
+            if self.http_cache and self.http_cache.lookup(source['url'], extraction) is not None:
+                headers = self.http_cache.conditional_headers(source['url'])
+            
+            response = self.download(source['url'], headers)
+            
+            if response.status_code == 304 and headers:
+                self.logger.info(f"Not modified, reusing previous results for {source['name']}")
+                self.metrics.count('pages_not_modified')
+                self.http_cache.touch(source['url'], response)
+                self.record_changes(source, self.snapshots.carry_over(source_key, config))
+                return self.http_cache.lookup(source['url'], extraction)
+            
+            response.raise_for_status()
+            
+            content_hash = ResponseCache.hash_content(response.content)
+            if self.http_cache:
+                cached = self.http_cache.lookup(source['url'], extraction, content_hash)
+                if cached is not None:
+                    self.logger.info(f"Content unchanged, reusing previous results for {source['name']}")
+                    self.metrics.count('pages_not_modified')
+                    self.http_cache.touch(source['url'], response)
+                    self.record_changes(source, self.snapshots.carry_over(source_key, config))
+                    return cached
+            
+            compiled = self.compile_selectors(selectors)
+            parser = resolve_parser(source.get('parser', self.parser))
+            # Containers the previous run extracted are matched by fingerprint instead of extracted again
+            previous = self.snapshots.containers(source_key, config)
+            opportunities = self.extract_page(response.content, compiled, source['url'], parser, day_first, previous)
+            
+            complete = True
+            if pagination_mode(source.get('pagination')):
+                following, complete = self.crawl_following_pages(source, response.content, opportunities, compiled,
+                                                                 parser, previous)
+                opportunities += following
+            self.record_changes(source, self.snapshots.update(source_key, config, opportunities, complete))
+            
+            # Filter the whole page for medical physics relevance at once
+            opportunities = self.scraper.filter_relevant(opportunities)
+            
+            if self.http_cache:
+                self.http_cache.store(source['url'], response, extraction, content_hash, opportunities)
+                    
+        except CircuitOpenError as e:
+            raise SourceFailed(str(e), 'circuit_open') from e
+        except requests.RequestException as e:
+            raise SourceFailed(f"Request error: {e}", 'request') from e
+        except Exception as e:
+            raise SourceFailed(f"Parsing error: {e}", 'parse') from e
+            
+        return opportunities
+
+    def extract_page(self, content: bytes, compiled: CompiledSelectors, base_url: str, parser: str,
+                     day_first: bool = False, previous: Optional[Dict[str, Dict]] = None) -> List[Dict[str, Any]]:
+        """Extract every listing on a downloaded page, before relevance filtering"""
+        return self.collect_page(self.submit_page(content, compiled, base_url, parser, day_first, previous), previous)
+
+    def submit_page(self, content: bytes, compiled: CompiledSelectors, base_url: str, parser: str,
+                    day_first: bool = False, previous: Optional[Dict[str, Dict]] = None) -> Future:
+        """Start extracting a page: in a parse worker if there are any, otherwise right here"""
+        known = frozenset(previous or ())
+        if self.parse_workers <= 0:
+            future = Future()
+            future.set_result(extract_listings(content, compiled, base_url, parser, self.prefilter, day_first, known))
+            return future
+        
+        with self.lock:
+            if self.parse_pool is None:
+                # Spawned, not forked: forking while scraper threads run can copy locks they hold
+                self.parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers,
+                                                      mp_context=multiprocessing.get_context('spawn'))
+                self.logger.info(f"Started {self.parse_workers} parse worker process(es)")
+        return self.parse_pool.submit(extract_in_worker, content, compiled.selectors, base_url, parser,
+                                      self.prefilter, day_first, known)
+
+    def collect_page(self, extraction: Future, previous: Optional[Dict[str, Dict]] = None) -> List[Dict[str, Any]]:
+        """Wait for a page's extraction, record its timings and counts and fill in unchanged containers"""
+        if self.parse_workers > 0:
+            with self.metrics.stage('parse_wait'):
+                records, containers, parse_seconds, extract_seconds = extraction.result()
+        else:
+            records, containers, parse_seconds, extract_seconds = extraction.result()
+        self.metrics.record('parse', parse_seconds)
+        self.metrics.record('extract', extract_seconds)
+        self.metrics.count('containers', containers)
+        self.metrics.count('extracted', sum(1 for _, record in records if record is not None))
+        return [{**from_record(record if record is not None else previous[key]['opportunity']), 'fingerprint': key}
+                for key, record in records]
+
+    def record_changes(self, source: Dict[str, Any], changes: Dict[str, int]) -> None:
+        """Count and log how a source's containers differ from the previous run"""
+        for kind, count in changes.items():
+            self.metrics.count(f"containers_{kind}", count)
+        summary = ', '.join(f"{count} {kind}" for kind, count in changes.items())
+        self.logger.info(f"Containers of {source['name']}: {summary}")
+
+    def download(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """GET a page through the retrying, per-host paced client"""
+        self.metrics.resolve(url)
+        response = self.http.get(url, headers)
+        self.metrics.count('pages_fetched')
+        self.metrics.count('bytes_downloaded', len(response.content))
+        return response
+
+    def fetch_page(self, url: str) -> Optional[bytes]:
+        """Download one further page of a paginated source, or None if it cannot be fetched
+
+        An open circuit breaker is not swallowed: it fails the whole source, so the skip is reported.
+        """
+        if not self.check_robots_txt(url):
+            self.logger.warning(f"Robots.txt disallows scraping for {url}")
+            return None
+        try:
+            response = self.download(url)
+            if response.status_code == 404:
+                self.logger.info(f"No page at {url}, assuming the listing ends there")
+                return None
+            response.raise_for_status()
+            return response.content
+        except CircuitOpenError:
+            raise
+        except requests.RequestException as e:
+            self.logger.error(f"Request error for {url}: {e}")
+            return None
+
+    def crawl_following_pages(self, source: Dict[str, Any], first_content: bytes, first_page: List[Dict[str, Any]],
+                              compiled: CompiledSelectors, parser: str,
+                              previous: Optional[Dict[str, Dict]] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """Fetch the pages after the first, stopping at one the previous run had fully seen
+
+        Returns the listings of the following pages and whether the crawl got
+        to the end of the listing rather than stopping at a known page.
+        """
+        pagination = source['pagination']
+        source_key = source.get('id', source['name'])
+        known = self.seen_listings.known(source_key)
+        
+        pages = [first_page]
+        if not self.scraper.page_is_known(first_page, known):
+            if pagination_mode(pagination) == 'template':
+                pages += self.crawl_numbered_pages(source, compiled, parser, known, previous)
+            elif pagination_mode(pagination) == 'next':
+                pages += self.crawl_linked_pages(source, first_content, compiled, parser, known, previous)
+        
+        self.seen_listings.record(source_key, (self.scraper.generate_opportunity_id(opp)
+                                               for page in pages for opp in page))
+        self.logger.info(f"Crawled {len(pages)} page(s) of {source['name']}")
+        return [opp for page in pages[1:] for opp in page], not self.scraper.page_is_known(pages[-1], known)
+
+    def crawl_numbered_pages(self, source: Dict[str, Any], compiled: CompiledSelectors, parser: str,
+                             known: set, previous: Optional[Dict[str, Dict]] = None) -> List[List[Dict[str, Any]]]:
+        """Fetch page-number URLs in concurrent waves, examining each wave in page order"""
+        pagination = source['pagination']
+        day_first = source.get('day_first', False)
+        start = pagination.get('start', 1)
+        last = start + pagination.get('max_pages', DEFAULT_MAX_PAGES) - 1
+        concurrency = max(1, pagination.get('concurrency', DEFAULT_PAGE_CONCURRENCY))
+        
+        pages = []
+        number = start + 1
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='pages') as executor:
+            while number <= last:
+                urls = [page_url(pagination, n) for n in range(number, min(number + concurrency, last + 1))]
+                fetched = executor.map(self.metrics.bind(self.fetch_page), urls)
+                # Each page is queued for extraction as it arrives, so parse workers overlap the other fetches
+                extractions = [self.submit_page(content, compiled, url, parser, day_first, previous)
+                               if content else None for url, content in zip(urls, fetched)]
+                for extraction in extractions:
+                    page = self.collect_page(extraction, previous) if extraction else []
+                    if not page:
+                        return pages
+                    pages.append(page)
+                    if self.scraper.page_is_known(page, known):
+                        return pages
+                number += len(urls)
+        return pages
+
+    def crawl_linked_pages(self, source: Dict[str, Any], first_content: bytes, compiled: CompiledSelectors,
+                           parser: str, known: set,
+                           previous: Optional[Dict[str, Dict]] = None) -> List[List[Dict[str, Any]]]:
+        """Follow next-page links; each URL is only known once the page before it is parsed"""
+        pagination = source['pagination']
+        day_first = source.get('day_first', False)
+        
+        pages = []
+        url, content = source['url'], first_content
+        visited = {url}
+        for _ in range(pagination.get('max_pages', DEFAULT_MAX_PAGES) - 1):
+            url = find_next_link(content, pagination['next_selector'], url, parser)
+            if not url or url in visited:
+                break
+            visited.add(url)
+            content = self.fetch_page(url)
+            page = self.extract_page(content, compiled, url, parser, day_first, previous) if content else []
+            if not page:
+                break
+            pages.append(page)
+            if self.scraper.page_is_known(page, known):
+                break
+        return pages
+
+    def compile_selectors(self, selectors: Dict[str, str]) -> CompiledSelectors:
+        """Get compiled selectors for a source config, compiling them only once"""
+        key = json.dumps(selectors, sort_keys=True)
+        with self.lock:
+            compiled = self.compiled_selectors.get(key)
+            if compiled is None:
+                compiled = CompiledSelectors(selectors)
+                self.compiled_selectors[key] = compiled
+            return compiled
+
+    def extract_opportunity_data(self, container, selectors: Dict[str, str], base_url: str,
+                                 day_first: bool = False) -> Optional[Dict[str, Any]]:
+        """Extract opportunity data from HTML container"""
+        return self.extract_with_compiled(container, self.compile_selectors(selectors), base_url, day_first=day_first)
+
+    def extract_with_compiled(self, container, compiled: CompiledSelectors, base_url: str,
+                              check_relevance: bool = True, day_first: bool = False) -> Optional[Dict[str, Any]]:
+        """Extract opportunity data from HTML container using precompiled selectors"""
+        try:
+            fields = compiled.extract_fields(container)
+            return self.scraper.build_opportunity(fields, base_url, check_relevance, day_first)
+                
+        except Exception as e:
+            self.logger.error(f"Error extracting opportunity data: {e}")
+            
+        return None
+
+    def check_robots_txt(self, url: str) -> bool:
+        """Check if robots.txt allows scraping, applying any Crawl-delay to pacing"""
+        user_agent = self.session.headers.get('User-Agent', '*')
+        with self.metrics.stage('robots'):
+            try:
+                if not self.robots_cache.can_fetch(url, user_agent, self.fetch_robots_txt):
+                    return False
+                delay = self.robots_cache.crawl_delay(url, user_agent, self.fetch_robots_txt)
+                if delay:
+                    self.rate_limiter.set_delay(HostRateLimiter.host_for(url), delay)
+                return True
+            except Exception as e:
+                self.logger.warning(f"Robots.txt check failed for {url}: {e}")
+                return True  # If can't check, assume allowed
+
+    def fetch_robots_txt(self, robots_url: str) -> tuple:
+        """Download a robots.txt file, returning (status, body)"""
+        response = self.http.get(robots_url, timeout=(self.http.timeout[0], 10), max_retries=0)
+        return response.status_code, response.text if response.status_code == 200 else ''
+
+    def save(self) -> None:
+        """Persist circuit breaker state"""
+        self.breakers.save()
+
+    def start_cycle(self) -> None:
+        """Count retries and breaker skips for the new cycle only"""
+        self.http.start_cycle()
+        self.breakers.start_cycle()
+
+    def close(self) -> None:
+        """Close pooled connections and stop any parse workers"""
+        self.session.close()
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown(cancel_futures=True)
+            self.parse_pool = None
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+robots.txt Cache
+Per-host robots.txt policies with a TTL, persisted between scraping runs
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+# fetch(robots_url) -> (status_code, body)
+RobotsFetcher = Callable[[str], Tuple[int, str]]
+
+
+class RobotsCache:
+    def __init__(self, cache_path: Optional[str] = "data/cache/robots.json", ttl_hours: float = 24):
+        self.cache_path = cache_path
+        self.ttl = ttl_hours * 3600
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.parsers: Dict[str, RobotFileParser] = {}
+        self.lock = threading.Lock()
+        self.host_locks: Dict[str, threading.Lock] = {}
+        self.unreachable = set()
+        self.dirty = False
+        self.fetch_count = 0
+        self.logger = logging.getLogger(__name__)
+        self.load()
+
+    def load(self) -> None:
+        """Load persisted robots.txt entries"""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r') as f:
+                self.entries = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            self.logger.warning(f"Could not read robots cache, starting empty: {e}")
+            self.entries = {}
+
+    def save(self) -> None:
+        """Persist robots.txt entries if anything changed"""
+        with self.lock:
+            if not self.cache_path or not self.dirty:
+                return
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+            self.dirty = False
+
+    @staticmethod
+    def origin(url: str) -> str:
+        """Get scheme://host for a URL, which is the scope of a robots.txt file"""
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+    @staticmethod
+    def build_parser(status: int, body: str) -> RobotFileParser:
+        """Build a parser following RFC 9309 status handling"""
+        parser = RobotFileParser()
+        if status == 200:
+            parser.parse(body.splitlines())
+        else:
+            # 4xx means no restrictions; unreachable or 5xx is treated the
+            # same way, as the scraper always has, but is never persisted
+            parser.allow_all = True
+        return parser
+
+    def host_lock(self, origin: str) -> threading.Lock:
+        """Get the lock that serialises robots.txt fetches for one origin"""
+        with self.lock:
+            return self.host_locks.setdefault(origin, threading.Lock())
+
+    def policy(self, url: str, fetch: RobotsFetcher) -> RobotFileParser:
+        """Get the robots.txt policy for a URL, fetching at most once per TTL"""
+        origin = self.origin(url)
+        with self.host_lock(origin):
+            parser = self.parsers.get(origin)
+            entry = self.entries.get(origin)
+            fresh = entry is not None and time.time() - entry.get('fetched_at', 0) < self.ttl
+            # An unreachable robots.txt is trusted as allow-all until the next cycle, then fetched again
+            if parser is not None and (fresh or origin in self.unreachable):
+                return parser
+            if fresh:
+                parser = self.build_parser(entry['status'], entry.get('body', ''))
+                self.parsers[origin] = parser
+                return parser
+
+            robots_url = f"{origin}/robots.txt"
+            with self.lock:
+                self.fetch_count += 1
+            try:
+                status, body = fetch(robots_url)
+            except Exception as e:
+                self.logger.warning(f"Could not fetch {robots_url}, assuming allowed: {e}")
+                status, body = 0, ''
+
+            parser = self.build_parser(status, body)
+            self.parsers[origin] = parser
+            if status == 0 or status >= 500:
+                # Retry on the next run or daemon cycle rather than trusting a transient failure
+                self.unreachable.add(origin)
+            else:
+                with self.lock:
+                    self.entries[origin] = {
+                        'status': status,
+                        'body': body if status == 200 else '',
+                        'fetched_at': time.time()
+                    }
+                    self.dirty = True
+            return parser
+
+    def start_cycle(self) -> None:
+        """Forget robots.txt files that were unreachable, so a long-running process fetches them again"""
+        with self.lock:
+            for origin in self.unreachable:
+                self.parsers.pop(origin, None)
+            self.unreachable.clear()
+            self.fetch_count = 0
+
+    def can_fetch(self, url: str, user_agent: str, fetch: RobotsFetcher) -> bool:
+        """Check whether `user_agent` may fetch `url`"""
+        return self.policy(url, fetch).can_fetch(user_agent, url)
+
+    def crawl_delay(self, url: str, user_agent: str, fetch: RobotsFetcher) -> Optional[float]:
+        """Get the Crawl-delay for `user_agent` on the host of `url`, if any"""
+        delay = self.policy(url, fetch).crawl_delay(user_agent)
+        return float(delay) if delay is not None else None
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Adaptive Source Scheduler
+Orders sources by how likely they are to have new listings and spends a
+time budget on the most promising ones
+"""
+
+import hashlib
+import heapq
+import json
+import logging
+import math
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from backends import backend_for
+
+# Prior belief before a source has history: about one change a day
+PRIOR_CHANGES = 1.0
+PRIOR_HOURS = 24.0
+
+# Older observations fade so the estimate follows a source that speeds up or slows down
+HISTORY_DECAY = 0.9
+
+# Expected scrape time per fetch backend before any has been measured; other backends cost as much as requests
+DEFAULT_COST_SECONDS = {'requests': 5.0, 'selenium': 30.0}
+
+# Failed sources are retried after 1h, 2h, 4h ... up to a week
+FAILURE_BACKOFF_HOURS = 1.0
+MAX_BACKOFF_HOURS = 24.0 * 7
+
+
+def source_key(source: Dict[str, Any]) -> str:
+    """Stable key for a source's history"""
+    return source.get('id') or source['name']
+
+
+def fingerprint(ids: List[str]) -> str:
+    """Hash of the set of listing ids a scrape produced"""
+    return hashlib.sha1('\n'.join(sorted(set(ids))).encode()).hexdigest()[:16]
+
+
+class SourceSchedule:
+    def __init__(self, history_path: Optional[str] = "data/cache/schedule.json", min_priority: float = 0.1):
+        self.history_path = history_path
+        self.min_priority = min_priority
+        self.history: Dict[str, Dict[str, Any]] = {}
+        self.logger = logging.getLogger(__name__)
+        self.load()
+
+    def load(self) -> None:
+        """Load per-source change history"""
+        if not self.history_path or not os.path.exists(self.history_path):
+            return
+        try:
+            with open(self.history_path, 'r') as f:
+                self.history = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            self.logger.warning(f"Could not read schedule history, starting fresh: {e}")
+            self.history = {}
+
+    def save(self) -> None:
+        """Atomically write the change history"""
+        if not self.history_path:
+            return
+        os.makedirs(os.path.dirname(self.history_path) or '.', exist_ok=True)
+        tmp_path = f"{self.history_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.history, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.history_path)
+
+    def entry(self, source: Dict[str, Any]) -> Dict[str, Any]:
+        """History for a source, seeded from the metadata in sources.json"""
+        key = source_key(source)
+        if key not in self.history:
+            last_scraped = None
+            if source.get('last_scraped'):
+                try:
+                    last_scraped = datetime.fromisoformat(source['last_scraped']).timestamp()
+                except ValueError:
+                    pass
+            self.history[key] = {
+                'last_scraped': last_scraped,
+                'changes': 0.0,
+                'observed_hours': 0.0,
+                'runs': source.get('success_count', 0) + source.get('error_count', 0),
+                'failures': source.get('error_count', 0),
+                'consecutive_failures': 0,
+                'cost_seconds': None,
+                'fingerprint': None,
+            }
+        return self.history[key]
+
+    def change_rate(self, entry: Dict[str, Any]) -> float:
+        """Estimated changes per hour"""
+        return (entry['changes'] + PRIOR_CHANGES) / (entry['observed_hours'] + PRIOR_HOURS)
+
+    def cost(self, source: Dict[str, Any]) -> float:
+        """Expected seconds to scrape a source"""
+        measured = self.entry(source)['cost_seconds']
+        if measured:
+            return measured
+        return DEFAULT_COST_SECONDS.get(backend_for(source), DEFAULT_COST_SECONDS['requests'])
+
+    def priority(self, source: Dict[str, Any], now: float) -> Tuple[float, str]:
+        """Probability-like score that a scrape now finds something new, and why"""
+        entry = self.entry(source)
+        if entry['last_scraped'] is None:
+            return 1.0, 'never scraped'
+
+        hours = max(0.0, (now - entry['last_scraped']) / 3600)
+        if entry['consecutive_failures']:
+            backoff = min(MAX_BACKOFF_HOURS, FAILURE_BACKOFF_HOURS * 2 ** (entry['consecutive_failures'] - 1))
+            if hours < backoff:
+                return 0.0, f"backing off after {entry['consecutive_failures']} failure(s), {backoff - hours:.1f}h left"
+
+        # Poisson change model: chance at least one change happened since the last scrape
+        rate = self.change_rate(entry)
+        chance = 1 - math.exp(-rate * hours)
+        # Sources that often fail are worth a little less of the budget
+        failure_ratio = entry['failures'] / entry['runs'] if entry['runs'] else 0.0
+        score = chance * (1 - 0.5 * failure_ratio)
+        return score, f"{rate * 24:.2f} changes/day, {hours:.1f}h since last scrape"
+
+    def plan(self, sources: List[Dict[str, Any]], budget_seconds: Optional[float],
+             parallelism: int = 1) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Pick sources in priority order until the budget is spent; returns (selected, skipped)"""
+        now = time.time()
+        queue = []
+        for index, source in enumerate(s for s in sources if s.get('active', True)):
+            score, reason = self.priority(source, now)
+            heapq.heappush(queue, (-score, index, source, reason))
+
+        capacity = budget_seconds * max(1, parallelism) if budget_seconds else None
+        committed = 0.0
+        selected, skipped = [], []
+        while queue:
+            negative_score, _, source, reason = heapq.heappop(queue)
+            score = -negative_score
+            cost = self.cost(source)
+            record = {'source': source['name'], 'priority': round(score, 3), 'reason': reason,
+                      'estimatedSeconds': round(cost, 1)}
+            if score < self.min_priority:
+                skipped.append({**record, 'skipped': 'unlikely to have changed'})
+            elif capacity is not None and committed + cost > capacity:
+                skipped.append({**record, 'skipped': 'over time budget'})
+            else:
+                committed += cost
+                selected.append(source)
+                self.logger.info(f"Scheduled {source['name']} (priority {score:.2f}: {reason})")
+        return selected, skipped
+
+    def record(self, source: Dict[str, Any], ids: List[str], succeeded: bool, duration: Optional[float]) -> None:
+        """Fold the outcome of a scrape into the source's history"""
+        entry = self.entry(source)
+        now = time.time()
+        entry['runs'] += 1
+        if duration:
+            previous = entry['cost_seconds']
+            entry['cost_seconds'] = round(duration if previous is None else 0.7 * previous + 0.3 * duration, 3)
+
+        if not succeeded:
+            entry['failures'] += 1
+            entry['consecutive_failures'] += 1
+            entry['last_scraped'] = now
+            return
+
+        entry['consecutive_failures'] = 0
+        current = fingerprint(ids)
+        if entry['last_scraped'] is not None and entry['fingerprint'] is not None:
+            hours = max(0.0, (now - entry['last_scraped']) / 3600)
+            entry['observed_hours'] = entry['observed_hours'] * HISTORY_DECAY + hours
+            entry['changes'] = entry['changes'] * HISTORY_DECAY + (1.0 if current != entry['fingerprint'] else 0.0)
+        entry['fingerprint'] = current
+        entry['last_scraped'] = now
+
+
+def run_scheduled(scraper, schedule: SourceSchedule, output_path: str, budget_seconds: Optional[float]) -> Dict[str, Any]:
+    """Scrape the highest-priority sources within the budget, save, and update the history"""
+    parallelism = 1 if scraper.max_workers == 1 and scraper.browser_pool.size == 1 else \
+        scraper.max_workers + scraper.browser_pool.size
+    selected, skipped = schedule.plan(scraper.sources, budget_seconds, parallelism)
+
+    scraper.results, scraper.errors, scraper.skipped = [], [], []
+    deadline = time.monotonic() + budget_seconds if budget_seconds else None
+    summary = scraper.scrape_all_sources(selected, deadline)
+    scraper.save_results(output_path)
+
+    failed = {error['source'] for error in scraper.errors}
+    not_started = {entry['source'] for entry in scraper.skipped}
+    for source in selected:
+        if source['name'] in not_started:
+            continue
+        ids = [opp['id'] for opp in scraper.results if opp['source'] == source['name']]
+        schedule.record(source, ids, source['name'] not in failed, source.get('last_duration'))
+    schedule.save()
+
+    summary['skipped'] = skipped + summary['skipped']
+    return summary
@@ -6,29 +6,50 @@ Main scraping script for automated data collection
 
 import json
 import os
+import signal
 import sys
 import time
 import logging
-import requests
-from datetime import datetime, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from typing import List, Dict, Any, Optional
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from rate_limiter import HostRateLimiter
+from http_cache import ResponseCache
+from robots import RobotsCache
+from browser_pool import BrowserPool
+from backends import FetchBackend, backend_for, backend_spec, load_backend
+from relevance import RelevanceMatcher
+from deadlines import DEADLINE_UNKNOWN, parse_deadline_text
+from records import opportunity_from_fields
+from storage import OpportunityStore
+from archive import OpportunityArchive
+from site_artifacts import SiteArtifacts
+from metrics import Metrics, profiled
+from scheduler import SourceSchedule, run_scheduled
+from pagination import DEFAULT_MAX_PAGES, SeenListings, page_url, pagination_mode
+from snapshots import ContainerSnapshots
+from enrichment import DETAIL_FIELDS, DetailEnricher, detail_selectors
 
 class PhDScraper:
-    def __init__(self, config_path: str = "data/sources.json"):
+    def __init__(self, config_path: str = "data/sources.json", max_workers: int = 1,
+                 requests_per_second: float = 0.5, burst: float = 1.0,
+                 cache_dir: Optional[str] = "data/cache", robots_ttl_hours: float = 24,
+                 browser_workers: int = 1, browser_max_pages: int = 50,
+                 headless: bool = True, block_resources: bool = False,
+                 parser: str = 'html.parser', prefilter: bool = True,
+                 relevance_config: Optional[str] = "data/relevance.json",
+                 store_path: Optional[str] = None, archive_dir: str = "data/archive",
+                 near_duplicate_threshold: Optional[float] = 0.7, metrics_dir: Optional[str] = None,
+                 connect_timeout: float = 5.0, read_timeout: float = 20.0, max_retries: int = 3,
+                 pool_size: Optional[int] = None, breaker_threshold: int = 3, breaker_cooldown: float = 900,
+                 site_dir: Optional[str] = "data/site", shard_by: str = 'month', parse_workers: int = 0,
+                 detail_workers: int = 4, detail_per_host: int = 2, detail_ttl_hours: float = 24):
         self.config_path = config_path
         self.sources = []
         self.results = []
         self.errors = []
-        self.session = requests.Session()
-        self.driver = None
+        self.skipped = []
         
         # Setup logging
         logging.basicConfig(
@@ -41,15 +62,75 @@ class PhDScraper:
         )
         self.logger = logging.getLogger(__name__)
         
-        # Setup session headers
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
+        # Per-source, per-stage timings and counters; a no-op unless a metrics directory is given
+        self.metrics_dir = metrics_dir
+        self.metrics = Metrics(enabled=metrics_dir is not None)
+        
+        # Concurrency: one worker keeps the original serial behaviour
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = HostRateLimiter(requests_per_second, burst)
+        self.lock = threading.Lock()
+        
+        # HTML parsing: tree builder and container pre-filter for the requests backend
+        self.parser = parser
+        self.prefilter = prefilter
+        
+        # Keyword relevance scoring, compiled once
+        self.relevance = RelevanceMatcher.from_file(relevance_config)
+        
+        # Selenium drivers are only started when a JS source is scraped
+        self.browser_pool = BrowserPool(self.create_selenium_driver, size=browser_workers,
+                                        max_pages=browser_max_pages)
+        
+        # Incremental opportunity store; defaults to a .db next to the output file
+        self.store_path = store_path
+        self.archive_dir = archive_dir
+        
+        # Sharded, compressed data and search index for the static site; None disables
+        self.site_artifacts = SiteArtifacts(site_dir, shard_by) if site_dir else None
+        self.near_duplicate_threshold = near_duplicate_threshold
+        
+        # Conditional-request cache; None disables it
+        self.cache_dir = cache_dir
+        self.http_cache = ResponseCache(self.cache_path('http_cache.json')) if cache_dir else None
+        self.robots_cache = RobotsCache(self.cache_path('robots.json'), ttl_hours=robots_ttl_hours)
+        
+        # Listing ids per source from the previous run, used to stop paginating early
+        self.seen_listings = SeenListings(self.cache_path('seen_listings.json'))
+        
+        # Containers extracted by the previous run per source, reused while their HTML is unchanged
+        self.snapshots = ContainerSnapshots(self.cache_path('container_snapshots.json'))
+        
+        # Detail pages of sources with detail selectors; detail_workers=0 turns enrichment off
+        self.enricher = DetailEnricher(self, workers=detail_workers, per_host=detail_per_host,
+                                       ttl_hours=detail_ttl_hours)
+        
+        # Fetch backends are imported and started the first time a source needs one
+        self.backends: Dict[str, FetchBackend] = {}
+        self.backend_lock = threading.Lock()
+        self.backend_options = {
+            'requests': {
+                'connect_timeout': connect_timeout, 'read_timeout': read_timeout, 'max_retries': max_retries,
+                'pool_size': pool_size, 'breaker_threshold': breaker_threshold,
+                'breaker_cooldown': breaker_cooldown, 'parse_workers': parse_workers,
+            },
+            'selenium': {'headless': headless, 'block_resources': block_resources},
+        }
+
+    def cache_path(self, name: str) -> Optional[str]:
+        """Path of a state file in the cache directory, or None when caching is disabled"""
+        return os.path.join(self.cache_dir, name) if self.cache_dir else None
+
+    def backend(self, name: str) -> FetchBackend:
+        """The fetch backend called `name`, imported and created on first use"""
+        with self.backend_lock:
+            backend = self.backends.get(name)
+            if backend is None:
+                with self.metrics.stage('backend_load'):
+                    backend = load_backend(name)(self, **self.backend_options.get(name, {}))
+                self.backends[name] = backend
+                self.logger.info(f"Loaded {name} fetch backend")
+            return backend
 
     def load_sources(self) -> None:
         """Load scraping sources from configuration file"""
@@ -101,277 +182,141 @@ class PhDScraper:
             }
         ]
 
-    def setup_selenium_driver(self, headless: bool = True) -> None:
-        """Setup Selenium WebDriver for JavaScript-heavy sites"""
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-        
-        try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.implicitly_wait(10)
-            self.logger.info("Selenium WebDriver initialized")
-        except Exception as e:
-            self.logger.error(f"Failed to initialize WebDriver: {e}")
-            self.driver = None
+    def create_selenium_driver(self):
+        """Create a Selenium WebDriver for JavaScript-heavy sites"""
+        return self.backend('selenium').create_driver()
 
-    def scrape_all_sources(self) -> Dict[str, Any]:
-        """Scrape all active sources"""
+    def scrape_all_sources(self, sources: Optional[List[Dict[str, Any]]] = None,
+                           deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Scrape all active sources, or the given ones in order; none are started after `deadline`"""
         self.logger.info("Starting scraping process")
         
-        active_sources = [s for s in self.sources if s.get('active', True)]
-        self.logger.info(f"Scraping {len(active_sources)} active sources")
+        active_sources = [s for s in (self.sources if sources is None else sources) if s.get('active', True)]
+        self.logger.info(f"Scraping {len(active_sources)} active sources with {self.max_workers} worker(s)")
         
-        for source in active_sources:
-            try:
-                self.logger.info(f"Scraping: {source['name']}")
-                opportunities = self.scrape_source(source)
+        if self.max_workers == 1 and self.browser_pool.size == 1:
+            for source in active_sources:
+                self.scrape_and_record(source, deadline)
+        else:
+            # JS sources get their own workers, one per pooled browser
+            js_sources = [s for s in active_sources if self.requires_js(s)]
+            http_sources = [s for s in active_sources if not self.requires_js(s)]
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='scraper') as http_executor, \
+                    ThreadPoolExecutor(max_workers=self.browser_pool.size, thread_name_prefix='browser') as js_executor:
+                futures = [http_executor.submit(self.scrape_and_record, source, deadline) for source in http_sources]
+                futures += [js_executor.submit(self.scrape_and_record, source, deadline) for source in js_sources]
+                for future in as_completed(futures):
+                    future.result()
+
+        if self.http_cache:
+            self.http_cache.save()
+        self.robots_cache.save()
+        self.seen_listings.save()
+        self.snapshots.save()
+        self.enricher.save()
+        for backend in list(self.backends.values()):
+            backend.save()
+        self.logger.info(f"Fetched robots.txt {self.robots_cache.fetch_count} time(s)")
+
+        return self.generate_summary()
+
+    def scrape_and_record(self, source: Dict[str, Any], deadline: Optional[float] = None) -> None:
+        """Scrape one source and record its results, errors and metadata"""
+        if deadline is not None and time.monotonic() >= deadline:
+            with self.lock:
+                self.skipped.append({'source': source['name'], 'skipped': 'time budget ran out before it started'})
+            return
+        
+        started = time.monotonic()
+        with self.metrics.source(source['name']), self.metrics.stage('total'):
+            self.record_source(source)
+        source['last_duration'] = round(time.monotonic() - started, 3)
+
+    def record_source(self, source: Dict[str, Any]) -> None:
+        """Scrape one source, updating results and metadata or recording the error"""
+        try:
+            self.logger.info(f"Scraping: {source['name']}")
+            opportunities = self.scrape_source(source)
+            
+            with self.lock:
                 self.results.extend(opportunities)
                 
                 # Update source metadata
                 source['last_scraped'] = datetime.now().isoformat()
                 source['success_count'] = source.get('success_count', 0) + 1
-                
-                self.logger.info(f"Found {len(opportunities)} opportunities from {source['name']}")
-                
-                # Be respectful - add delay between requests
-                time.sleep(2)
-                
-            except Exception as e:
-                self.logger.error(f"Error scraping {source['name']}: {e}")
+            
+            self.logger.info(f"Found {len(opportunities)} opportunities from {source['name']}")
+            
+        except Exception as e:
+            self.logger.error(f"Error scraping {source['name']}: {e}")
+            self.metrics.count('errors')
+            with self.lock:
                 self.errors.append({
                     'source': source['name'],
                     'error': str(e),
+                    'reason': getattr(e, 'reason', 'error'),
                     'timestamp': datetime.now().isoformat()
                 })
                 source['error_count'] = source.get('error_count', 0) + 1
 
-        return self.generate_summary()
+    @staticmethod
+    def requires_js(source: Dict[str, Any]) -> bool:
+        """Check whether a source must be rendered in a browser"""
+        return backend_for(source) == 'selenium'
 
     def scrape_source(self, source: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Scrape opportunities from a single source"""
-        opportunities = []
-        
-        if source.get('type') == 'javascript' or source.get('requires_js', False):
-            opportunities = self.scrape_with_selenium(source)
-        else:
-            opportunities = self.scrape_with_requests(source)
+        """Scrape opportunities from a single source with its fetch backend"""
+        opportunities = self.backend(backend_for(source)).scrape(source)
+        source_key = source.get('id', source['name'])
             
-        # Clean and validate opportunities
+        # Clean and validate opportunities; unchanged containers keep the record they produced last run
         cleaned_opportunities = []
-        for opp in opportunities:
-            cleaned_opp = self.clean_opportunity_data(opp, source)
-            if self.validate_opportunity(cleaned_opp):
-                cleaned_opportunities.append(cleaned_opp)
+        with self.metrics.stage('validate'):
+            for opp in opportunities:
+                reused = self.snapshots.reuse(source_key, opp.get('fingerprint'), source['name'])
+                if reused:
+                    cleaned_opportunities.append(reused)
+                    continue
+                cleaned_opp = self.clean_opportunity_data(opp, source)
+                if self.validate_opportunity(cleaned_opp):
+                    cleaned_opportunities.append(cleaned_opp)
+                    self.snapshots.keep(source_key, opp.get('fingerprint'), cleaned_opp)
         
-        return cleaned_opportunities
-
-    def scrape_with_requests(self, source: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Scrape using requests and BeautifulSoup"""
-        opportunities = []
+        self.metrics.count('dropped_validation', len(opportunities) - len(cleaned_opportunities))
+        self.metrics.count('opportunities', len(cleaned_opportunities))
         
-        try:
-            # Check robots.txt
-            if not self.check_robots_txt(source['url']):
-                self.logger.warning(f"Robots.txt disallows scraping for {source['url']}")
-                return opportunities
-            
-            response = self.session.get(source['url'], timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            selectors = source.get('selectors', {})
-            
-            # Find job containers
-            containers = soup.select(selectors.get('container', '.job'))
-            
-            for container in containers:
-                opportunity = self.extract_opportunity_data(container, selectors, source['url'])
-                if opportunity:
-                    opportunities.append(opportunity)
-                    
-        except requests.RequestException as e:
-            self.logger.error(f"Request error for {source['name']}: {e}")
-        except Exception as e:
-            self.logger.error(f"Parsing error for {source['name']}: {e}")
-            
-        return opportunities
-
-    def scrape_with_selenium(self, source: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Scrape using Selenium for JavaScript-heavy sites"""
-        opportunities = []
-        
-        if not self.driver:
-            self.setup_selenium_driver()
-            
-        if not self.driver:
-            self.logger.error("Selenium driver not available")
-            return opportunities
-            
-        try:
-            self.driver.get(source['url'])
-            
-            # Wait for content to load
-            wait = WebDriverWait(self.driver, 15)
-            selectors = source.get('selectors', {})
-            
-            if selectors.get('container'):
-                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selectors['container'])))
-            
-            # Find job containers
-            containers = self.driver.find_elements(By.CSS_SELECTOR, selectors.get('container', '.job'))
-            
-            for container in containers:
-                opportunity = self.extract_opportunity_data_selenium(container, selectors, source['url'])
-                if opportunity:
-                    opportunities.append(opportunity)
-                    
-        except TimeoutException:
-            self.logger.error(f"Timeout waiting for content on {source['name']}")
-        except Exception as e:
-            self.logger.error(f"Selenium error for {source['name']}: {e}")
-            
-        return opportunities
+        # Snapshots keep the card's record, so detail fields are always applied on top of it afresh
+        return self.enricher.enrich(source, cleaned_opportunities)
 
-    def extract_opportunity_data(self, container, selectors: Dict[str, str], base_url: str) -> Optional[Dict[str, Any]]:
-        """Extract opportunity data from HTML container"""
-        try:
-            opportunity = {}
-            
-            # Extract title
-            title_elem = container.select_one(selectors.get('title', '.title'))
-            opportunity['title'] = title_elem.get_text(strip=True) if title_elem else 'No title'
-            
-            # Extract institute
-            institute_elem = container.select_one(selectors.get('institute', '.institute'))
-            opportunity['institute'] = institute_elem.get_text(strip=True) if institute_elem else 'Unknown'
-            
-            # Extract deadline
-            deadline_elem = container.select_one(selectors.get('deadline', '.deadline'))
-            opportunity['deadline'] = self.parse_deadline(deadline_elem.get_text(strip=True) if deadline_elem else '')
-            
-            # Extract link
-            link_elem = container.select_one(selectors.get('link', 'a'))
-            if link_elem:
-                href = link_elem.get('href', '')
-                opportunity['link'] = urljoin(base_url, href)
-            else:
-                opportunity['link'] = base_url
-            
-            # Extract description
-            desc_elem = container.select_one(selectors.get('description', '.description'))
-            opportunity['description'] = desc_elem.get_text(strip=True) if desc_elem else ''
-            
-            # Filter for medical physics relevance
-            if self.is_medical_physics_relevant(opportunity['title'], opportunity['description']):
-                return opportunity
-                
-        except Exception as e:
-            self.logger.error(f"Error extracting opportunity data: {e}")
-            
-        return None
+    def page_is_known(self, page: List[Dict[str, Any]], known: set) -> bool:
+        """Check whether every listing on a page was already seen by the previous run"""
+        return bool(page) and bool(known) and all(self.generate_opportunity_id(opp) in known for opp in page)
 
-    def extract_opportunity_data_selenium(self, container, selectors: Dict[str, str], base_url: str) -> Optional[Dict[str, Any]]:
-        """Extract opportunity data using Selenium WebElement"""
-        try:
-            opportunity = {}
-            
-            # Extract title
-            try:
-                title_elem = container.find_element(By.CSS_SELECTOR, selectors.get('title', '.title'))
-                opportunity['title'] = title_elem.text.strip()
-            except NoSuchElementException:
-                opportunity['title'] = 'No title'
-            
-            # Extract institute
-            try:
-                institute_elem = container.find_element(By.CSS_SELECTOR, selectors.get('institute', '.institute'))
-                opportunity['institute'] = institute_elem.text.strip()
-            except NoSuchElementException:
-                opportunity['institute'] = 'Unknown'
-            
-            # Extract deadline
-            try:
-                deadline_elem = container.find_element(By.CSS_SELECTOR, selectors.get('deadline', '.deadline'))
-                opportunity['deadline'] = self.parse_deadline(deadline_elem.text.strip())
-            except NoSuchElementException:
-                opportunity['deadline'] = ''
-            
-            # Extract link
-            try:
-                link_elem = container.find_element(By.CSS_SELECTOR, selectors.get('link', 'a'))
-                href = link_elem.get_attribute('href')
-                opportunity['link'] = urljoin(base_url, href) if href else base_url
-            except NoSuchElementException:
-                opportunity['link'] = base_url
-            
-            # Extract description
-            try:
-                desc_elem = container.find_element(By.CSS_SELECTOR, selectors.get('description', '.description'))
-                opportunity['description'] = desc_elem.text.strip()
-            except NoSuchElementException:
-                opportunity['description'] = ''
-            
-            # Filter for medical physics relevance
-            if self.is_medical_physics_relevant(opportunity['title'], opportunity['description']):
-                return opportunity
-                
-        except Exception as e:
-            self.logger.error(f"Error extracting opportunity data with Selenium: {e}")
-            
+    def build_opportunity(self, fields: Dict[str, Optional[str]], base_url: str,
+                          check_relevance: bool = True, day_first: bool = False) -> Optional[Dict[str, Any]]:
+        """Turn raw field text (None for missing elements) into an opportunity"""
+        opportunity = opportunity_from_fields(fields, base_url, day_first)
+        
+        # Filter for medical physics relevance
+        if not check_relevance or self.is_medical_physics_relevant(opportunity['title'], opportunity['description']):
+            return opportunity
         return None
 
     def is_medical_physics_relevant(self, title: str, description: str) -> bool:
         """Check if opportunity is relevant to medical physics"""
-        relevant_keywords = [
-            'medical physics', 'radiation oncology', 'medical imaging', 'radiotherapy',
-            'nuclear medicine', 'diagnostic imaging', 'radiation therapy', 'medical radiation',
-            'imaging physics', 'radiation safety', 'dosimetry', 'radiobiology',
-            'proton therapy', 'radiation protection', 'medical dosimetry'
-        ]
-        
-        text = f"{title} {description}".lower()
-        return any(keyword in text for keyword in relevant_keywords)
-
-    def parse_deadline(self, deadline_text: str) -> str:
-        """Parse deadline text into standardized date format"""
-        if not deadline_text:
-            # Default to 6 months from now if no deadline found
-            default_deadline = datetime.now() + timedelta(days=180)
-            return default_deadline.strftime('%Y-%m-%d')
-        
-        # Common deadline patterns
-        deadline_text = deadline_text.lower().strip()
-        
-        # Try to extract date patterns
-        import re
-        
-        # Pattern: YYYY-MM-DD
-        date_pattern = r'(\d{4})-(\d{1,2})-(\d{1,2})'
-        match = re.search(date_pattern, deadline_text)
-        if match:
-            return f"{match.group(1)}-{match.group(2):0>2}-{match.group(3):0>2}"
-        
-        # Pattern: MM/DD/YYYY
-        date_pattern = r'(\d{1,2})/(\d{1,2})/(\d{4})'
-        match = re.search(date_pattern, deadline_text)
-        if match:
-            return f"{match.group(3)}-{match.group(1):0>2}-{match.group(2):0>2}"
-        
-        # Pattern: DD/MM/YYYY
-        date_pattern = r'(\d{1,2})/(\d{1,2})/(\d{4})'
-        match = re.search(date_pattern, deadline_text)
-        if match:
-            return f"{match.group(3)}-{match.group(2):0>2}-{match.group(1):0>2}"
-        
-        # If no pattern matches, return default
-        default_deadline = datetime.now() + timedelta(days=180)
-        return default_deadline.strftime('%Y-%m-%d')
+        return self.relevance.is_relevant(title, description)
+
+    def filter_relevant(self, opportunities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep the medical physics relevant opportunities from a page, classified in one batch"""
+        with self.metrics.stage('relevance'):
+            relevant = self.relevance.classify_batch([(opp['title'], opp['description']) for opp in opportunities])
+            kept = [opp for opp, keep in zip(opportunities, relevant) if keep]
+        self.metrics.count('dropped_relevance', len(opportunities) - len(kept))
+        return kept
+
+    def parse_deadline(self, deadline_text: str, day_first: bool = False) -> str:
+        """Parse deadline text into standardized date format, or DEADLINE_UNKNOWN"""
+        return parse_deadline_text(deadline_text.strip(), day_first) or DEADLINE_UNKNOWN
 
     def clean_opportunity_data(self, opportunity: Dict[str, Any], source: Dict[str, Any]) -> Dict[str, Any]:
         """Clean and standardize opportunity data"""
@@ -404,114 +349,88 @@ class PhDScraper:
         required_fields = ['title', 'institute', 'deadline', 'link']
         return all(opportunity.get(field) for field in required_fields)
 
-    def check_robots_txt(self, url: str) -> bool:
-        """Check if robots.txt allows scraping"""
-        try:
-            parsed_url = urlparse(url)
-            robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-            
-            response = self.session.get(robots_url, timeout=10)
-            if response.status_code == 200:
-                # Simple check - in production, use robotparser
-                robots_content = response.text.lower()
-                if 'disallow: /' in robots_content and 'user-agent: *' in robots_content:
-                    return False
-            return True
-        except:
-            return True  # If can't check, assume allowed
-
     def generate_summary(self) -> Dict[str, Any]:
         """Generate scraping summary"""
+        http = self.backends.get('requests')
         return {
             'totalOpportunities': len(self.results),
             'totalErrors': len(self.errors),
             'sourcesScrapped': len(set(opp['source'] for opp in self.results)),
             'scrapingTimestamp': datetime.now().isoformat(),
             'results': self.results,
-            'errors': self.errors
+            'errors': self.errors,
+            'skipped': self.skipped,
+            'retries': http.http.retries if http else 0,
+            'circuitBreakers': http.breakers.summary() if http else {},
+            'containers': self.snapshots.summary()
         }
 
     def save_results(self, output_path: str = 'data/opportunities.json') -> None:
-        """Save scraping results to file"""
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        # Load existing data if available
-        existing_opportunities = []
-        if os.path.exists(output_path):
-            try:
-                with open(output_path, 'r') as f:
-                    existing_opportunities = json.load(f)
-            except json.JSONDecodeError:
-                self.logger.warning("Could not parse existing opportunities file")
-        
-        # Merge with new results (deduplicate)
-        all_opportunities = self.deduplicate_opportunities(existing_opportunities + self.results)
-        
-        # Archive expired opportunities
-        active_opportunities, expired_opportunities = self.archive_expired_opportunities(all_opportunities)
-        
-        # Save active opportunities
-        with open(output_path, 'w') as f:
-            json.dump(active_opportunities, f, indent=2, ensure_ascii=False)
-        
-        # Save archived opportunities
-        if expired_opportunities:
-            archive_path = 'data/archive/archived_opportunities.json'
-            os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+        """Save scraping results to the store and re-export the site data if it changed"""
+        with self.metrics.stage('save'):
+            store_path = self.store_path or os.path.splitext(output_path)[0] + '.db'
+            
+            with OpportunityStore(store_path, self.near_duplicate_threshold) as store:
+                # First run against an existing JSON history: import it once
+                store.bootstrap_from_json(output_path)
+            
+                # Listings already past their deadline go straight to the archive
+                today = datetime.now().date().isoformat()
+                current, already_expired = [], []
+                for opp in self.results:
+                    deadline = opp.get('deadline', '')
+                    (already_expired if deadline[:1].isdigit() and deadline < today else current).append(opp)
+            
+                # Upsert new results by id (duplicates by title/institute are skipped)
+                inserted, updated, merged = store.upsert_many(current)
+            
+                # Expire opportunities via the deadline index; rows come back as fresh dicts, tagged in place
+                expired_opportunities = store.expire(today)
+                for opp in expired_opportunities:
+                    opp['archivedDate'] = today
+                expired_opportunities += [{**opp, 'archivedDate': today} for opp in already_expired]
+            
+                # Only rewrite the static site's JSON when something changed (merges that replaced content are updates)
+                changed = inserted or updated or len(expired_opportunities) > len(already_expired)
+                if changed or not os.path.exists(output_path):
+                    active_count = store.export_json(output_path)
+                    self.logger.info(f"Exported {active_count} active opportunities to {output_path}")
+                else:
+                    active_count = store.count()
+                    self.logger.info("No changes, leaving exported opportunities untouched")
+                
+                if self.site_artifacts and (changed or not os.path.exists(self.site_artifacts.manifest_path)):
+                    with self.metrics.stage('site_artifacts'):
+                        self.site_artifacts.build(store.iter_records())
             
-            existing_archived = []
-            if os.path.exists(archive_path):
-                try:
-                    with open(archive_path, 'r') as f:
-                        existing_archived = json.load(f)
-                except json.JSONDecodeError:
-                    pass
+            # Append archived opportunities to their monthly partitions
+            archived_count = OpportunityArchive(self.archive_dir).append(expired_opportunities) if expired_opportunities else 0
             
-            with open(archive_path, 'w') as f:
-                json.dump(existing_archived + expired_opportunities, f, indent=2, ensure_ascii=False)
-        
-        self.logger.info(f"Saved {len(active_opportunities)} active opportunities")
-        self.logger.info(f"Archived {len(expired_opportunities)} expired opportunities")
+            self.logger.info(f"Saved {active_count} active opportunities "
+                             f"({inserted} new, {updated} updated, {merged} merged into existing listings)")
+            self.logger.info(f"Archived {archived_count} expired opportunities")
 
-    def deduplicate_opportunities(self, opportunities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate opportunities"""
-        seen = set()
-        unique_opportunities = []
-        
-        for opp in opportunities:
-            # Create key based on title and institute
-            key = f"{opp.get('title', '').lower()}-{opp.get('institute', '').lower()}"
-            if key not in seen:
-                seen.add(key)
-                unique_opportunities.append(opp)
-        
-        return unique_opportunities
+    def write_metrics(self) -> None:
+        """Write metrics.json and a Prometheus textfile into the metrics directory"""
+        if not self.metrics.enabled:
+            return
+        self.metrics.write_json(os.path.join(self.metrics_dir, 'metrics.json'))
+        self.metrics.write_prometheus(os.path.join(self.metrics_dir, 'phd_scraper.prom'))
+        self.logger.info(f"Wrote metrics to {self.metrics_dir}")
 
-    def archive_expired_opportunities(self, opportunities: List[Dict[str, Any]]) -> tuple:
-        """Separate active and expired opportunities"""
-        today = datetime.now().date()
-        active = []
-        expired = []
-        
-        for opp in opportunities:
-            try:
-                deadline = datetime.strptime(opp['deadline'], '%Y-%m-%d').date()
-                if deadline >= today:
-                    active.append(opp)
-                else:
-                    expired.append({**opp, 'archivedDate': today.isoformat()})
-            except (ValueError, KeyError):
-                # If deadline parsing fails, keep as active
-                active.append(opp)
-        
-        return active, expired
+    def start_cycle(self) -> None:
+        """Make the next daemon cycle's metrics and counts describe that cycle, not the life of the process"""
+        self.metrics.reset()
+        self.robots_cache.start_cycle()
+        for backend in list(self.backends.values()):
+            backend.start_cycle()
 
     def cleanup(self) -> None:
         """Cleanup resources"""
-        if self.driver:
-            self.driver.quit()
-        self.session.close()
+        self.browser_pool.close()
+        self.enricher.close()
+        for backend in self.backends.values():
+            backend.close()
 
     def __enter__(self):
         return self
@@ -525,46 +444,290 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='PhD Medical Physics Opportunities Scraper')
+    parser.add_argument('command', nargs='?', default='scrape',
+                        choices=['scrape', 'validate-config', 'dry-run', 'export-only'],
+                        help='scrape (default); validate-config, dry-run and export-only start without '
+                             'loading any fetch backend')
     parser.add_argument('--config', default='data/sources.json', help='Path to sources configuration file')
-    parser.add_argument('--output', default='data/opportunities.json', help='Output file path')
+    parser.add_argument('--output', default='data/opportunities.json',
+                        help='Output file path; a .jsonl path is written as JSON Lines')
     parser.add_argument('--headless', action='store_true', help='Run browser in headless mode')
     parser.add_argument('--verbose', action='store_true', help='Enable verbose logging')
+    parser.add_argument('--workers', type=int, default=1, help='Number of sources to scrape concurrently')
+    parser.add_argument('--rate', type=float, default=0.5, help='Maximum requests per second to any single host')
+    parser.add_argument('--cache-dir', default='data/cache', help='Directory for the persistent HTTP cache')
+    parser.add_argument('--browsers', type=int, default=1, help='Number of headless Chrome workers for JS sources')
+    parser.add_argument('--browser-max-pages', type=int, default=50, help='Restart a browser after this many pages')
+    parser.add_argument('--block-resources', action='store_true', help='Do not load images, fonts or CSS in the browser')
+    parser.add_argument('--parser', choices=['lxml', 'html.parser'], default='html.parser',
+                        help='HTML tree builder for requests sources; lxml is faster but repairs broken markup differently')
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help='Processes that parse downloaded pages in parallel (e.g. the number of cores); '
+                             '0 parses in the scraping threads')
+    parser.add_argument('--no-prefilter', action='store_true', help='Build the full document tree instead of only listing containers')
+    parser.add_argument('--store', default=None, help='Path to the opportunity database (default: next to --output)')
+    parser.add_argument('--site-dir', default='data/site',
+                        help="Directory for the static site's sharded data and search index; empty disables")
+    parser.add_argument('--shard-by', choices=['month', 'source'], default='month',
+                        help='Split site data by deadline month or by source')
+    parser.add_argument('--archive-dir', default='data/archive', help='Directory for the partitioned archive of expired opportunities')
+    parser.add_argument('--near-duplicate-threshold', type=float, default=0.7,
+                        help='Similarity (0-1) above which listings are merged as near-duplicates; 0 disables')
+    parser.add_argument('--relevance-config', default='data/relevance.json', help='Path to relevance keyword configuration file')
+    parser.add_argument('--robots-ttl', type=float, default=24, help='Hours to reuse a cached robots.txt')
+    parser.add_argument('--no-cache', action='store_true', help='Always download and parse every page')
+    parser.add_argument('--metrics-dir', default=None,
+                        help='Write per-source, per-stage metrics as metrics.json and a Prometheus textfile here')
+    parser.add_argument('--profile', choices=['cprofile', 'sample'], default=None,
+                        help='Profile the run with cProfile (main thread only, so --workers and --browsers 1) '
+                             'or a low-overhead stack sampler that sees every thread')
+    parser.add_argument('--profile-output', default='scraper.prof',
+                        help='Profile output: cProfile stats, or collapsed stacks for the sampler')
+    parser.add_argument('--schedule', action='store_true',
+                        help='Scrape only the sources most likely to have changed, within --time-budget')
+    parser.add_argument('--time-budget', type=float, default=None, help='Seconds a scheduled run may spend scraping')
+    parser.add_argument('--min-priority', type=float, default=0.1,
+                        help='Skip scheduled sources whose chance of new listings is below this')
+    parser.add_argument('--daemon', action='store_true', help='Keep running scheduled cycles')
+    parser.add_argument('--interval', type=float, default=3600, help='Seconds between daemon cycles')
+    parser.add_argument('--connect-timeout', type=float, default=5.0, help='Seconds to wait for a connection')
+    parser.add_argument('--read-timeout', type=float, default=20.0, help='Seconds to wait for response data')
+    parser.add_argument('--retries', type=int, default=3, help='Retries for connection errors and 429/5xx responses')
+    parser.add_argument('--pool-size', type=int, default=None, help='Connections kept open per host')
+    parser.add_argument('--breaker-threshold', type=int, default=3,
+                        help='Consecutive failures before a host is skipped')
+    parser.add_argument('--breaker-cooldown', type=float, default=900,
+                        help='Seconds a failing host is skipped before it is probed again (doubles per failed probe)')
+    parser.add_argument('--burst', type=float, default=1.0, help='Requests allowed back-to-back before per-host pacing applies')
+    parser.add_argument('--detail-workers', type=int, default=4,
+                        help='Detail pages downloaded at once for sources with detail selectors; 0 disables enrichment')
+    parser.add_argument('--detail-per-host', type=int, default=2, help='Detail pages downloaded at once from one host')
+    parser.add_argument('--detail-ttl', type=float, default=24,
+                        help='Hours to reuse a cached detail page before revalidating it')
     
     args = parser.parse_args()
+    if args.profile == 'cprofile' and (args.workers > 1 or args.browsers > 1):
+        parser.error("--profile cprofile only sees the main thread, which mostly waits on the workers; "
+                     "use --profile sample with --workers or --browsers above 1")
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    with PhDScraper(args.config) as scraper:
+    if args.command == 'validate-config':
+        problems = validate_config(args.config, args.relevance_config)
+        if problems:
+            print_problems(args.config, problems)
+            return 1
+        print(f"{args.config}: OK")
+        return 0
+    if args.command == 'dry-run':
+        return dry_run(args)
+    if args.command == 'export-only':
+        return export_only(args)
+    
+    with PhDScraper(args.config, max_workers=args.workers,
+                    requests_per_second=args.rate, burst=args.burst,
+                    cache_dir=None if args.no_cache else args.cache_dir,
+                    robots_ttl_hours=args.robots_ttl,
+                    browser_workers=args.browsers, browser_max_pages=args.browser_max_pages,
+                    headless=args.headless, block_resources=args.block_resources,
+                    parser=args.parser, prefilter=not args.no_prefilter,
+                    relevance_config=args.relevance_config, store_path=args.store,
+                    archive_dir=args.archive_dir,
+                    near_duplicate_threshold=args.near_duplicate_threshold or None,
+                    metrics_dir=args.metrics_dir,
+                    connect_timeout=args.connect_timeout, read_timeout=args.read_timeout,
+                    max_retries=args.retries, pool_size=args.pool_size,
+                    breaker_threshold=args.breaker_threshold, breaker_cooldown=args.breaker_cooldown,
+                    site_dir=args.site_dir or None, shard_by=args.shard_by,
+                    parse_workers=args.parse_workers, detail_workers=args.detail_workers,
+                    detail_per_host=args.detail_per_host, detail_ttl_hours=args.detail_ttl) as scraper:
         try:
             scraper.load_sources()
             
-            if any(source.get('requires_js', False) for source in scraper.sources):
-                scraper.setup_selenium_driver(headless=args.headless)
-            
-            summary = scraper.scrape_all_sources()
-            scraper.save_results(args.output)
-            
-            # Print summary
-            print("\n" + "="*50)
-            print("SCRAPING SUMMARY")
-            print("="*50)
-            print(f"Total Opportunities Found: {summary['totalOpportunities']}")
-            print(f"Sources Scraped: {summary['sourcesScrapped']}")
-            print(f"Errors: {summary['totalErrors']}")
-            print(f"Scraping Completed: {summary['scrapingTimestamp']}")
-            
-            if summary['errors']:
-                print("\nErrors encountered:")
-                for error in summary['errors']:
-                    print(f"  - {error['source']}: {error['error']}")
+            if args.daemon:
+                # Stop between cycles cleanly when the service manager asks
+                signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+            
+            if args.schedule or args.daemon:
+                schedule = SourceSchedule(
+                    os.path.join(args.cache_dir, 'schedule.json') if not args.no_cache else None,
+                    min_priority=args.min_priority
+                )
+            
+            while True:
+                cycle_started = time.monotonic()
+                scraper.start_cycle()
+                with profiled(args.profile, args.profile_output):
+                    if args.schedule or args.daemon:
+                        summary = run_scheduled(scraper, schedule, args.output, args.time_budget)
+                    else:
+                        summary = scraper.scrape_all_sources()
+                        scraper.save_results(args.output)
+                scraper.write_metrics()
+                print_summary(summary)
+                
+                if not args.daemon:
+                    break
+                time.sleep(max(0.0, args.interval - (time.monotonic() - cycle_started)))
             
             return 0 if summary['totalErrors'] == 0 else 1
             
+        except KeyboardInterrupt:
+            return 0
         except Exception as e:
             logging.error(f"Fatal error: {e}")
             return 1
 
 
+def print_summary(summary: Dict[str, Any]) -> None:
+    """Print a run summary to stdout"""
+    print("\n" + "="*50)
+    print("SCRAPING SUMMARY")
+    print("="*50)
+    print(f"Total Opportunities Found: {summary['totalOpportunities']}")
+    print(f"Sources Scraped: {summary['sourcesScrapped']}")
+    print(f"Errors: {summary['totalErrors']}")
+    containers = summary['containers']
+    print(f"Containers: {containers['new']} new, {containers['changed']} changed, "
+          f"{containers['unchanged']} unchanged, {containers['removed']} removed")
+    print(f"Scraping Completed: {summary['scrapingTimestamp']}")
+    
+    if summary['errors']:
+        print("\nErrors encountered:")
+        for error in summary['errors']:
+            print(f"  - {error['source']} ({error.get('reason', 'error')}): {error['error']}")
+    
+    if summary['circuitBreakers']:
+        print("\nCircuit breakers:")
+        for host, breaker in summary['circuitBreakers'].items():
+            retry = f", retry in {breaker['retryAfterSeconds']}s" if 'retryAfterSeconds' in breaker else ''
+            print(f"  - {host}: {breaker['state']} after {breaker['failures']} failure(s), "
+                  f"{breaker['skippedRequests']} request(s) skipped{retry}")
+    
+    if summary['skipped']:
+        print("\nSkipped sources:")
+        for entry in summary['skipped']:
+            detail = f" (priority {entry['priority']}: {entry['reason']})" if 'priority' in entry else ''
+            print(f"  - {entry['source']}: {entry['skipped']}{detail}")
+
+
+def validate_config(config_path: str, relevance_config: Optional[str]) -> List[str]:
+    """Problems in the sources and relevance configuration; nothing is fetched or imported"""
+    try:
+        with open(config_path, 'r') as f:
+            sources = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        return [f"{config_path}: {e}"]
+    if not isinstance(sources, list):
+        return [f"{config_path}: expected a list of sources"]
+    
+    problems = []
+    seen = set()
+    for position, source in enumerate(sources):
+        if not isinstance(source, dict):
+            problems.append(f"source {position}: expected an object")
+            continue
+        label = source.get('id') or source.get('name') or f"source {position}"
+        if not source.get('name'):
+            problems.append(f"{label}: missing name")
+        if not str(source.get('url', '')).startswith(('http://', 'https://')):
+            problems.append(f"{label}: url must be http(s)")
+        if label in seen:
+            problems.append(f"{label}: duplicate id")
+        seen.add(label)
+        
+        selectors = source.get('selectors', {})
+        if not isinstance(selectors, dict) or not all(isinstance(v, str) and v.strip() for v in selectors.values()):
+            problems.append(f"{label}: selectors must map field names to non-empty CSS selectors")
+        
+        detail = source.get('detail')
+        if detail is not None:
+            fields = detail.get('selectors') if isinstance(detail, dict) else None
+            if not isinstance(fields, dict) or not fields or \
+                    not all(isinstance(v, str) and v.strip() for v in fields.values()):
+                problems.append(f"{label}: detail selectors must map field names to non-empty CSS selectors")
+            elif set(fields) - set(DETAIL_FIELDS):
+                unknown = ', '.join(sorted(set(fields) - set(DETAIL_FIELDS)))
+                problems.append(f"{label}: unknown detail fields {unknown}, expected {', '.join(DETAIL_FIELDS)}")
+        
+        try:
+            backend_spec(backend_for(source))
+        except ValueError as e:
+            problems.append(f"{label}: {e}")
+        
+        pagination = source.get('pagination')
+        if pagination is not None:
+            mode = pagination_mode(pagination) if isinstance(pagination, dict) else None
+            if mode is None:
+                problems.append(f"{label}: pagination needs url_template, next_selector or scroll")
+            elif mode == 'template':
+                try:
+                    page_url(pagination, pagination.get('start', 1))
+                except (KeyError, IndexError, ValueError) as e:
+                    problems.append(f"{label}: url_template may only use {{page}} and {{offset}} ({e})")
+            if isinstance(pagination, dict) and not isinstance(pagination.get('max_pages', 1), int):
+                problems.append(f"{label}: pagination max_pages must be an integer")
+    
+    if relevance_config and os.path.exists(relevance_config):
+        try:
+            with open(relevance_config, 'r') as f:
+                RelevanceMatcher.from_config(json.load(f))
+        except (json.JSONDecodeError, ValueError, TypeError, AttributeError) as e:
+            problems.append(f"{relevance_config}: {e}")
+    
+    return problems
+
+
+def dry_run(args) -> int:
+    """Print which sources a run would scrape, with which backend, without fetching anything"""
+    problems = validate_config(args.config, args.relevance_config)
+    if problems:
+        print_problems(args.config, problems)
+        return 1
+    with open(args.config, 'r') as f:
+        sources = [s for s in json.load(f) if s.get('active', True)]
+    
+    skipped = []
+    if args.schedule or args.daemon:
+        schedule = SourceSchedule(os.path.join(args.cache_dir, 'schedule.json') if not args.no_cache else None,
+                                  min_priority=args.min_priority)
+        sources, skipped = schedule.plan(sources, args.time_budget, args.workers + args.browsers)
+    
+    print(f"Would scrape {len(sources)} source(s):")
+    for source in sources:
+        pagination = source.get('pagination')
+        pages = ''
+        if pagination_mode(pagination):
+            pages = f", {pagination_mode(pagination)} pagination up to {pagination.get('max_pages', DEFAULT_MAX_PAGES)} pages"
+        details = ', detail pages' if detail_selectors(source) and args.detail_workers > 0 else ''
+        print(f"  - {source['name']} [{backend_for(source)}{pages}{details}] {source['url']}")
+    for entry in skipped:
+        print(f"  - {entry['source']}: skipped, {entry['skipped']} (priority {entry['priority']}: {entry['reason']})")
+    return 0
+
+
+def export_only(args) -> int:
+    """Re-export the site data from the stored opportunities without scraping"""
+    store_path = args.store or os.path.splitext(args.output)[0] + '.db'
+    if not os.path.exists(store_path):
+        print(f"No opportunity store at {store_path}", file=sys.stderr)
+        return 1
+    with OpportunityStore(store_path) as store:
+        count = store.export_json(args.output)
+        print(f"Exported {count} active opportunities to {args.output}")
+        if args.site_dir:
+            manifest = SiteArtifacts(args.site_dir, args.shard_by).build(store.iter_records())
+            print(f"Built {len(manifest['shards'])} data shard(s) and search index in {args.site_dir}")
+    return 0
+
+
+def print_problems(config_path: str, problems: List[str]) -> None:
+    """Print configuration problems to stderr"""
+    print(f"{config_path}: {len(problems)} problem(s)", file=sys.stderr)
+    for problem in problems:
+        print(f"  - {problem}", file=sys.stderr)
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Selenium Backend
+Renders JavaScript-heavy sources in pooled headless Chrome and extracts
+listings with injected scripts
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional
+from urllib.parse import urljoin
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (JavascriptException, NoSuchElementException, TimeoutException,
+                                        WebDriverException)
+
+from backends import FetchBackend, SourceFailed
+from deadlines import DEADLINE_UNKNOWN
+from html_parsing import DEFAULT_FIELD_SELECTORS
+from pagination import DEFAULT_MAX_PAGES, page_url, pagination_mode
+
+COUNT_CONTAINERS_JS = "return document.querySelectorAll(arguments[0]).length;"
+
+# URL patterns blocked through CDP when resource blocking is enabled
+BLOCKED_RESOURCE_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.css', '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp4', '*.webm', '*.mp3',
+]
+
+# Extracts every container's fields in one WebDriver round trip. Missing
+# elements come back as null, links as their raw href attribute. Containers
+# before `start` are skipped, so an infinite-scroll page can be read in steps.
+EXTRACT_CONTAINERS_JS = """
+const [containerSelector, fieldSelectors, start] = arguments;
+const rows = [];
+for (const container of Array.from(document.querySelectorAll(containerSelector)).slice(start || 0)) {
+    const row = {};
+    for (const [field, selector] of Object.entries(fieldSelectors)) {
+        let elem = null;
+        try { elem = container.querySelector(selector); } catch (e) {}
+        if (!elem) {
+            row[field] = null;
+        } else if (field === 'link') {
+            row[field] = elem.getAttribute('href') || '';
+        } else {
+            row[field] = elem.innerText;
+        }
+    }
+    rows.push(row);
+}
+return JSON.stringify(rows);
+"""
+
+
+class SeleniumBackend(FetchBackend):
+    def __init__(self, scraper, headless: bool = True, block_resources: bool = False):
+        super().__init__(scraper)
+        self.headless = headless
+        self.block_resources = block_resources
+        self.logger = logging.getLogger(__name__)
+
+    def create_driver(self):
+        """Create a Selenium WebDriver for JavaScript-heavy sites"""
+        chrome_options = Options()
+        if self.headless:
+            chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+        
+        if self.block_resources:
+            # Listings only need the DOM; Chrome has a content setting for images only,
+            # fonts and stylesheets are blocked by URL pattern through CDP below
+            chrome_options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+            })
+        
+        try:
+            # No implicit wait: content is awaited explicitly, and lookups that may
+            # legitimately find nothing (such as a missing next link) return at once
+            driver = webdriver.Chrome(options=chrome_options)
+            if self.block_resources:
+                try:
+                    driver.execute_cdp_cmd('Network.enable', {})
+                    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_RESOURCE_PATTERNS})
+                except Exception as e:
+                    self.logger.warning(f"Could not enable CDP resource blocking: {e}")
+            self.logger.info("Selenium WebDriver initialized")
+            return driver
+        except Exception as e:
+            self.logger.error(f"Failed to initialize WebDriver: {e}")
+            return None
+
+    def scrape(self, source: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Scrape using Selenium for JavaScript-heavy sites"""
+        with self.scraper.browser_pool.driver() as driver:
+            if not driver:
+                raise SourceFailed("Selenium driver not available", 'browser')
+            
+            try:
+                return self.scrape_with_driver(driver, source)
+            except TimeoutException:
+                # A slow page, not a broken browser: the driver goes back to the pool
+                failure = SourceFailed("Timeout waiting for content", 'timeout')
+            except WebDriverException:
+                # A dead session or lost connection: let the pool retire this driver
+                raise
+            except Exception as e:
+                failure = SourceFailed(f"Selenium error: {e}", 'parse')
+        raise failure
+
+    def scrape_with_driver(self, driver, source: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Scrape a page with a WebDriver borrowed from the pool"""
+        with self.metrics.stage('rate_limit_wait'):
+            self.rate_limiter.acquire(source['url'])
+        with self.metrics.stage('page_load'):
+            driver.get(source['url'])
+        self.metrics.count('pages_fetched')
+        self.scraper.browser_pool.note_pages(driver)
+        
+        # Wait for content to load
+        wait = WebDriverWait(driver, 15)
+        selectors = source.get('selectors', {})
+        
+        if selectors.get('container'):
+            with self.metrics.stage('selenium_wait'):
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selectors['container'])))
+        
+        try:
+            opportunities = self.extract_page_rows(driver, selectors, source['url'],
+                                                   source.get('day_first', False))
+        except JavascriptException as e:
+            # Fall back to per-element lookups of the first page if the script fails; session and
+            # navigation errors propagate so the pool retires the driver
+            self.logger.warning(f"Batched extraction failed for {source['name']}, using per-element lookups: {e}")
+            opportunities = []
+            containers = driver.find_elements(By.CSS_SELECTOR, selectors.get('container', '.job'))
+            
+            for container in containers:
+                # Already filtered for relevance
+                opportunity = self.extract_opportunity_data(container, selectors, source['url'],
+                                                            source.get('day_first', False))
+                if opportunity:
+                    opportunities.append(opportunity)
+            return opportunities
+        
+        if pagination_mode(source.get('pagination')):
+            opportunities += self.crawl_pages(driver, source, opportunities)
+        return self.scraper.filter_relevant(opportunities)
+
+    def crawl_pages(self, driver, source: Dict[str, Any],
+                    first_page: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Scroll or page through a browser-rendered source, stopping at a page the previous run had seen"""
+        pagination = source['pagination']
+        selectors = source.get('selectors', {})
+        container_selector = selectors.get('container', '.job')
+        day_first = source.get('day_first', False)
+        source_key = source.get('id', source['name'])
+        known = self.seen_listings.known(source_key)
+        max_pages = pagination.get('max_pages', DEFAULT_MAX_PAGES)
+        
+        pages = [first_page]
+        if pagination_mode(pagination) == 'scroll':
+            loaded = driver.execute_script(COUNT_CONTAINERS_JS, container_selector)
+            while len(pages) < max_pages and not self.scraper.page_is_known(pages[-1], known):
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                try:
+                    with self.metrics.stage('selenium_wait'):
+                        WebDriverWait(driver, pagination.get('scroll_timeout', 10)).until(
+                            lambda d: d.execute_script(COUNT_CONTAINERS_JS, container_selector) > loaded
+                        )
+                except TimeoutException:
+                    break
+                # Every scroll step grows the same document, so it counts against the driver like a page
+                self.scraper.browser_pool.note_pages(driver)
+                pages.append(self.extract_page_rows(driver, selectors, source['url'], day_first, loaded))
+                loaded = driver.execute_script(COUNT_CONTAINERS_JS, container_selector)
+        else:
+            number = pagination.get('start', 1)
+            visited = {source['url']}
+            while len(pages) < max_pages and not self.scraper.page_is_known(pages[-1], known):
+                number += 1
+                if pagination_mode(pagination) == 'template':
+                    url = page_url(pagination, number)
+                else:
+                    links = driver.find_elements(By.CSS_SELECTOR, pagination['next_selector'])
+                    url = links[0].get_attribute('href') if links else None
+                if not url or url in visited:
+                    break
+                visited.add(url)
+                with self.metrics.stage('rate_limit_wait'):
+                    self.rate_limiter.acquire(url)
+                with self.metrics.stage('page_load'):
+                    driver.get(url)
+                self.metrics.count('pages_fetched')
+                self.scraper.browser_pool.note_pages(driver)
+                try:
+                    with self.metrics.stage('selenium_wait'):
+                        WebDriverWait(driver, 15).until(
+                            EC.presence_of_element_located((By.CSS_SELECTOR, container_selector))
+                        )
+                except TimeoutException:
+                    break
+                pages.append(self.extract_page_rows(driver, selectors, url, day_first))
+        
+        self.seen_listings.record(source_key, (self.scraper.generate_opportunity_id(opp)
+                                               for page in pages for opp in page))
+        self.logger.info(f"Crawled {len(pages)} page(s) of {source['name']}")
+        return [opp for page in pages[1:] for opp in page]
+
+    def extract_page_rows(self, driver, selectors: Dict[str, str], base_url: str,
+                          day_first: bool = False, start: int = 0) -> List[Dict[str, Any]]:
+        """Extract the containers from index `start` on, before relevance filtering"""
+        field_selectors = {field: selectors.get(field, default) for field, default in DEFAULT_FIELD_SELECTORS.items()}
+        opportunities = []
+        with self.metrics.stage('extract'):
+            rows = json.loads(driver.execute_script(
+                EXTRACT_CONTAINERS_JS, selectors.get('container', '.job'), field_selectors, start
+            ) or '[]')
+            
+            for row in rows:
+                fields = {field: value.strip() if isinstance(value, str) else value for field, value in row.items()}
+                try:
+                    opportunity = self.scraper.build_opportunity(fields, base_url, check_relevance=False,
+                                                                 day_first=day_first)
+                except Exception as e:
+                    self.logger.error(f"Error extracting opportunity data with Selenium: {e}")
+                    continue
+                if opportunity:
+                    opportunities.append(opportunity)
+        self.metrics.count('containers', len(rows))
+        self.metrics.count('extracted', len(opportunities))
+        return opportunities
+
+    def extract_opportunity_data(self, container, selectors: Dict[str, str], base_url: str,
+                                 day_first: bool = False) -> Optional[Dict[str, Any]]:
+        """Extract opportunity data using Selenium WebElement"""
+        try:
+            opportunity = {}
+            
+            # Extract title
+            try:
+                title_elem = container.find_element(By.CSS_SELECTOR, selectors.get('title', '.title'))
+                opportunity['title'] = title_elem.text.strip()
+            except NoSuchElementException:
+                opportunity['title'] = 'No title'
+            
+            # Extract institute
+            try:
+                institute_elem = container.find_element(By.CSS_SELECTOR, selectors.get('institute', '.institute'))
+                opportunity['institute'] = institute_elem.text.strip()
+            except NoSuchElementException:
+                opportunity['institute'] = 'Unknown'
+            
+            # Extract deadline
+            try:
+                deadline_elem = container.find_element(By.CSS_SELECTOR, selectors.get('deadline', '.deadline'))
+                opportunity['deadline'] = self.scraper.parse_deadline(deadline_elem.text.strip(), day_first)
+            except NoSuchElementException:
+                opportunity['deadline'] = DEADLINE_UNKNOWN
+            
+            # Extract link
+            try:
+                link_elem = container.find_element(By.CSS_SELECTOR, selectors.get('link', 'a'))
+                href = link_elem.get_attribute('href')
+                opportunity['link'] = urljoin(base_url, href) if href else base_url
+            except NoSuchElementException:
+                opportunity['link'] = base_url
+            
+            # Extract description
+            try:
+                desc_elem = container.find_element(By.CSS_SELECTOR, selectors.get('description', '.description'))
+                opportunity['description'] = desc_elem.text.strip()
+            except NoSuchElementException:
+                opportunity['description'] = ''
+            
+            # Filter for medical physics relevance
+            if self.scraper.is_medical_physics_relevant(opportunity['title'], opportunity['description']):
+                return opportunity
+                
+        except Exception as e:
+            self.logger.error(f"Error extracting opportunity data with Selenium: {e}")
+            
+        return None
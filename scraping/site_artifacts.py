@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Static Site Artifacts
+Minified, sharded, precompressed opportunity data and a prebuilt inverted
+search index, so the browser fetches only the shards and postings it needs
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Union
+
+from records import Opportunity, iso_date
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+UNDATED_SHARD = 'undated'
+SHARD_MODES = ('month', 'source')
+
+# Fields a query is matched against
+SEARCH_FIELDS = ('title', 'institute', 'description')
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has in is it its of on or that the this to was were will with'.split()
+)
+
+# Files below this size are served as-is; compression would barely pay for the request
+MIN_COMPRESS_BYTES = 512
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens, without stopwords and single characters"""
+    return [token for token in TOKEN_RE.findall((text or '').lower())
+            if len(token) > 1 and token not in STOPWORDS]
+
+
+def index_bucket(token: str) -> str:
+    """Index shard a token's postings live in: its first character, digits grouped together"""
+    return '0' if token[0].isdigit() else token[0]
+
+
+def minified(data: Any) -> bytes:
+    """Compact, deterministic JSON"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+def slug(value: str) -> str:
+    """Filename-safe form of a shard key"""
+    return re.sub(r'[^a-z0-9]+', '-', value.lower()).strip('-') or 'unknown'
+
+
+class SiteArtifacts:
+    def __init__(self, root: str = "data/site", shard_by: str = 'month'):
+        if shard_by not in SHARD_MODES:
+            raise ValueError(f"Unknown shard mode '{shard_by}', expected one of {', '.join(SHARD_MODES)}")
+        self.root = root
+        self.shard_by = shard_by
+        self.manifest_path = os.path.join(root, 'manifest.json')
+        self.logger = logging.getLogger(__name__)
+
+    def shard_key(self, opportunity: Opportunity) -> str:
+        """Shard an opportunity belongs to: YYYY-MM of its deadline, or its source"""
+        if self.shard_by == 'source':
+            return opportunity.source or 'unknown'
+        deadline = opportunity.deadline
+        if not isinstance(deadline, date):
+            deadline = iso_date(deadline or '')
+        return deadline.isoformat()[:7] if deadline else UNDATED_SHARD
+
+    def build(self, opportunities: Iterable[Union[Opportunity, Dict[str, Any]]]) -> Dict[str, Any]:
+        """Write shards, index buckets and the manifest; returns the manifest
+
+        Documents are numbered shard by shard, so a posting's document number
+        maps to a shard through the manifest's `firstDoc` offsets and to a row
+        by subtracting that offset. Files are named by content hash, so an
+        unchanged shard keeps its name and stays cached in the browser.
+        Opportunities are held as slotted records until their shard is written.
+        """
+        by_shard: Dict[str, List[Opportunity]] = {}
+        for opp in opportunities:
+            record = opp if isinstance(opp, Opportunity) else Opportunity.from_dict(opp)
+            by_shard.setdefault(self.shard_key(record), []).append(record)
+
+        shards, postings = [], {}
+        doc = 0
+        for key in sorted(by_shard):
+            rows = sorted(by_shard[key], key=lambda opp: (opp.deadline_text or '', opp.id or ''))
+            deadlines = [opp.deadline_text for opp in rows if (opp.deadline_text or '')[:1].isdigit()]
+            entry = {
+                'key': key,
+                'firstDoc': doc,
+                'count': len(rows),
+                'deadlines': [min(deadlines), max(deadlines)] if deadlines else None,
+                **self.write_file('shards', slug(key), minified([opp.to_dict() for opp in rows])),
+            }
+            shards.append(entry)
+            for opp in rows:
+                for token in set(token for field in SEARCH_FIELDS for token in tokenize(getattr(opp, field))):
+                    postings.setdefault(token, []).append(doc)
+                doc += 1
+
+        buckets: Dict[str, Dict[str, List[int]]] = {}
+        for token, docs in postings.items():
+            # Document numbers ascend, so store gaps: smaller numbers, smaller files
+            buckets.setdefault(index_bucket(token), {})[token] = [docs[0]] + [b - a for a, b in zip(docs, docs[1:])]
+        index = {bucket: {'terms': len(terms), **self.write_file('index', bucket, minified(terms))}
+                 for bucket, terms in sorted(buckets.items())}
+
+        manifest = {
+            'version': 1,
+            'generated': datetime.now().isoformat(),
+            'shardBy': self.shard_by,
+            'total': doc,
+            'shards': shards,
+            'search': {
+                'fields': list(SEARCH_FIELDS),
+                'tokenizer': TOKEN_RE.pattern,
+                'stopwords': sorted(STOPWORDS),
+                'postings': 'delta',
+                'buckets': index,
+            },
+            'facets': {
+                'institutes': sorted({opp.institute for rows in by_shard.values() for opp in rows} - {None, ''}),
+                'sources': sorted({opp.source for rows in by_shard.values() for opp in rows} - {None, ''}),
+            },
+        }
+        manifest_bytes = json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8')
+        self.write_atomic(self.manifest_path, manifest_bytes)
+        self.write_compressed(self.manifest_path, manifest_bytes)
+        self.remove_stale(manifest)
+        self.logger.info(f"Built {len(shards)} data shard(s) and {len(index)} index bucket(s) in {self.root}")
+        return manifest
+
+    def write_file(self, kind: str, name: str, data: bytes) -> Dict[str, Any]:
+        """Write a content-addressed artifact and its compressed copies, unless already present"""
+        digest = hashlib.sha1(data).hexdigest()[:12]
+        relative = f"{kind}/{name}.{digest}.json"
+        path = os.path.join(self.root, relative)
+        if not os.path.exists(path):
+            self.write_atomic(path, data)
+            self.write_compressed(path, data)
+        entry = {'file': relative, 'bytes': len(data)}
+        for suffix in ('.gz', '.br'):
+            if os.path.exists(path + suffix):
+                entry[suffix[1:]] = os.path.getsize(path + suffix)
+        return entry
+
+    def write_compressed(self, path: str, data: bytes) -> None:
+        """Write .gz and, if brotli is installed, .br copies for servers that serve precompressed files"""
+        if len(data) < MIN_COMPRESS_BYTES:
+            for suffix in ('.gz', '.br'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            return
+        self.write_atomic(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            self.write_atomic(path + '.br', brotli.compress(data, quality=11))
+
+    @staticmethod
+    def write_atomic(path: str, data: bytes) -> None:
+        """Write a file through a temporary name so a deploy never picks up half of it"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def remove_stale(self, manifest: Dict[str, Any]) -> None:
+        """Delete shard and index files the new manifest no longer references"""
+        keep = {entry['file'] for entry in manifest['shards']}
+        keep.update(entry['file'] for entry in manifest['search']['buckets'].values())
+        for kind in ('shards', 'index'):
+            directory = os.path.join(self.root, kind)
+            if not os.path.isdir(directory):
+                continue
+            for filename in os.listdir(directory):
+                base = re.sub(r'\.(gz|br)$', '', filename)
+                if f"{kind}/{base}" not in keep:
+                    os.remove(os.path.join(directory, filename))
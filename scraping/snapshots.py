@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Container Snapshots
+Listings extracted by the previous run per source, keyed by a fingerprint
+of each container's HTML, so unchanged containers skip extraction, cleaning
+and validation and keep the record (and dateAdded) they had before
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from records import RECORD_FIELDS
+
+CHANGE_KINDS = ('new', 'changed', 'unchanged', 'removed')
+
+
+def fingerprint(html: str) -> str:
+    """Hash of a container's HTML with whitespace normalised"""
+    return hashlib.sha1(' '.join(html.split()).encode('utf-8')).hexdigest()[:16]
+
+
+def listing_key(opportunity: Dict[str, Any]) -> str:
+    """What identifies a listing across edits to its container: its title and institute"""
+    return f"{opportunity.get('title', '')}-{opportunity.get('institute', '')}"
+
+
+class ContainerSnapshots:
+    def __init__(self, path: Optional[str] = "data/cache/container_snapshots.json"):
+        self.path = path
+        # source key -> {'config': hash, 'containers': {fingerprint: {'opportunity': [...], 'record': {...} | None}}}
+        self.previous: Dict[str, Dict[str, Any]] = {}
+        self.current: Dict[str, Dict[str, Any]] = {}
+        self.changes: Dict[str, Dict[str, int]] = {}
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+        self.load()
+
+    def load(self) -> None:
+        """Load the snapshots written by the previous run"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self.previous = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            self.logger.warning(f"Could not read container snapshots, extracting every container: {e}")
+            self.previous = {}
+
+    @staticmethod
+    def config_hash(selectors: Dict[str, Any], day_first: bool = False) -> str:
+        """Hash of the settings extraction depends on; snapshots taken under other settings are ignored"""
+        return hashlib.md5(json.dumps([selectors, day_first], sort_keys=True).encode()).hexdigest()[:12]
+
+    def containers(self, source_key: str, config: str) -> Dict[str, Dict[str, Any]]:
+        """The previous run's containers for a source, by fingerprint"""
+        with self.lock:
+            snapshot = self.previous.get(source_key)
+        return snapshot['containers'] if snapshot and snapshot.get('config') == config else {}
+
+    def update(self, source_key: str, config: str, opportunities: Iterable[Dict[str, Any]],
+               complete: bool = True) -> Dict[str, int]:
+        """Take this run's snapshot of a source from its extracted listings, before any filtering
+
+        Containers the previous run also had keep their entry and record. A
+        new container replacing one for the same listing counts as changed.
+        When the crawl stopped early the containers on the pages it skipped
+        are kept and none are counted as removed.
+        """
+        previous = self.containers(source_key, config)
+        containers: Dict[str, Dict[str, Any]] = {}
+        changes = dict.fromkeys(CHANGE_KINDS, 0)
+        previous_listings = {listing_key(dict(zip(RECORD_FIELDS, entry['opportunity'])))
+                             for entry in previous.values()}
+        for opp in opportunities:
+            key = opp.get('fingerprint')
+            if not key or key in containers:
+                continue
+            if key in previous:
+                containers[key] = previous[key]
+                changes['unchanged'] += 1
+            else:
+                containers[key] = {'opportunity': [opp.get(field) for field in RECORD_FIELDS], 'record': None}
+                changes['changed' if listing_key(opp) in previous_listings else 'new'] += 1
+
+        current_listings = {listing_key(dict(zip(RECORD_FIELDS, entry['opportunity'])))
+                            for entry in containers.values()}
+        for key, entry in previous.items():
+            if key in containers:
+                continue
+            if not complete:
+                containers[key] = entry
+            elif listing_key(dict(zip(RECORD_FIELDS, entry['opportunity']))) not in current_listings:
+                changes['removed'] += 1
+
+        with self.lock:
+            self.current[source_key] = {'config': config, 'containers': containers}
+            self.changes[source_key] = changes
+        return changes
+
+    def carry_over(self, source_key: str, config: str) -> Dict[str, int]:
+        """Keep a source's previous snapshot as it is, for pages the HTTP cache says are unchanged"""
+        with self.lock:
+            snapshot = self.previous.get(source_key)
+            if snapshot is None or snapshot.get('config') != config:
+                return dict.fromkeys(CHANGE_KINDS, 0)
+            self.current[source_key] = snapshot
+            changes = {**dict.fromkeys(CHANGE_KINDS, 0), 'unchanged': len(snapshot['containers'])}
+            self.changes[source_key] = changes
+            return changes
+
+    def reuse(self, source_key: str, key: Optional[str], source_name: str) -> Optional[Dict[str, Any]]:
+        """The kept record of an unchanged container, refreshed as scraped now, or None"""
+        if not key:
+            return None
+        with self.lock:
+            entry = self.current.get(source_key, {}).get('containers', {}).get(key)
+            record = entry and entry['record']
+        if not record:
+            return None
+        return {**record, 'source': source_name, 'scrapedAt': datetime.now().isoformat()}
+
+    def keep(self, source_key: str, key: Optional[str], record: Dict[str, Any]) -> None:
+        """Remember the cleaned, valid record a new or changed container produced"""
+        if not key:
+            return
+        with self.lock:
+            entry = self.current.get(source_key, {}).get('containers', {}).get(key)
+            if entry is not None:
+                entry['record'] = record
+
+    def summary(self) -> Dict[str, Any]:
+        """Container counts by kind, in total and per source, for this run"""
+        with self.lock:
+            changes = dict(self.changes)
+        totals = {kind: sum(counts[kind] for counts in changes.values()) for kind in CHANGE_KINDS}
+        return {**totals, 'bySource': changes}
+
+    def save(self) -> None:
+        """Write this run's snapshots, keeping those of sources not scraped this time"""
+        with self.lock:
+            if not self.current:
+                return
+            # A long-running process compares its next run against this one
+            self.previous, self.current = {**self.previous, **self.current}, {}
+            if not self.path:
+                return
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.previous, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
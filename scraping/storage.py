@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Opportunity Store
+SQLite-backed incremental storage with atomic JSON export for the static site
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from near_duplicates import NearDuplicateIndex, record_richness, same_listing
+from records import OPPORTUNITY_FIELDS, Opportunity, write_json, write_jsonl
+
+# Fields stored in their own columns; anything else is kept in `extra`
+COLUMNS = list(OPPORTUNITY_FIELDS)
+
+# Fields whose change counts as an update to the listing
+CONTENT_FIELDS = ['title', 'institute', 'deadline', 'link', 'description']
+
+ISO_DATE_GLOB = '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS opportunities (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    dedup_key TEXT NOT NULL,
+    title TEXT,
+    institute TEXT,
+    deadline TEXT,
+    link TEXT,
+    description TEXT,
+    source TEXT,
+    dateAdded TEXT,
+    scrapedAt TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_opportunities_deadline ON opportunities (deadline);
+CREATE INDEX IF NOT EXISTS idx_opportunities_dedup_key ON opportunities (dedup_key);
+"""
+
+
+def dedup_key(opportunity: Dict[str, Any]) -> str:
+    """Key used to collapse the same listing seen under different ids"""
+    return f"{opportunity.get('title', '').lower()}-{opportunity.get('institute', '').lower()}"
+
+
+class OpportunityStore:
+    def __init__(self, db_path: str = "data/opportunities.db", near_duplicate_threshold: Optional[float] = None):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self.logger = logging.getLogger(__name__)
+        
+        # MinHash/LSH index kept in the same database; None disables fuzzy matching
+        self.near_duplicates = None
+        if near_duplicate_threshold:
+            self.near_duplicates = NearDuplicateIndex(self.conn, near_duplicate_threshold)
+            if self.near_duplicates.count() != self.count():
+                with self.conn:
+                    self.conn.execute("DELETE FROM minhash_signatures")
+                    self.conn.execute("DELETE FROM minhash_buckets")
+                    self.near_duplicates.add_many((opp['id'], opp) for opp in self.iter_all())
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def count(self) -> int:
+        """Number of stored opportunities"""
+        return self.conn.execute("SELECT COUNT(*) FROM opportunities").fetchone()[0]
+
+    def bootstrap_from_json(self, json_path: str) -> int:
+        """Import an existing opportunities.json into an empty store"""
+        if self.count() or not os.path.exists(json_path):
+            return 0
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                if json_path.endswith('.jsonl'):
+                    opportunities = [json.loads(line) for line in f if line.strip()]
+                else:
+                    opportunities = json.load(f)
+        except json.JSONDecodeError:
+            self.logger.warning("Could not parse existing opportunities file")
+            return 0
+        inserted, _, _ = self.upsert_many(opportunities)
+        self.logger.info(f"Imported {inserted} opportunities from {json_path}")
+        return inserted
+
+    @staticmethod
+    def extra_fields(opportunity: Dict[str, Any]) -> Dict[str, Any]:
+        """Fields without a column of their own, such as those filled in from detail pages"""
+        return {k: v for k, v in opportunity.items() if k not in COLUMNS}
+
+    @classmethod
+    def to_row(cls, opportunity: Dict[str, Any]) -> Tuple:
+        """Convert an opportunity into column values for INSERT"""
+        extra = cls.extra_fields(opportunity)
+        return (
+            *(opportunity.get(column) for column in COLUMNS),
+            dedup_key(opportunity),
+            json.dumps(extra, ensure_ascii=False) if extra else None,
+        )
+
+    @staticmethod
+    def from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a database row back into an opportunity dict"""
+        opportunity = {column: row[column] for column in COLUMNS if row[column] is not None}
+        if row['extra']:
+            opportunity.update(json.loads(row['extra']))
+        return opportunity
+
+    def get(self, opp_id: str) -> Optional[Dict[str, Any]]:
+        """A stored opportunity by id"""
+        row = self.conn.execute("SELECT * FROM opportunities WHERE id = ?", (opp_id,)).fetchone()
+        return self.from_row(row) if row else None
+
+    def upsert_many(self, opportunities: Iterable[Dict[str, Any]]) -> Tuple[int, int, int]:
+        """Insert new opportunities and refresh changed ones, returning (inserted, updated, merged)
+
+        An existing listing keeps its dateAdded and is only refreshed by the
+        source that first found it. A new id whose title and institute match
+        a stored listing is a duplicate of it. With near-duplicate detection
+        on, a new id that the index finds similar enough, and that another
+        source lists at the same institute, is one too. Duplicates are merged
+        into the stored listing, which takes the new content if it is richer.
+        `merged` counts every listing merged this way; those that replaced the
+        stored content are counted as updated too.
+        """
+        inserted = updated = merged = 0
+        with self.conn:
+            for opp in opportunities:
+                if not opp.get('id'):
+                    continue
+                existing = self.conn.execute(
+                    "SELECT * FROM opportunities WHERE id = ?", (opp['id'],)
+                ).fetchone()
+                if existing is None:
+                    duplicate = self.conn.execute(
+                        "SELECT id FROM opportunities WHERE dedup_key = ? LIMIT 1", (dedup_key(opp),)
+                    ).fetchone()
+                    if duplicate:
+                        self.logger.info(f"Merged duplicate '{opp.get('title')}' ({opp.get('source')}) "
+                                         f"into {duplicate['id']}")
+                        merged += 1
+                        continue
+                    if self.near_duplicates:
+                        match = self.near_duplicates.find(opp, accept=lambda candidate: same_listing(
+                            self.get(candidate) or {}, opp, self.near_duplicates.threshold))
+                        if match:
+                            replaced = self.merge_into(match[0], opp)
+                            self.logger.info(f"Merged near-duplicate '{opp.get('title')}' ({opp.get('source')}) "
+                                             f"into {match[0]} (similarity {match[1]:.2f}"
+                                             f"{', replacing its content' if replaced else ''})")
+                            merged += 1
+                            updated += replaced
+                            continue
+                    placeholders = ', '.join('?' * (len(COLUMNS) + 2))
+                    self.conn.execute(
+                        f"INSERT INTO opportunities ({', '.join(COLUMNS)}, dedup_key, extra) VALUES ({placeholders})",
+                        self.to_row(opp)
+                    )
+                    if self.near_duplicates:
+                        self.near_duplicates.add(opp['id'], opp)
+                    inserted += 1
+                elif existing['source'] == opp.get('source') and \
+                        (any(existing[field] != opp.get(field) for field in CONTENT_FIELDS)
+                         or self.extra_fields(self.from_row(existing)) != self.extra_fields(opp)):
+                    self.replace_content(opp['id'], opp)
+                    updated += 1
+        return inserted, updated, merged
+
+    def replace_content(self, opp_id: str, opportunity: Dict[str, Any], fields: List[str] = CONTENT_FIELDS) -> None:
+        """Overwrite a stored listing's content and extra fields, keeping its id and dateAdded"""
+        extra = self.extra_fields(opportunity)
+        self.conn.execute(
+            f"UPDATE opportunities SET {', '.join(f'{f} = ?' for f in fields)}, "
+            "scrapedAt = ?, dedup_key = ?, extra = ? WHERE id = ?",
+            (*(opportunity.get(field) for field in fields), opportunity.get('scrapedAt'),
+             dedup_key(opportunity), json.dumps(extra, ensure_ascii=False) if extra else None, opp_id)
+        )
+        if self.near_duplicates:
+            self.near_duplicates.add(opp_id, opportunity)
+
+    def merge_into(self, opp_id: str, opportunity: Dict[str, Any]) -> int:
+        """Fold a near-duplicate into a stored listing if it is richer; returns 1 if replaced"""
+        row = self.conn.execute("SELECT * FROM opportunities WHERE id = ?", (opp_id,)).fetchone()
+        if row is None or record_richness(opportunity) <= record_richness(self.from_row(row)):
+            return 0
+        self.replace_content(opp_id, opportunity, CONTENT_FIELDS + ['source'])
+        return 1
+
+    def expire(self, today: str) -> List[Dict[str, Any]]:
+        """Remove and return opportunities whose deadline is before `today` (YYYY-MM-DD)"""
+        with self.conn:
+            rows = self.conn.execute(
+                "SELECT * FROM opportunities WHERE deadline < ? AND deadline GLOB ? ORDER BY seq",
+                (today, ISO_DATE_GLOB)
+            ).fetchall()
+            if rows:
+                self.conn.executemany("DELETE FROM opportunities WHERE seq = ?", [(row['seq'],) for row in rows])
+                if self.near_duplicates:
+                    for row in rows:
+                        self.near_duplicates.remove(row['id'])
+        return [self.from_row(row) for row in rows]
+
+    def iter_all(self) -> Iterator[Dict[str, Any]]:
+        """Yield stored opportunities in the order they were first added"""
+        for row in self.conn.execute("SELECT * FROM opportunities ORDER BY seq"):
+            yield self.from_row(row)
+
+    def iter_records(self) -> Iterator[Opportunity]:
+        """Yield stored opportunities as compact records, in the order they were first added"""
+        for row in self.conn.execute("SELECT * FROM opportunities ORDER BY seq"):
+            yield Opportunity(*(row[column] for column in COLUMNS),
+                              extra=json.loads(row['extra']) if row['extra'] else None)
+
+    def export_json(self, output_path: str) -> int:
+        """Atomically write all stored opportunities to a JSON file, or JSON Lines for a .jsonl path
+
+        Rows are serialised one at a time, so memory does not grow with the store.
+        """
+        if output_path.endswith('.jsonl'):
+            return write_jsonl(output_path, self.iter_all())
+        return write_json(output_path, self.iter_all())
@@ -0,0 +1,8 @@
+import os
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRAPING_DIR = os.path.dirname(TESTS_DIR)
+
+# The scraper's modules import each other by plain name, as when run from scraping/
+sys.path.insert(0, SCRAPING_DIR)
@@ -0,0 +1,40 @@
+import pytest
+
+from browser_pool import BrowserPool
+
+
+class Driver:
+    def __init__(self):
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def pool():
+    return BrowserPool(Driver, size=1, max_pages=3)
+
+
+def test_drivers_are_recycled_by_pages_loaded_not_checkouts(pool):
+    with pool.driver() as first:
+        pool.note_pages(first, 2)
+    with pool.driver() as driver:
+        assert driver is first
+        # A paginated source: one checkout, several page loads
+        pool.note_pages(driver)
+        pool.note_pages(driver)
+    assert first.quit_called
+    assert pool.recycled == 1
+
+    with pool.driver() as driver:
+        assert driver is not first
+
+
+def test_a_failing_driver_is_retired(pool):
+    with pytest.raises(RuntimeError):
+        with pool.driver() as driver:
+            pool.note_pages(driver)
+            raise RuntimeError('session deleted')
+    assert driver.quit_called
+    assert pool.drivers == []
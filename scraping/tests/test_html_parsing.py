@@ -0,0 +1,169 @@
+import html
+import json
+import os
+
+import pytest
+
+from html_parsing import (DEFAULT_CONTAINER_SELECTOR, DEFAULT_FIELD_SELECTORS, PARSER_BACKENDS, SELECTOR_PART_RE,
+                          SIMPLE_SELECTOR_RE, CompiledSelectors, field_strainer, page_strainer, resolve_parser)
+from parse_worker import extract_listings
+
+SOURCES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                            'data', 'sources.json')
+with open(SOURCES_PATH, 'r') as f:
+    CONFIGURED = [source for source in json.load(f) if source.get('selectors')]
+
+LISTINGS = [
+    {'title': 'PhD in Medical Physics', 'institute': 'KU Leuven', 'deadline': '2026-03-01',
+     'link': '/jobs/1', 'description': 'Proton therapy dosimetry'},
+    {'title': 'PhD Studentship in Medical Imaging', 'institute': 'University College London', 'deadline': '1 May 2026',
+     'link': '/jobs/2', 'description': 'MRI reconstruction'},
+]
+
+
+def selector_chain(selector):
+    """Split a descendant selector into (tag, attributes) steps that would match it"""
+    chain = []
+    for compound in selector.replace('>', ' ').split():
+        match = SIMPLE_SELECTOR_RE.match(compound)
+        assert match, f"Cannot build markup for selector '{selector}'"
+        attrs, classes = [], []
+        for cls, elem_id, attr, dq_value, sq_value, bare_value in SELECTOR_PART_RE.findall(match.group('parts')):
+            if cls:
+                classes.append(cls)
+            elif elem_id:
+                attrs.append(('id', elem_id))
+            else:
+                attrs.append((attr, dq_value or sq_value or bare_value or '1'))
+        if classes:
+            attrs.insert(0, ('class', ' '.join(classes)))
+        chain.append((match.group('tag') or '', attrs))
+    return chain
+
+
+def listing_template(selectors):
+    """A nested element tree for one listing, built from a source's selectors"""
+    tree = {}
+    for field, default in DEFAULT_FIELD_SELECTORS.items():
+        nodes = tree
+        chain = selector_chain(selectors.get(field, default))
+        for depth, (tag, attrs) in enumerate(chain):
+            node = nodes.setdefault((tag, tuple(attrs)), {'fields': [], 'children': {}})
+            if depth == len(chain) - 1:
+                node['fields'].append(field)
+            nodes = node['children']
+    container = selector_chain(selectors.get('container', DEFAULT_CONTAINER_SELECTOR))[-1]
+    return container, tree
+
+
+def render_listing(container, tree, values):
+    """Render one listing from a template tree and its field values"""
+    def attributes(attrs):
+        return ''.join(f' {name}="{html.escape(value)}"' for name, value in attrs)
+
+    def render(nodes):
+        parts = []
+        for (tag, attrs), node in nodes.items():
+            fields = node['fields']
+            text = html.escape(' '.join(values[field] for field in fields if field != 'link'))
+            attrs = list(attrs)
+            if 'link' in fields:
+                tag = tag or 'a'
+                attrs.append(('href', values['link']))
+            tag = tag or 'div'
+            parts.append(f"<{tag}{attributes(attrs)}>{text}{render(node['children'])}</{tag}>")
+        return ''.join(parts)
+
+    tag, attrs = container
+    tag = tag or 'div'
+    return f"<{tag}{attributes(attrs)}>{render(tree)}</{tag}>"
+
+
+def page_for(selectors):
+    """A listing page for a source's selectors, inside wrappers and next to markup that is not a listing"""
+    container, tree = listing_template(selectors)
+    listings = ''.join(render_listing(container, tree, values) for values in LISTINGS)
+    return (f"<html><head><title>Jobs</title></head><body><nav><a href='/'>Home</a></nav>"
+            f"<section class='results'><div class='list'>{listings}</div></section>"
+            f"<footer><p>Contact</p></footer></body></html>").encode('utf-8')
+
+
+def extract(selectors, content, parser, prefilter):
+    compiled = CompiledSelectors(selectors)
+    return [compiled.extract_fields(container) for container in compiled.containers(compiled.parse(content, parser,
+                                                                                                    prefilter))]
+
+
+@pytest.mark.parametrize('parser', PARSER_BACKENDS)
+@pytest.mark.parametrize('source', CONFIGURED, ids=[source['id'] for source in CONFIGURED])
+def test_prefilter_matches_full_tree_on_configured_sources(source, parser):
+    content = page_for(source['selectors'])
+    full = extract(source['selectors'], content, parser, prefilter=False)
+    assert [fields['title'] for fields in full] == [values['title'] for values in LISTINGS]
+    assert extract(source['selectors'], content, parser, prefilter=True) == full
+
+
+@pytest.mark.parametrize('parser', PARSER_BACKENDS)
+def test_prefilter_keeps_ancestors_field_selectors_look_through(parser):
+    selectors = {'container': '.job', 'title': '.results .t', 'link': 'section > div a'}
+    content = (b"<body><section class='results'><div><div class='job'><span class='t'>PhD in Dosimetry</span>"
+               b"<a href='/1'>more</a></div></div></section></body>")
+    full = extract(selectors, content, parser, prefilter=False)
+    assert full[0]['title'] == 'PhD in Dosimetry'
+    assert full[0]['link'] == '/1'
+    assert extract(selectors, content, parser, prefilter=True) == full
+
+
+MALFORMED_SELECTORS = {'container': '.job-listing', 'title': '.job-title a', 'institute': '.job-location',
+                       'deadline': '.job-deadline', 'link': '.job-title a', 'description': '.job-description'}
+MALFORMED_PAGES = {
+    'unclosed-p': b"<div class='job-listing'><p class='job-description'>Radiotherapy <div class='job-title'>"
+                  b"<a href='/b'>PhD Dosimetry</a></div><span class='job-location'>KU Leuven</span></div>",
+    'nested-a': b"<div class='job-listing'><h2 class='job-title'><a href='/c'>PhD <a href='/d'>Medical</a> physics</a>"
+                b"</h2><span class='job-location'>UCL</span></div>",
+    'stray-tr': b"<div><tr class='job-listing'><td class='job-title'><a href='/f'>PhD radiotherapy</a></td></tr></div>",
+    'unclosed-li': b"<ul><li class='job-listing'><span class='job-title'><a href='/h'>PhD imaging</a></span>"
+                   b"<span class='job-location'>ETH<li class='job-listing'><span class='job-title'><a href='/i'>"
+                   b"PhD dosimetry</a></span></ul>",
+    'entities': b"<div class='job-listing'><h2 class='job-title'><a href='/e?x=1&amp;y=2'>PhD&nbsp;M&eacute;dical "
+                b"Physics</a></h2><span class='job-location'>Lyon</span><!-- x --></div>",
+}
+
+
+@pytest.mark.parametrize('name', MALFORMED_PAGES)
+def test_default_builder_matches_full_html_parser_tree_on_malformed_markup(name):
+    """The scraper has always parsed pages with html.parser; the default and its pre-filter must not change that"""
+    compiled = CompiledSelectors(MALFORMED_SELECTORS)
+    content = MALFORMED_PAGES[name]
+    full, _, _, _ = extract_listings(content, compiled, 'https://jobs.example.org/', 'html.parser', prefilter=False)
+    assert full
+    default, _, _, _ = extract_listings(content, compiled, 'https://jobs.example.org/', resolve_parser(None))
+    assert default == full
+
+
+def test_prefilter_is_off_for_selectors_it_cannot_analyse():
+    assert field_strainer('.results ~ .t') == (False, None)
+    assert field_strainer('.t:first-child') == (False, None)
+    assert field_strainer('.a, .b') == (False, None)
+    assert page_strainer({'container': '.job', 'title': '.results + .t'}) is None
+    assert page_strainer({'container': '.job:not(.ad)'}) is None
+
+
+def test_container_relative_selectors_only_keep_containers():
+    assert field_strainer('.title') == (True, None)
+    assert field_strainer(':scope .title a') == (True, None)
+    safe, strainer = field_strainer('.job-title a')
+    assert safe and strainer is not None
+
+
+def test_extract_listings_skips_known_containers():
+    selectors = CONFIGURED[0]['selectors']
+    compiled = CompiledSelectors(selectors)
+    records, found, _, _ = extract_listings(page_for(selectors), compiled, 'https://jobs.example.org/', 'lxml')
+    assert found == 2
+    assert [record[0] for _, record in records] == ['PhD in Medical Physics', 'PhD Studentship in Medical Imaging']
+
+    known = {records[0][0]}
+    again, _, _, _ = extract_listings(page_for(selectors), compiled, 'https://jobs.example.org/', 'lxml', known=known)
+    assert again[0] == (records[0][0], None)
+    assert again[1] == records[1]
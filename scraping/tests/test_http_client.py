@@ -0,0 +1,86 @@
+import pytest
+import requests
+
+from http_client import CLOSED, HALF_OPEN, OPEN, CircuitBreakers, CircuitOpenError, HttpClient
+from rate_limiter import HostRateLimiter
+
+HOST = 'jobs.example.org'
+URL = f"https://{HOST}/list"
+
+
+class Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+
+    def close(self):
+        pass
+
+
+class Session(requests.Session):
+    """Answers each GET with the next outcome: a status code or an exception to raise"""
+
+    def __init__(self, *outcomes):
+        super().__init__()
+        self.outcomes = list(outcomes)
+
+    def get(self, url, **kwargs):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return Response(outcome)
+
+
+def client(*outcomes, breakers=None):
+    return HttpClient(Session(*outcomes), HostRateLimiter(rate=1e9, burst=1e9),
+                      breakers or CircuitBreakers(state_path=None, failure_threshold=1, cooldown_seconds=0),
+                      max_retries=0)
+
+
+@pytest.mark.parametrize('error', [requests.exceptions.MissingSchema('no scheme'),
+                                   requests.exceptions.InvalidURL('bad url'),
+                                   requests.TooManyRedirects('loop')])
+def test_non_transient_errors_do_not_trip_the_breaker(error):
+    http = client(error)
+    with pytest.raises(type(error)):
+        http.get(URL)
+    assert http.breakers.state(HOST) == CLOSED
+
+
+@pytest.mark.parametrize('outcome', [requests.ConnectionError('refused'), requests.Timeout('slow'), 429, 501])
+def test_connect_timeout_and_server_errors_trip_the_breaker(outcome):
+    http = client(outcome)
+    try:
+        http.get(URL)
+    except requests.RequestException:
+        pass
+    assert http.breakers.hosts[HOST]['state'] == OPEN
+
+
+def test_probe_ending_in_another_error_lets_the_next_probe_through():
+    breakers = CircuitBreakers(state_path=None, failure_threshold=1, cooldown_seconds=0)
+    breakers.record_failure(HOST, 'refused')
+    assert breakers.state(HOST) == HALF_OPEN
+
+    http = client(ValueError('broken body'), 200, breakers=breakers)
+    with pytest.raises(ValueError):
+        http.get(URL)
+    assert http.get(URL).status_code == 200
+    assert breakers.state(HOST) == CLOSED
+
+
+def test_counts_start_afresh_each_cycle():
+    breakers = CircuitBreakers(state_path=None, failure_threshold=1, cooldown_seconds=3600)
+    http = HttpClient(Session(503, 200), HostRateLimiter(rate=1e9, burst=1e9), breakers, max_retries=1,
+                      backoff_base=0)
+    assert http.get(URL).status_code == 200
+    assert http.retries == 1
+    breakers.record_failure(HOST, 'refused')
+    with pytest.raises(CircuitOpenError):
+        http.get(URL)
+    assert breakers.summary()[HOST]['skippedRequests'] == 1
+
+    http.start_cycle()
+    breakers.start_cycle()
+    assert http.retries == 0
+    assert breakers.summary()[HOST]['skippedRequests'] == 0
@@ -0,0 +1,93 @@
+import pytest
+
+from near_duplicates import MinHasher, NearDuplicateIndex, same_listing
+from storage import OpportunityStore
+
+
+def listing(opp_id, title, institute, source='Nature Jobs', description='', deadline='2026-06-01'):
+    return {'id': opp_id, 'title': title, 'institute': institute, 'deadline': deadline,
+            'link': f"https://jobs.example.org/{opp_id}", 'description': description, 'source': source,
+            'dateAdded': '2026-01-01', 'scrapedAt': '2026-01-01T06:00:00'}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with OpportunityStore(str(tmp_path / 'opportunities.db'), near_duplicate_threshold=0.7) as store:
+        yield store
+
+
+def test_same_title_at_another_institute_is_kept(store):
+    ucl = listing('a', 'PhD Studentship in Medical Imaging', 'UCL', source='FindAPhD')
+    ucd = listing('b', 'PhD Studentship in Medical Imaging', 'UCD', source='EURAXESS')
+    # The shingles alone would merge these
+    hasher = MinHasher()
+    assert hasher.similarity(hasher.signature(ucl), hasher.signature(ucd)) >= 0.7
+
+    assert store.upsert_many([ucl, ucd]) == (2, 0, 0)
+    assert sorted(opp['institute'] for opp in store.iter_all()) == ['UCD', 'UCL']
+
+
+@pytest.mark.parametrize('institutes', [('University of Leeds', 'University of Leicester'),
+                                        ('University of Leeds', 'University of Leeds')])
+def test_numbered_projects_are_kept(store, institutes):
+    first = listing('a', 'PhD Studentship in Medical Physics project 10', institutes[0], source='FindAPhD')
+    second = listing('b', 'PhD Studentship in Medical Physics project 11', institutes[1], source='EURAXESS')
+    assert store.upsert_many([first, second]) == (2, 0, 0)
+    assert store.count() == 2
+
+
+def test_distinct_listings_from_one_source_are_all_stored(store):
+    listings = [listing(f"id-{number}", f"PhD Studentship in Medical Imaging project {number}",
+                        ['UCL', 'UCD', 'KU Leuven'][number % 3]) for number in range(15)]
+    assert store.upsert_many(listings) == (15, 0, 0)
+    assert store.count() == 15
+
+
+def test_cross_source_near_duplicate_is_merged_into_the_richer_record(store):
+    short = listing('a', 'PhD Position in Medical Physics', 'Stanford University', source='Nature Jobs')
+    rich = listing('b', 'Ph.D. Position in Medical Physics', 'Stanford University', source='Science Careers',
+                   description='Fully funded position on proton therapy dosimetry with the radiation oncology group.')
+    assert store.upsert_many([short]) == (1, 0, 0)
+    assert store.upsert_many([rich]) == (0, 1, 1)
+
+    stored = list(store.iter_all())
+    assert len(stored) == 1
+    assert stored[0]['id'] == 'a'
+    assert stored[0]['description'] == rich['description']
+    assert stored[0]['source'] == 'Science Careers'
+
+    # The poorer record merges too, without replacing anything
+    assert store.upsert_many([{**short, 'id': 'c', 'source': 'IEEE Jobs', 'title': 'PhD Position - Medical Physics'}]) \
+        == (0, 0, 1)
+    assert store.count() == 1
+
+
+def test_same_source_near_duplicates_are_kept(store):
+    first = listing('a', 'PhD Position in Medical Physics', 'Stanford University')
+    second = listing('b', 'Ph.D. Position in Medical Physics', 'Stanford University')
+    assert store.upsert_many([first, second]) == (2, 0, 0)
+
+
+def test_exact_duplicates_are_counted_as_merged(store):
+    first = listing('a', 'PhD in Radiotherapy', 'KU Leuven')
+    assert store.upsert_many([first, {**first, 'id': 'b', 'source': 'EURAXESS'}]) == (1, 0, 1)
+    assert store.count() == 1
+
+
+def test_same_listing_requires_institute_numbers_and_title_words():
+    base = listing('a', 'PhD Position in Medical Physics', 'Stanford University', source='Nature Jobs')
+    other = {**base, 'source': 'Science Careers'}
+    assert same_listing(base, {**other, 'title': 'Ph.D. position in medical physics'}, 0.7)
+    assert not same_listing(base, {**other, 'institute': 'Stanford Health Care'}, 0.7)
+    assert not same_listing(base, {**other, 'title': 'PhD Position in Medical Physics 2'}, 0.7)
+    assert not same_listing(base, {**other, 'title': 'Postdoc in Medical Physics'}, 0.7)
+    assert not same_listing(base, {**base, 'institute': 'Unknown'}, 0.7)
+    assert not same_listing(base, dict(base), 0.7)
+
+
+def test_find_passes_over_rejected_candidates():
+    index = NearDuplicateIndex(threshold=0.7)
+    index.add('x', listing('x', 'PhD Position in Medical Physics', 'Stanford University'))
+    query = listing('q', 'PhD Position in Medical Physics', 'Stanford University', source='EURAXESS')
+    assert index.find(query)[0] == 'x'
+    assert index.find(query, accept=lambda candidate: False) is None
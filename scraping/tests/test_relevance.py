@@ -0,0 +1,32 @@
+import pytest
+
+from relevance import RelevanceMatcher
+
+
+@pytest.mark.parametrize('config', [
+    {'keywords': ['medical physics', '']},
+    {'keywords': {'  ': 1.0}},
+    {'negative_keywords': ['']},
+])
+def test_empty_keywords_are_rejected(config):
+    with pytest.raises(ValueError):
+        RelevanceMatcher.from_config(config)
+
+
+def test_overlapping_and_contained_keywords_all_count():
+    matcher = RelevanceMatcher.from_config({
+        'keywords': {'medical imaging': 1.0, 'imaging physics': 1.0, 'imaging': 0.5, 'physics': 0.25},
+        'negative_keywords': {'industry': 2.0},
+        'threshold': 2.0,
+    })
+    assert matcher.score('PhD in Medical Imaging Physics') == 2.75
+    assert matcher.score_batch([('Medical Imaging Physics', ''), ('Imaging', 'industry partner'), ('', '')]) == \
+        [2.75, -1.5, 0.0]
+    assert matcher.classify_batch([('Medical Imaging Physics', ''), ('Medical imaging', 'industry')]) == [True, False]
+
+
+def test_batch_matches_single_listing_checks():
+    matcher = RelevanceMatcher.from_config({})
+    items = [('PhD in Radiotherapy', ''), ('PhD in Economics', 'no keyword'), ('Fellowship', 'medical dosimetry')]
+    assert matcher.classify_batch(items) == [matcher.is_relevant(title, text) for title, text in items] == \
+        [True, False, True]
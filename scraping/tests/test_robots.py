@@ -0,0 +1,20 @@
+from robots import RobotsCache
+
+
+def test_unreachable_robots_txt_is_fetched_again_next_cycle():
+    cache = RobotsCache(cache_path=None)
+    responses = iter([(503, ''), (200, 'User-agent: *\nDisallow: /private/')])
+    fetched = []
+
+    def fetch(url):
+        fetched.append(url)
+        return next(responses)
+
+    assert cache.can_fetch('https://jobs.example.org/private/1', '*', fetch)
+    # Within a cycle the failure is not retried for every URL
+    assert cache.can_fetch('https://jobs.example.org/private/2', '*', fetch)
+    assert len(fetched) == 1
+
+    cache.start_cycle()
+    assert not cache.can_fetch('https://jobs.example.org/private/1', '*', fetch)
+    assert fetched == ['https://jobs.example.org/robots.txt'] * 2
@@ -0,0 +1,14 @@
+import pytest
+
+from scheduler import DEFAULT_COST_SECONDS, SourceSchedule
+
+
+@pytest.mark.parametrize('source, backend', [
+    ({'name': 'Static'}, 'requests'),
+    ({'name': 'Rendered', 'type': 'javascript'}, 'selenium'),
+    ({'name': 'Configured', 'backend': 'selenium'}, 'selenium'),
+    ({'name': 'Forced static', 'type': 'javascript', 'backend': 'requests'}, 'requests'),
+    ({'name': 'Plugin', 'backend': 'feeds:FeedBackend'}, 'requests'),
+])
+def test_unmeasured_cost_follows_the_fetch_backend(source, backend):
+    assert SourceSchedule(history_path=None).cost(source) == DEFAULT_COST_SECONDS[backend]
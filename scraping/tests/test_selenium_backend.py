@@ -0,0 +1,108 @@
+import json
+
+import pytest
+from selenium.common.exceptions import JavascriptException, WebDriverException
+
+from browser_pool import BrowserPool
+from scraper import PhDScraper
+from selenium_backend import COUNT_CONTAINERS_JS, EXTRACT_CONTAINERS_JS
+
+LISTINGS = {
+    'https://jobs.example.org/list': [
+        {'title': 'PhD in Medical Physics', 'institute': 'KU Leuven', 'deadline': '2026-06-01',
+         'link': '/jobs/1', 'description': 'Proton therapy dosimetry'},
+        {'title': 'PhD in Economic History', 'institute': 'KU Leuven', 'deadline': '2026-06-01',
+         'link': '/jobs/2', 'description': 'Trade in the Low Countries'},
+    ],
+    'https://jobs.example.org/list?page=2': [
+        {'title': 'PhD in Radiotherapy Physics', 'institute': 'KU Leuven', 'deadline': '2026-07-01',
+         'link': '/jobs/3', 'description': 'Adaptive radiotherapy planning'},
+    ],
+}
+
+
+class Element:
+    def __init__(self, fields, field_selectors):
+        self.fields = fields
+        self.field_selectors = field_selectors
+
+    def find_element(self, by, selector):
+        field = next(field for field, value in self.field_selectors.items() if value == selector)
+        return Element(self.fields[field], {})
+
+    @property
+    def text(self):
+        return self.fields
+
+    def get_attribute(self, name):
+        return self.fields
+
+
+class Driver:
+    """Serves LISTINGS, optionally failing the extraction script or loading one URL"""
+
+    def __init__(self, selectors, script_fails=False, fail_at=None):
+        self.selectors = selectors
+        self.script_fails = script_fails
+        self.fail_at = fail_at
+        self.url = None
+        self.quit_called = False
+
+    def get(self, url):
+        if url == self.fail_at:
+            raise WebDriverException('net::ERR_CONNECTION_RESET')
+        self.url = url
+
+    def find_element(self, by, selector):
+        return object()
+
+    def find_elements(self, by, selector):
+        return [Element(fields, self.selectors) for fields in LISTINGS[self.url]]
+
+    def execute_script(self, script, *args):
+        if script == COUNT_CONTAINERS_JS:
+            return len(LISTINGS[self.url])
+        assert script == EXTRACT_CONTAINERS_JS
+        if self.script_fails:
+            raise JavascriptException('script error')
+        return json.dumps(LISTINGS[self.url])
+
+    def quit(self):
+        self.quit_called = True
+
+
+SOURCE = {'name': 'Example Jobs', 'url': 'https://jobs.example.org/list', 'backend': 'selenium',
+          'selectors': {'container': '.job', 'title': '.title', 'institute': '.institute',
+                        'deadline': '.deadline', 'link': 'a', 'description': '.description'},
+          'pagination': {'url_template': 'https://jobs.example.org/list?page={page}', 'max_pages': 2}}
+
+
+@pytest.fixture
+def scrape(tmp_path, monkeypatch):
+    # The scraper logs to scraping.log in the working directory
+    monkeypatch.chdir(tmp_path)
+    scraper = PhDScraper(config_path=str(tmp_path / 'sources.json'), requests_per_second=1e9, burst=1e9,
+                         cache_dir=None, site_dir=None, store_path=str(tmp_path / 'opportunities.db'),
+                         relevance_config=None)
+
+    def scrape(driver):
+        scraper.browser_pool = BrowserPool(lambda: driver)
+        return scraper.backend('selenium').scrape(SOURCE)
+    return scrape
+
+
+def test_paginated_source_is_filtered_for_relevance(scrape):
+    titles = [opp['title'] for opp in scrape(Driver(SOURCE['selectors']))]
+    assert titles == ['PhD in Medical Physics', 'PhD in Radiotherapy Physics']
+
+
+def test_script_failure_falls_back_to_relevant_first_page_listings(scrape):
+    titles = [opp['title'] for opp in scrape(Driver(SOURCE['selectors'], script_fails=True))]
+    assert titles == ['PhD in Medical Physics']
+
+
+def test_navigation_error_while_crawling_retires_the_driver(scrape):
+    driver = Driver(SOURCE['selectors'], fail_at='https://jobs.example.org/list?page=2')
+    with pytest.raises(WebDriverException):
+        scrape(driver)
+    assert driver.quit_called
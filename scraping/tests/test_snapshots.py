@@ -0,0 +1,143 @@
+import pytest
+
+from records import RECORD_FIELDS
+from scraper import PhDScraper
+from snapshots import CHANGE_KINDS, ContainerSnapshots
+
+CONFIG = ContainerSnapshots.config_hash({'container': '.job'})
+
+
+def listing(key, title, institute='KU Leuven'):
+    return {'fingerprint': key, 'title': title, 'institute': institute, 'deadline': '2026-06-01',
+            'link': f"https://jobs.example.org/{key}"}
+
+
+def counts(**changes):
+    return {**dict.fromkeys(CHANGE_KINDS, 0), **changes}
+
+
+def next_run(snapshots):
+    """Save this run's snapshots and load them as the previous run's, as the next process would"""
+    snapshots.save()
+    return ContainerSnapshots(snapshots.path)
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    return ContainerSnapshots(str(tmp_path / 'container_snapshots.json'))
+
+
+def test_update_counts_new_changed_unchanged_and_removed(snapshots):
+    first = [listing('a', 'PhD in Dosimetry'), listing('b', 'PhD in Radiobiology'), listing('c', 'PhD in Imaging')]
+    assert snapshots.update('src', CONFIG, first) == counts(new=3)
+
+    snapshots = next_run(snapshots)
+    # 'a' is untouched, 'b' was edited in place, 'c' is gone and 'd' is new
+    second = [listing('a', 'PhD in Dosimetry'), listing('b2', 'PhD in Radiobiology'), listing('d', 'PhD in MRI')]
+    assert snapshots.update('src', CONFIG, second) == counts(new=1, changed=1, unchanged=1, removed=1)
+    assert snapshots.summary()['bySource'] == {'src': counts(new=1, changed=1, unchanged=1, removed=1)}
+
+
+def test_incomplete_crawl_keeps_unseen_containers(snapshots):
+    snapshots.update('src', CONFIG, [listing('a', 'PhD in Dosimetry'), listing('b', 'PhD in Radiobiology')])
+
+    snapshots = next_run(snapshots)
+    assert snapshots.update('src', CONFIG, [listing('a', 'PhD in Dosimetry')], complete=False) == counts(unchanged=1)
+    assert set(next_run(snapshots).containers('src', CONFIG)) == {'a', 'b'}
+
+
+def test_other_settings_ignore_the_snapshot(snapshots):
+    snapshots.update('src', CONFIG, [listing('a', 'PhD in Dosimetry')])
+
+    snapshots = next_run(snapshots)
+    other = ContainerSnapshots.config_hash({'container': '.job'}, day_first=True)
+    assert snapshots.containers('src', other) == {}
+    assert snapshots.carry_over('src', other) == counts()
+    assert snapshots.update('src', other, [listing('a', 'PhD in Dosimetry')]) == counts(new=1)
+
+
+def test_reuse_returns_the_kept_record_of_unchanged_containers(snapshots):
+    snapshots.update('src', CONFIG, [listing('a', 'PhD in Dosimetry')])
+    # Nothing kept yet: a new container is always cleaned and validated
+    assert snapshots.reuse('src', 'a', 'Nature Jobs') is None
+    snapshots.keep('src', 'a', {'id': 'x1', 'title': 'PhD in Dosimetry', 'source': 'Nature Jobs',
+                                'dateAdded': '2026-01-01', 'scrapedAt': '2026-01-01T06:00:00'})
+
+    snapshots = next_run(snapshots)
+    snapshots.update('src', CONFIG, [listing('a', 'PhD in Dosimetry')])
+    reused = snapshots.reuse('src', 'a', 'Nature Jobs (mirror)')
+    assert reused['id'] == 'x1'
+    assert reused['dateAdded'] == '2026-01-01'
+    assert reused['source'] == 'Nature Jobs (mirror)'
+    assert reused['scrapedAt'] != '2026-01-01T06:00:00'
+    assert snapshots.reuse('src', None, 'Nature Jobs') is None
+    assert snapshots.reuse('src', 'missing', 'Nature Jobs') is None
+
+
+def test_carry_over_keeps_the_previous_snapshot(snapshots):
+    snapshots.update('src', CONFIG, [listing('a', 'PhD in Dosimetry'), listing('b', 'PhD in Radiobiology')])
+
+    snapshots = next_run(snapshots)
+    assert snapshots.carry_over('src', CONFIG) == counts(unchanged=2)
+    assert snapshots.carry_over('unknown', CONFIG) == counts()
+    assert set(next_run(snapshots).containers('src', CONFIG)) == {'a', 'b'}
+    assert len(next(iter(snapshots.containers('src', CONFIG).values()))['opportunity']) == len(RECORD_FIELDS)
+
+
+PAGE = """<html><body><div class='list'>{}</div></body></html>"""
+CARD = ("<div class='job'><h3 class='title'>{title}</h3><span class='institution'>KU Leuven</span>"
+        "<span class='deadline'>{deadline}</span><a href='/jobs/{slug}'>More</a>"
+        "<p class='description'>Medical physics research in radiotherapy</p></div>")
+
+
+class Response:
+    def __init__(self, content):
+        self.content = content
+        self.status_code = 200
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    # The scraper logs to scraping.log in the working directory
+    monkeypatch.chdir(tmp_path)
+    scraper = PhDScraper(config_path=str(tmp_path / 'sources.json'), cache_dir=str(tmp_path / 'cache'), site_dir=None,
+                         store_path=str(tmp_path / 'opportunities.db'), relevance_config=None)
+    backend = scraper.backend('requests')
+    monkeypatch.setattr(backend, 'check_robots_txt', lambda url: True)
+    monkeypatch.setattr(backend, 'http_cache', None)
+    return scraper
+
+
+def serve(scraper, monkeypatch, cards):
+    html = PAGE.format(''.join(CARD.format(**card) for card in cards)).encode('utf-8')
+    monkeypatch.setattr(scraper.backend('requests'), 'download', lambda url, headers=None: Response(html))
+
+
+def test_scrape_source_reuses_unchanged_containers(scraper, monkeypatch):
+    source = {'id': 'jobs', 'name': 'Example Jobs', 'url': 'https://jobs.example.org/list',
+              'selectors': {'container': '.job', 'title': '.title', 'institute': '.institution',
+                            'deadline': '.deadline', 'link': 'a', 'description': '.description'}}
+    dosimetry = {'title': 'PhD in Medical Physics: Dosimetry', 'deadline': '2026-06-01', 'slug': 'dosimetry'}
+    imaging = {'title': 'PhD in Medical Physics: Imaging', 'deadline': '2026-07-01', 'slug': 'imaging'}
+    serve(scraper, monkeypatch, [dosimetry, imaging])
+    first = {opp['title']: opp for opp in scraper.scrape_source(source)}
+    assert set(first) == {dosimetry['title'], imaging['title']}
+    scraper.snapshots.save()
+
+    # The imaging card changes its deadline; the dosimetry card is served unchanged
+    extracted = []
+    validate = scraper.clean_opportunity_data
+    monkeypatch.setattr(scraper, 'clean_opportunity_data',
+                        lambda opp, src: extracted.append(opp['title']) or validate(opp, src))
+    serve(scraper, monkeypatch, [dosimetry, {**imaging, 'deadline': '2026-09-01'}])
+    second = {opp['title']: opp for opp in scraper.scrape_source(source)}
+
+    assert extracted == [imaging['title']]
+    assert second[dosimetry['title']]['id'] == first[dosimetry['title']]['id']
+    assert second[dosimetry['title']]['deadline'] == '2026-06-01'
+    assert second[imaging['title']]['deadline'] == '2026-09-01'
+    assert scraper.snapshots.summary()['bySource'] == {'jobs': counts(changed=1, unchanged=1)}
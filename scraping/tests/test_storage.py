@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from storage import OpportunityStore
+
+
+def listing(opp_id, title, **fields):
+    return {'id': opp_id, 'title': title, 'institute': 'KU Leuven', 'deadline': '2026-06-01',
+            'link': f"https://jobs.example.org/{opp_id}", 'description': 'Medical physics project',
+            'source': 'Nature Jobs', 'dateAdded': '2026-01-01', 'scrapedAt': '2026-01-01T06:00:00', **fields}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with OpportunityStore(str(tmp_path / 'opportunities.db')) as store:
+        yield store
+
+
+def test_upsert_inserts_then_refreshes_changed_listings_keeping_date_added(store):
+    assert store.upsert_many([listing('a', 'PhD in Dosimetry'), listing('b', 'PhD in Radiobiology')]) == (2, 0, 0)
+    # Unchanged: nothing to do
+    assert store.upsert_many([listing('a', 'PhD in Dosimetry')]) == (0, 0, 0)
+
+    changed = listing('a', 'PhD in Dosimetry', deadline='2026-07-01', dateAdded='2026-03-01', funding='Funded')
+    assert store.upsert_many([changed]) == (0, 1, 0)
+    stored = store.get('a')
+    assert stored['deadline'] == '2026-07-01'
+    assert stored['dateAdded'] == '2026-01-01'
+    assert stored['funding'] == 'Funded'
+
+
+def test_only_the_first_source_refreshes_a_listing(store):
+    store.upsert_many([listing('a', 'PhD in Dosimetry')])
+    assert store.upsert_many([listing('a', 'PhD in Dosimetry', source='EURAXESS', deadline='2027-01-01')]) == (0, 0, 0)
+    assert store.get('a')['deadline'] == '2026-06-01'
+
+
+def test_expire_removes_listings_past_their_deadline(store):
+    store.upsert_many([listing('a', 'PhD in Dosimetry', deadline='2026-01-10'), listing('b', 'PhD in Imaging'),
+                       listing('c', 'PhD in Radiotherapy', deadline='unknown')])
+    assert [opp['id'] for opp in store.expire('2026-02-01')] == ['a']
+    assert [opp['id'] for opp in store.iter_all()] == ['b', 'c']
+
+
+@pytest.mark.parametrize('name', ['opportunities.json', 'opportunities.jsonl'])
+def test_export_round_trips_through_bootstrap(tmp_path, store, name):
+    rows = [listing('a', 'PhD in Dosimetry', funding='Funded'), listing('b', 'Doctorat en imagerie médicale')]
+    store.upsert_many(rows)
+    path = str(tmp_path / name)
+    assert store.export_json(path) == 2
+    if name.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            assert json.load(f) == list(store.iter_all())
+
+    with OpportunityStore(str(tmp_path / 'fresh.db')) as fresh:
+        assert fresh.bootstrap_from_json(path) == 2
+        assert list(fresh.iter_all()) == list(store.iter_all())